@@ -0,0 +1,70 @@
+"""
+Rhiza backfill worker
+
+Warms the graph from a frequency-ranked word list (most frequent first) so the
+top N English words are analyzed ahead of time instead of in the request path.
+
+Usage:
+    python backfill.py words.txt --top 10000 --rate 2 --concurrency 4
+    python backfill.py words.txt --checkpoint backfill.json   # resume after a crash
+    python backfill.py words.txt --fake-provider              # dry run without an LLM or Neo4j
+"""
+
+import argparse
+import asyncio
+
+import main as api
+from services.backfill import BackfillCheckpoint, BackfillWorker, read_word_list
+from services.fakes import FakeEtymologyProvider, InMemoryEtymologyGraphService
+
+DEFAULT_CHECKPOINT = "backfill_checkpoint.json"
+
+
+async def _run(args: argparse.Namespace) -> None:
+    if args.fake_provider:
+        # Fake roots must never reach the real graph, nor move the real run's checkpoint
+        graph_service = InMemoryEtymologyGraphService()
+        analyze = FakeEtymologyProvider()
+        checkpoint = args.checkpoint
+    else:
+        graph_service = api.graph_service
+        analyze = api.get_ai_etymology
+        checkpoint = args.checkpoint or DEFAULT_CHECKPOINT
+    worker = BackfillWorker(
+        graph_service=graph_service,
+        analyze=analyze,
+        is_valid=api.is_valid_english_word,
+        checkpoint=BackfillCheckpoint(checkpoint),
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        rate=args.rate,
+    )
+    try:
+        await worker.run(read_word_list(args.word_list), limit=args.top)
+    finally:
+        await api.graph_service.close()
+        for pool in api.provider_pools.values():
+            pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill the etymology graph from a ranked word list")
+    parser.add_argument("word_list", help="One word per line, most frequent first (extra columns ignored)")
+    parser.add_argument("--top", type=int, help="Only consider the first N words of the list")
+    parser.add_argument("--batch-size", type=int, default=100, help="Words per existence check and checkpoint")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent AI analyses")
+    parser.add_argument("--rate", type=float, default=2.0, help="Maximum AI analyses started per second")
+    parser.add_argument("--checkpoint", help=f"Progress file used to resume (default {DEFAULT_CHECKPOINT}; "
+                                              "none with --fake-provider)")
+    parser.add_argument("--fake-provider", action="store_true",
+                        help="Dry run with a deterministic fake provider and an in-memory graph")
+    args = parser.parse_args()
+    if not args.fake_provider and not (api.bedrock.enabled or api.gemini.enabled):
+        # get_ai_etymology would answer every word with no roots, stored as negative results
+        parser.error("no AI provider is configured (set AWS_BEARER_TOKEN_BEDROCK or GEMINI_API_KEY), "
+                     "or use --fake-provider")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
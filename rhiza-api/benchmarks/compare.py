@@ -0,0 +1,67 @@
+"""
+Compare two load_bench.py reports, e.g. from the parent commit and this one.
+
+Prints the change in throughput and latency percentiles per endpoint and exits
+non-zero when any of them got worse by more than --threshold (a fraction).
+Reports produced with different options are compared anyway, with a warning.
+
+Usage:
+    python benchmarks/compare.py base.json head.json
+    python benchmarks/compare.py base.json head.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+# Metric name -> whether a larger value is better
+METRICS = {"rps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+
+def load(path: str) -> Dict:
+    with open(path, encoding="utf-8") as report:
+        return json.load(report)
+
+
+def compare(base: Dict, head: Dict, threshold: float) -> List[str]:
+    regressions = []
+    print(f"{'endpoint':>10} {'metric':>8} {'base':>12} {'head':>12} {'change':>9}")
+    for endpoint, head_stats in head["results"].items():
+        base_stats = base["results"].get(endpoint)
+        if base_stats is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = base_stats[metric], head_stats[metric]
+            change = (after - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > threshold else ""
+            if flag:
+                regressions.append(f"{endpoint} {metric}")
+            print(f"{endpoint:>10} {metric:>8} {before:>12} {after:>12} {change:>+8.1%}{flag}")
+        if head_stats["errors"] > base_stats["errors"]:
+            regressions.append(f"{endpoint} errors")
+            print(f"{endpoint:>10} {'errors':>8} {base_stats['errors']:>12} {head_stats['errors']:>12}  REGRESSION")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two load_bench.py reports")
+    parser.add_argument("base", help="Report from the baseline commit")
+    parser.add_argument("head", help="Report from the commit under test")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Allowed relative slowdown per metric")
+    args = parser.parse_args()
+
+    base, head = load(args.base), load(args.head)
+    if base["meta"]["options"] != head["meta"]["options"]:
+        print("warning: reports were produced with different options", file=sys.stderr)
+    print(f"base {base['meta']['commit']} vs head {head['meta']['commit']}")
+    regressions = compare(base, head, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
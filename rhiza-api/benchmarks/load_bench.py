@@ -0,0 +1,300 @@
+"""
+Load test for the read endpoints, with local stand-ins for Neo4j and the LLM.
+
+Drives a seeded mix of GET /word/{english_word}, /word/{english_word}/graph and
+/root/{root_name}/words requests at a fixed concurrency and writes per-endpoint
+p50/p95/p99 latency and requests per second to a JSON file. The request plan
+and dataset depend only on --seed, so two runs of the same options on
+different commits can be compared with benchmarks/compare.py.
+
+Graph backends:
+    memory  InMemoryEtymologyGraphService with --graph-latency-ms per call (default)
+    neo4j   the real EtymologyGraphService at NEO4J_URI, seeded with the same dataset.
+            Start a throwaway container first:
+            docker run --rm -d -p 7687:7687 -e NEO4J_AUTH=neo4j/password neo4j:5.15-community
+
+Misses are new words sent to a FakeEtymologyProvider that sleeps --llm-latency-ms,
+through the same provider router as the real LLMs. Requests are served in-process
+through ASGI (no sockets, rate limits disabled), so results measure the API and its
+caches rather than the network.
+
+Usage:
+    python benchmarks/load_bench.py --output bench.json
+    python benchmarks/load_bench.py --requests 20000 --concurrency 64 --miss-ratio 0.05 \\
+        --mix word=0.6,graph=0.2,root=0.2 --output bench.json
+    python benchmarks/load_bench.py --graph neo4j --output bench-neo4j.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+import main as api  # noqa: E402
+from services.cached_graph_service import CachedEtymologyGraphService  # noqa: E402
+from services.fakes import FakeEtymologyProvider, InMemoryEtymologyGraphService  # noqa: E402
+from services.validation import validate_word  # noqa: E402
+from services.write_behind import WriteBehindQueue  # noqa: E402
+
+ENDPOINTS = ("word", "graph", "root")
+SYLLABLES = ["ka", "lo", "phi", "so", "the", "ra", "mo", "ne", "gra", "pho", "chro", "bi",
+             "te", "ly", "sis", "ton", "an", "es", "ur", "dy", "mi", "cro", "pa", "thy"]
+FREQUENCIES = ["very_high", "high", "medium", "low"]
+SEED_BATCH_SIZE = 500
+
+
+# --- Dataset and request plan ---
+
+def make_word(rng: random.Random, seen: set) -> str:
+    while True:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen and validate_word(word) is None:
+            seen.add(word)
+            return word
+
+
+def build_dataset(rng: random.Random, words: int, roots: int) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+    """Known words with 1-3 roots each, drawn with a skew so some roots are hubs."""
+    seen: set = set()
+    root_list = []
+    for index in range(roots):
+        transliteration = make_word(rng, seen)
+        root_list.append({
+            "name": f"ρίζα{index}",
+            "transliteration": transliteration,
+            "meaning": f"meaning of {transliteration}",
+            "category": "other",
+            "frequency": rng.choice(FREQUENCIES),
+            "part_of_speech": "noun",
+        })
+    weights = [1 / (rank + 1) for rank in range(roots)]
+    dataset = {}
+    for _ in range(words):
+        word_roots = {root["name"]: root for root in rng.choices(root_list, weights, k=rng.randint(1, 3))}
+        dataset[make_word(rng, seen)] = list(word_roots.values())
+    return dataset, root_list
+
+
+def run_suffix(run_index: int) -> str:
+    """Syllables appended to miss words in later runs, so every run misses on words no earlier run stored."""
+    suffix = ""
+    while run_index:
+        run_index, digit = divmod(run_index, len(SYLLABLES))
+        suffix += SYLLABLES[digit]
+    return suffix
+
+
+def build_plan(rng: random.Random, args: argparse.Namespace, known: List[str], roots: List[Dict],
+               run_index: int = 0) -> List[Tuple[str, str]]:
+    """(endpoint, path) for every request, in order.
+
+    Runs differ only in their miss words, which ``run_index`` makes unique to the run.
+    """
+    names, weights = zip(*args.mix.items())
+    suffix = run_suffix(run_index)
+    seen = set(known)
+    plan = []
+    for _ in range(args.warmup + args.requests):
+        endpoint = rng.choices(names, weights)[0]
+        if endpoint == "root":
+            plan.append((endpoint, f"/root/{rng.choice(roots)['transliteration']}/words"))
+            continue
+        word = make_word(rng, seen) + suffix if rng.random() < args.miss_ratio else rng.choice(known)
+        plan.append((endpoint, f"/word/{word}" if endpoint == "word" else f"/word/{word}/graph?include_related=true"))
+    return plan
+
+
+# --- Application setup ---
+
+async def setup_app(args: argparse.Namespace, dataset: Dict[str, List[Dict]]) -> Any:
+    if args.graph == "neo4j":
+        from services.neo4j_service import EtymologyGraphService
+        backend = EtymologyGraphService()
+        await backend.create_indexes()
+        items = [{"name": word, "roots": roots} for word, roots in dataset.items()]
+        for start in range(0, len(items), SEED_BATCH_SIZE):
+            await backend.store_etymologies(items[start:start + SEED_BATCH_SIZE])
+    else:
+        backend = InMemoryEtymologyGraphService(latency=args.graph_latency_ms / 1000)
+        for word, roots in dataset.items():
+            backend.seed(word, roots)
+
+    api.graph_service = CachedEtymologyGraphService(
+        backend, maxsize=api.GRAPH_CACHE_MAX_ENTRIES, ttl=api.GRAPH_CACHE_TTL_SECONDS
+    )
+    api.write_queue = WriteBehindQueue(api.graph_service, journal_dir=None)
+    await api.write_queue.start()
+
+    provider = FakeEtymologyProvider(latency=args.llm_latency_ms / 1000, no_roots_every=0)
+
+    # Same signature as main.get_ai_etymology: POST /words passes system_prompt/max_tokens
+    async def get_ai_etymology(word: str, *prompt_args, **prompt_options) -> dict:
+        _, result = await api.ai_router.call([("fake", provider)], word)
+        return result
+
+    api.get_ai_etymology = get_ai_etymology
+    api.limiter.enabled = False
+    return provider
+
+
+# --- Driver ---
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, seconds: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+async def drive(client: httpx.AsyncClient, plan: List[Tuple[str, str]], concurrency: int):
+    latencies: Dict[str, List[float]] = {endpoint: [] for endpoint in ENDPOINTS}
+    errors: Dict[str, int] = {endpoint: 0 for endpoint in ENDPOINTS}
+    position = 0
+
+    async def worker():
+        nonlocal position
+        while position < len(plan):
+            endpoint, path = plan[position]
+            position += 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[endpoint].append(time.perf_counter() - started)
+            else:
+                errors[endpoint] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_once(args: argparse.Namespace, run_index: int = 0) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """One seeded run against a freshly seeded backend; returns (results, LLM calls)."""
+    rng = random.Random(args.seed)
+    dataset, roots = build_dataset(rng, args.words, args.roots)
+    # A persistent backend (--graph neo4j) keeps the words earlier runs analyzed
+    plan = build_plan(rng, args, list(dataset), roots, run_index)
+    provider = await setup_app(args, dataset)
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await drive(client, plan[:args.warmup], args.concurrency)
+        latencies, errors, seconds = await drive(client, plan[args.warmup:], args.concurrency)
+    await api.write_queue.close()
+    await api.graph_service.close()
+
+    results = {
+        endpoint: summarize(latencies[endpoint], errors[endpoint], seconds)
+        for endpoint in ENDPOINTS if latencies[endpoint] or errors[endpoint]
+    }
+    results["overall"] = summarize([value for values in latencies.values() for value in values],
+                                   sum(errors.values()), seconds)
+    return results, provider.calls
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Repeat the run and report the median of each statistic, which damps scheduler noise."""
+    runs = []
+    for run_index in range(args.repeat):
+        results, llm_calls = await run_once(args, run_index)
+        runs.append(results)
+    results = {
+        endpoint: {metric: statistics.median(run[endpoint][metric] for run in runs) for metric in stats}
+        for endpoint, stats in runs[0].items()
+    }
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "llm_calls_per_run": llm_calls,
+            "options": {key: value for key, value in vars(args).items() if key not in ("output", "log_level")},
+        },
+        "results": results,
+        "runs": runs,
+    }
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r} (expected one of {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the read endpoints against local stand-ins")
+    parser.add_argument("--requests", type=int, default=5000, help="Measured requests")
+    parser.add_argument("--warmup", type=int, default=500, help="Requests sent before measuring")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight at once")
+    parser.add_argument("--miss-ratio", type=float, default=0.02, help="Share of word requests for unknown words")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("word=0.6,graph=0.2,root=0.2"),
+                        help="Endpoint weights, e.g. word=0.6,graph=0.2,root=0.2")
+    parser.add_argument("--words", type=int, default=2000, help="Known words in the dataset")
+    parser.add_argument("--roots", type=int, default=200, help="Roots in the dataset")
+    parser.add_argument("--graph", choices=("memory", "neo4j"), default="memory", help="Graph backend")
+    parser.add_argument("--graph-latency-ms", type=float, default=1.0, help="Per-call latency of the in-memory graph")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0, help="Latency of the fake LLM per analysis")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs (with fresh miss words each); the report holds their medians")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--log-level", default="WARNING", help="API log level while the benchmark runs")
+    parser.add_argument("--output", default="bench.json", help="Where to write the JSON report")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level)
+    logging.getLogger().setLevel(args.log_level)
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    for endpoint, stats in report["results"].items():
+        print(f"{endpoint:>8}: {stats['rps']:>8} req/s  p50 {stats['p50_ms']:>8} ms  "
+              f"p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  errors {stats['errors']}")
+    print(f"report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
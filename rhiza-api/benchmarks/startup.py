@@ -0,0 +1,119 @@
+"""
+Measure how long the API takes to import and to start accepting traffic.
+
+Each sample runs in a fresh interpreter, so module caches from earlier samples
+do not hide import costs. Startup time is measured by driving the ASGI
+lifespan protocol until ``lifespan.startup.complete``. It runs against an
+unreachable Neo4j (NEO4J_URI defaults to a closed local port), because startup
+must not wait for the database. Exits non-zero when the median of either
+measurement exceeds its budget; ``tests/test_startup.py`` checks the same budgets.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --import-budget-ms 1000 --startup-budget-ms 100 --repeat 7
+    python benchmarks/startup.py --importtime 10   # also list the slowest imports
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UNREACHABLE_NEO4J = "bolt://127.0.0.1:9"
+IMPORT_BUDGET_MS = 1200.0
+STARTUP_BUDGET_MS = 250.0
+
+
+def measure() -> Dict[str, float]:
+    """One sample in this (fresh) process: import time, then lifespan startup time."""
+    sys.path.insert(0, API_DIR)
+    started = time.perf_counter()
+    import main as api
+    imported = time.perf_counter() - started
+
+    async def lifespan() -> float:
+        messages: asyncio.Queue = asyncio.Queue()
+        sent: asyncio.Queue = asyncio.Queue()
+        await messages.put({"type": "lifespan.startup"})
+        app_task = asyncio.create_task(api.app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}},
+                                               messages.get, sent.put))
+        started = time.perf_counter()
+        reply = await sent.get()
+        elapsed = time.perf_counter() - started
+        if reply["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"startup failed: {reply}")
+        await messages.put({"type": "lifespan.shutdown"})
+        await sent.get()
+        await app_task
+        return elapsed
+
+    return {"import_ms": round(imported * 1000, 1), "startup_ms": round(asyncio.run(lifespan()) * 1000, 1)}
+
+
+def benchmark_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("NEO4J_URI", UNREACHABLE_NEO4J)
+    # Keep journals of the throwaway write-behind queue out of the real directory
+    env.setdefault("WRITE_BEHIND_JOURNAL_DIR", tempfile.mkdtemp(prefix="rhiza-startup-"))
+    return env
+
+
+def sample(env: Dict[str, str]) -> Dict[str, float]:
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure"], cwd=API_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(env: Dict[str, str], count: int) -> List[Tuple[int, str]]:
+    """Top-level modules by cumulative import time, from ``python -X importtime``."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=API_DIR, env=env,
+                            capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)", line)
+        # Only direct imports of main (one level of indentation below it)
+        if match and len(match.group(2)) == 3:
+            rows.append((int(match.group(1)), match.group(3)))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure API import and startup time against budgets")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh-process samples; medians are compared")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS, help="Allowed median import time")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS, help="Allowed median startup time")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="Also list the N slowest imports")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure()))
+        return
+
+    env = benchmark_env()
+    samples = [sample(env) for _ in range(args.repeat)]
+    failed = []
+    for metric, budget in (("import_ms", args.import_budget_ms), ("startup_ms", args.startup_budget_ms)):
+        median = statistics.median(entry[metric] for entry in samples)
+        over = median > budget
+        if over:
+            failed.append(metric)
+        print(f"{metric:>11}: median {median:>8.1f} ms  max {max(entry[metric] for entry in samples):>8.1f} ms  "
+              f"budget {budget:>8.1f} ms{'  OVER BUDGET' if over else ''}")
+    if args.importtime:
+        for micros, module in slowest_imports(env, args.importtime):
+            print(f"{micros / 1000:>10.1f} ms  {module}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Equivalence check and micro-benchmark for services.validation.
+
+Compares the precompiled validator against the original per-call regex
+implementation (kept below verbatim) on a few hundred thousand generated
+inputs, then times both. Exits non-zero if any input is accepted, rejected,
+explained or sanitized differently.
+
+Usage:
+    python benchmarks/validation_bench.py
+    python benchmarks/validation_bench.py --cases 1000000 --seed 7
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import validation  # noqa: E402
+
+
+# --- Reference implementation (the previous behavior) ---
+
+def legacy_is_valid_english_word(word: str) -> bool:
+    if not word or not isinstance(word, str):
+        return False
+    word = word.strip().lower()
+    if len(word) < 1 or len(word) > 50:
+        return False
+    if not re.match(r"^[a-zA-Z\s'-]+$", word):
+        return False
+    sql_patterns = [
+        r"(union|select|insert|update|delete|drop|create|alter|exec|execute)",
+        r"(script|javascript|vbscript|onload|onerror)",
+        r"(<|>|&lt;|&gt;|%3c|%3e)",
+        r"(--|#|/\*|\*/)"
+    ]
+    for pattern in sql_patterns:
+        if re.search(pattern, word, re.IGNORECASE):
+            return False
+    if re.search(r'[qxz]{3,}|[bcdfghjklmnpqrstvwxyz]{6,}', word):
+        return False
+    if re.search(r'(.)\1{10,}', word):
+        return False
+    attack_strings = ['null', 'undefined', 'eval', 'function', 'constructor']
+    if word.lower() in attack_strings:
+        return False
+    return True
+
+
+def legacy_invalid_word_message(word: str) -> str:
+    if not word.strip():
+        return "Please enter a word to search"
+    elif len(word) < 1:
+        return "Word cannot be empty"
+    elif len(word) > 50:
+        return "Word is too long (maximum 50 characters)"
+    elif not re.match(r"^[a-zA-Z\s'-]+$", word):
+        return "Please use only letters, spaces, hyphens, and apostrophes"
+    else:
+        return "Invalid input detected. Please enter a valid English word"
+
+
+def legacy_sanitize_input(text: str) -> str:
+    if not text or not isinstance(text, str):
+        return ""
+    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+    text = text.replace('&', '&amp;')
+    text = text.replace('<', '&lt;')
+    text = text.replace('>', '&gt;')
+    text = text.replace('"', '&quot;')
+    text = text.replace("'", '&#x27;')
+    return text[:100].strip()
+
+
+# --- Input generation ---
+
+ALPHABET = (
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "qxzqxz bcdfg '-- \t\n\r\x0b\x0c\x00\x07\x1f\x7f"
+    "<>&;#/*%\"0123456789"
+    "  Kİſéλ"
+)
+FRAGMENTS = [
+    "union", "SELECT", "execute", "javascript", "vbScript", "onload", "onerror",
+    "drop", "alter", "create", "--", "/*", "*/", "&lt;", "%3c", "#",
+    "null", "eval", "function", "constructor", "undefined",
+    "philosophy", "logos", "don't", "well-known", "rhythms", "strengths",
+    "aaaaaaaaaaa", "zzz", "xxx", "Kelvin",
+]
+
+
+def random_input(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.35:
+        parts = [rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 3))]
+        text = rng.choice(["", " ", "-", "'"]).join(parts)
+    elif kind < 0.5:
+        char = rng.choice(ALPHABET)
+        text = char * rng.randint(1, 14)
+    else:
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 60)))
+    if rng.random() < 0.2:
+        text = rng.choice([" ", "\t", "\n"]) * rng.randint(1, 3) + text + " " * rng.randint(0, 3)
+    if rng.random() < 0.1:
+        text = text * rng.randint(2, 4)
+    return text
+
+
+def check_equivalence(cases: int, seed: int) -> int:
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(cases):
+        text = random_input(rng)
+        for word in (text, legacy_sanitize_input(text)):
+            expected_valid = legacy_is_valid_english_word(word)
+            reason = validation.validate_word(word)
+            problems = []
+            if (reason is None) != expected_valid:
+                problems.append(f"valid: expected {expected_valid}, got reason {reason}")
+            elif reason is not None and validation.reason_message(reason) != legacy_invalid_word_message(word):
+                problems.append(f"message for reason {reason}")
+            if validation.sanitize_input(word) != legacy_sanitize_input(word):
+                problems.append("sanitize_input")
+            if problems:
+                mismatches += 1
+                if mismatches <= 20:
+                    print(f"MISMATCH {word!r}: {', '.join(problems)}")
+    return mismatches
+
+
+def benchmark(number: int) -> None:
+    samples = ["philosophy", "Democracy", "well-known", "don't", "<script>", "unionize", "a" * 60, "rhythms"]
+
+    def legacy():
+        for word in samples:
+            word = legacy_sanitize_input(word)
+            if not legacy_is_valid_english_word(word):
+                legacy_invalid_word_message(word)
+
+    def current():
+        for word in samples:
+            word = validation.sanitize_input(word)
+            reason = validation.validate_word(word)
+            if reason is not None:
+                validation.reason_message(reason)
+
+    for name, func in (("legacy", legacy), ("precompiled", current)):
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:>12}: {seconds / (number * len(samples)) * 1e6:.2f} µs per word")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validate and benchmark services.validation")
+    parser.add_argument("--cases", type=int, default=200000, help="Generated inputs to compare")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--number", type=int, default=20000, help="Benchmark iterations")
+    args = parser.parse_args()
+
+    mismatches = check_equivalence(args.cases, args.seed)
+    print(f"equivalence: {args.cases} inputs, {mismatches} mismatches")
+    benchmark(args.number)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Rhiza bulk import/export
+
+Streams etymology records between JSONL/CSV files and Neo4j in batched UNWIND
+transactions, so a fresh environment can be warmed with hundreds of thousands of
+words without going through the API one word at a time.
+
+Usage:
+    python bulk_io.py import words.jsonl --batch-size 1000 --parallelism 4
+    python bulk_io.py import words.csv --format csv
+    python bulk_io.py export backup.jsonl
+    python bulk_io.py export - --format csv > backup.csv
+
+JSONL records look like the API's word results plus optional word metadata:
+    {"name": "philosophy", "definition": "...", "roots": [{"name": "φίλος", ...}]}
+GreekRoot nodes that no word derives from are exported as {"root": {...}} records.
+
+CSV files have one row per (word, root) pair using CSV_COLUMNS; a word without
+roots is a single row with empty root columns.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, TextIO
+
+import structlog
+from dotenv import load_dotenv
+
+from services.neo4j_service import MERGE_ROOT, EtymologyGraphService
+from services.normalize import with_root_keys
+
+logger = structlog.get_logger(__name__)
+
+WORD_FIELDS = ["definition", "first_use_year", "field", "complexity_level"]
+ROOT_FIELDS = ["name", "transliteration", "meaning", "category", "frequency", "part_of_speech"]
+LINK_FIELDS = ["strength", "position"]
+
+CSV_COLUMNS = (
+    ["word"] + WORD_FIELDS
+    + ["root_" + field if field == "name" else field for field in ROOT_FIELDS]
+    + LINK_FIELDS
+)
+
+IMPORT_QUERY = """
+UNWIND $records as record
+CALL {
+    WITH record
+    WITH record WHERE record.name IS NOT NULL
+    MERGE (w:EnglishWord {name: record.name})
+    SET w.definition = COALESCE(record.definition, w.definition),
+        w.first_use_year = COALESCE(record.first_use_year, w.first_use_year),
+        w.field = COALESCE(record.field, w.field),
+        w.complexity_level = COALESCE(record.complexity_level, w.complexity_level),
+        // A bare imported word was never analyzed; leave it for the AI rather than negative-caching it
+        w.analyzed_at = CASE
+            WHEN record.analyzed_at IS NOT NULL THEN record.analyzed_at
+            WHEN size(record.roots) > 0 THEN COALESCE(w.analyzed_at, timestamp())
+            ELSE w.analyzed_at
+        END
+    WITH w, record
+    UNWIND record.roots as root
+    """ + MERGE_ROOT + """
+    MERGE (w)-[d:DERIVES_FROM]->(r)
+    SET d.strength = COALESCE(root.strength, d.strength),
+        d.position = COALESCE(root.position, d.position)
+}
+CALL {
+    WITH record
+    WITH record.root as root WHERE root.name IS NOT NULL
+    """ + MERGE_ROOT + """
+}
+"""
+
+EXPORT_WORDS_QUERY = """
+MATCH (w:EnglishWord)
+RETURN w.name as name,
+       w.definition as definition,
+       w.first_use_year as first_use_year,
+       w.field as field,
+       w.complexity_level as complexity_level,
+       w.analyzed_at as analyzed_at,
+       COLLECT {
+           MATCH (w)-[d:DERIVES_FROM]->(r:GreekRoot)
+           RETURN {
+               name: r.name,
+               transliteration: r.transliteration,
+               meaning: r.meaning,
+               category: r.category,
+               frequency: r.frequency,
+               part_of_speech: r.part_of_speech,
+               strength: d.strength,
+               position: d.position
+           }
+       } as roots
+"""
+
+EXPORT_ORPHAN_ROOTS_QUERY = """
+MATCH (r:GreekRoot)
+WHERE NOT (r)<-[:DERIVES_FROM]-(:EnglishWord)
+RETURN {
+    name: r.name,
+    transliteration: r.transliteration,
+    meaning: r.meaning,
+    category: r.category,
+    frequency: r.frequency,
+    part_of_speech: r.part_of_speech
+} as root
+"""
+
+
+# --- Record readers ---
+
+def _clean(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop empty values so COALESCE keeps existing properties."""
+    return {key: value for key, value in record.items() if value not in (None, "")}
+
+
+def _normalize_word_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    if "root" in record:
+        root = _clean(record["root"])
+        if not root.get("name"):
+            raise ValueError("root record has no name")
+        return {"root": root}
+    normalized = _clean({key: record.get(key) for key in WORD_FIELDS + ["analyzed_at"]})
+    normalized["name"] = str(record["name"]).strip().lower()
+    normalized["roots"] = [_clean(root) for root in record.get("roots") or [] if root.get("name")]
+    return normalized
+
+
+def read_jsonl(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield _normalize_word_record(json.loads(line))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Skipping malformed record", line=line_number, error=str(e))
+
+
+def read_csv(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Group consecutive rows for the same word into one record."""
+    current: Optional[Dict[str, Any]] = None
+    for row in csv.DictReader(stream):
+        word = (row.get("word") or "").strip().lower()
+        if not word:
+            continue
+        if current is None or current["name"] != word:
+            if current is not None:
+                yield _normalize_word_record(current)
+            current = {key: row.get(key) for key in WORD_FIELDS}
+            current["name"] = word
+            try:
+                current["first_use_year"] = int(current["first_use_year"]) if current.get("first_use_year") else None
+            except ValueError:
+                current["first_use_year"] = None
+            current["roots"] = []
+        if row.get("root_name"):
+            root = {field: row.get("root_" + field if field == "name" else field) for field in ROOT_FIELDS}
+            root["strength"] = float(row["strength"]) if row.get("strength") else None
+            root["position"] = row.get("position")
+            current["roots"].append(root)
+    if current is not None:
+        yield _normalize_word_record(current)
+
+
+# --- Import ---
+
+def _with_keys(record: Dict[str, Any]) -> Dict[str, Any]:
+    if "root" in record:
+        return {"root": with_root_keys(record["root"])}
+    return dict(record, roots=[with_root_keys(root) for root in record["roots"]])
+
+
+async def _write_batch(service: EtymologyGraphService, records: List[Dict[str, Any]]) -> None:
+    records = [_with_keys(record) for record in records]
+
+    async def work(tx):
+        result = await tx.run(IMPORT_QUERY, records=records)
+        await result.consume()
+
+    async with service.driver.session() as session:
+        # execute_write retries transient errors such as deadlocks between parallel batches
+        await session.execute_write(work)
+
+
+async def import_records(
+    service: EtymologyGraphService,
+    records: Iterator[Dict[str, Any]],
+    batch_size: int = 1000,
+    parallelism: int = 4,
+) -> int:
+    """Write records in batches with up to ``parallelism`` concurrent transactions.
+
+    The batch queue is bounded, so memory stays proportional to
+    ``batch_size * parallelism`` regardless of the input size. If a batch
+    fails, the reader and the other writers are cancelled and the error is
+    raised instead of the import stalling on a full queue.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=parallelism * 2)
+    written = 0
+    started = time.monotonic()
+
+    async def produce() -> None:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await queue.put(batch)
+                batch = []
+        if batch:
+            await queue.put(batch)
+        for _ in range(parallelism):
+            await queue.put(None)
+
+    async def worker() -> None:
+        nonlocal written
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            await _write_batch(service, batch)
+            written += len(batch)
+            logger.info("Imported batch", records=written,
+                       rate=round(written / max(time.monotonic() - started, 1e-6)))
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(produce())
+            for _ in range(parallelism):
+                group.create_task(worker())
+    except ExceptionGroup as failures:
+        logger.error("Import failed", records=written, error=str(failures.exceptions[0]))
+        raise failures.exceptions[0]
+
+    logger.info("Import completed", records=written, seconds=round(time.monotonic() - started, 2))
+    return written
+
+
+# --- Export ---
+
+async def iter_export_records(service: EtymologyGraphService) -> AsyncIterator[Dict[str, Any]]:
+    """Stream every word (with roots) and every orphan root without loading the graph."""
+    async with service.driver.session() as session:
+        result = await session.run(EXPORT_WORDS_QUERY)
+        async for record in result:
+            yield _normalize_word_record(dict(record))
+
+        result = await session.run(EXPORT_ORPHAN_ROOTS_QUERY)
+        async for record in result:
+            yield {"root": _clean(record["root"])}
+
+
+def _csv_rows(record: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    if "root" in record:
+        # Orphan roots cannot be represented without a word in the CSV layout
+        return
+    base = {"word": record["name"], **{field: record.get(field) for field in WORD_FIELDS}}
+    if not record["roots"]:
+        yield base
+    for root in record["roots"]:
+        row = dict(base)
+        for field in ROOT_FIELDS:
+            row["root_" + field if field == "name" else field] = root.get(field)
+        for field in LINK_FIELDS:
+            row[field] = root.get(field)
+        yield row
+
+
+async def export_records(service: EtymologyGraphService, stream: TextIO, fmt: str = "jsonl") -> int:
+    exported = 0
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+
+    async for record in iter_export_records(service):
+        if writer is not None:
+            writer.writerows(_csv_rows(record))
+        else:
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        exported += 1
+
+    logger.info("Export completed", records=exported)
+    return exported
+
+
+# --- CLI ---
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+async def _run(args: argparse.Namespace) -> None:
+    service = EtymologyGraphService()
+    try:
+        fmt = _detect_format(args.path, args.format)
+        if args.command == "import":
+            stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+            with stream:
+                records = read_csv(stream) if fmt == "csv" else read_jsonl(stream)
+                await import_records(service, records, args.batch_size, args.parallelism)
+        else:
+            stream = sys.stdout if args.path == "-" else open(args.path, "w", encoding="utf-8", newline="")
+            with stream:
+                await export_records(service, stream, fmt)
+    finally:
+        await service.close()
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Bulk import/export for the Rhiza etymology graph")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subcommands.add_parser("import", help="Load JSONL or CSV records into Neo4j")
+    import_parser.add_argument("path", help="Input file, or - for stdin")
+    import_parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults to the file extension")
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="Records per UNWIND transaction")
+    import_parser.add_argument("--parallelism", type=int, default=4, help="Concurrent write transactions")
+
+    export_parser = subcommands.add_parser("export", help="Stream the whole graph to JSONL or CSV")
+    export_parser.add_argument("path", help="Output file, or - for stdout")
+    export_parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults to the file extension")
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args))
+    except Exception as e:
+        logger.error("Bulk operation failed", command=args.command, error=str(e), error_type=type(e).__name__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,26 +6,48 @@ using AI-powered analysis and graph database storage.
 """
 
 import os
+import base64
 import json
 import uuid
 import re
 import asyncio
-from typing import List, Dict, Optional
+import functools
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Response, Request
+from fastapi import FastAPI, HTTPException, Query, Response, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-import google.generativeai as genai
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
 import structlog
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from services.neo4j_service import EtymologyGraphService
+from services.cached_graph_service import CachedEtymologyGraphService
+from services.shared_cache import create_shared_cache
+from services.ai_providers import AllProvidersFailedError, LazyClient, ProviderPool, ProviderRouter
+from services.similarity import SimilarityIndex
+from services.suggest import SuggestionIndex
+from services.validation import reason_message, sanitize_input, validate_word
+from services.startup import BackgroundInit
+from services.write_behind import WriteBehindQueue
+from services.single_flight import FileLockBackend, SingleFlight
+from services.negative_cache import FailedAnalysisCache
+from services.http_cache import apply_cache_validators, compute_etag, http_date, matching_etag
+from services.encoding import negotiate, render
+from services.llm_json import normalize_etymology, read_json_object
+from services.metrics import (
+    AI_PROVIDER_FALLBACKS,
+    AI_PROVIDER_LATENCY,
+    REGISTRY,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    WORD_LOOKUPS,
+)
 
 # Load environment variables
 load_dotenv()
@@ -54,6 +76,96 @@ logger = structlog.get_logger(__name__)
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 AWS_REGION = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
 AWS_BEARER_TOKEN = os.environ.get("AWS_BEARER_TOKEN_BEDROCK")
+# Build provider clients in the background at startup instead of on the first miss
+AI_WARM_CLIENTS = os.environ.get("AI_WARM_CLIENTS", "true").lower() == "true"
+
+# AI provider execution limits
+BEDROCK_MAX_CONCURRENCY = int(os.environ.get("BEDROCK_MAX_CONCURRENCY", "8"))
+BEDROCK_TIMEOUT_SECONDS = float(os.environ.get("BEDROCK_TIMEOUT_SECONDS", "30"))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_TIMEOUT_SECONDS = float(os.environ.get("GEMINI_TIMEOUT_SECONDS", "30"))
+AI_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("AI_CIRCUIT_FAILURE_THRESHOLD", "5"))
+AI_CIRCUIT_RESET_SECONDS = float(os.environ.get("AI_CIRCUIT_RESET_SECONDS", "30"))
+# Hedging is off unless a delay or a latency quantile (e.g. 0.95) is configured
+AI_HEDGE_DELAY_SECONDS = float(os.environ["AI_HEDGE_DELAY_SECONDS"]) if os.environ.get("AI_HEDGE_DELAY_SECONDS") else None
+AI_HEDGE_QUANTILE = float(os.environ["AI_HEDGE_QUANTILE"]) if os.environ.get("AI_HEDGE_QUANTILE") else None
+# Output token caps; generation also stops as soon as the JSON answer is complete
+AI_MAX_TOKENS = int(os.environ.get("AI_MAX_TOKENS", "400"))
+AI_BATCH_TOKENS_PER_WORD = int(os.environ.get("AI_BATCH_TOKENS_PER_WORD", "150"))
+
+# Cross-worker coalescing of cache misses ("none" or "file")
+SINGLE_FLIGHT_LOCK_BACKEND = os.environ.get("SINGLE_FLIGHT_LOCK_BACKEND", "none").lower()
+SINGLE_FLIGHT_LOCK_DIR = os.environ.get("SINGLE_FLIGHT_LOCK_DIR", "/tmp/rhiza-locks")
+SINGLE_FLIGHT_LOCK_TIMEOUT = float(os.environ.get("SINGLE_FLIGHT_LOCK_TIMEOUT", "60"))
+
+# How long a failed analysis short-circuits further attempts for the same word
+FAILED_ANALYSIS_TTL_SECONDS = float(os.environ.get("FAILED_ANALYSIS_TTL_SECONDS", "60"))
+
+# In-process read-through cache in front of Neo4j
+GRAPH_CACHE_MAX_ENTRIES = int(os.environ.get("GRAPH_CACHE_MAX_ENTRIES", "10000"))
+GRAPH_CACHE_TTL_SECONDS = float(os.environ.get("GRAPH_CACHE_TTL_SECONDS", "300"))
+
+# Cache shared by all workers/replicas, checked after the in-process one
+# (empty = none, memory:// for a single process, redis://host:6379/0 for Redis-protocol servers)
+SHARED_CACHE_URL = os.environ.get("SHARED_CACHE_URL", "")
+SHARED_CACHE_TTL_SECONDS = float(os.environ.get("SHARED_CACHE_TTL_SECONDS", "3600"))
+
+# Rate limit counters: memory:// is per worker; use redis://... so limits hold across workers
+RATE_LIMIT_STORAGE_URI = os.environ.get("RATE_LIMIT_STORAGE_URI", "memory://")
+RATE_LIMIT_WORD = os.environ.get("RATE_LIMIT_WORD", "30/minute")
+RATE_LIMIT_BATCH = os.environ.get("RATE_LIMIT_BATCH", "10/minute")
+RATE_LIMIT_TEXT = os.environ.get("RATE_LIMIT_TEXT", "5/minute")
+RATE_LIMIT_SUGGEST = os.environ.get("RATE_LIMIT_SUGGEST", "120/minute")
+RATE_LIMIT_GRAPH = os.environ.get("RATE_LIMIT_GRAPH", "20/minute")
+RATE_LIMIT_NEIGHBORHOOD = os.environ.get("RATE_LIMIT_NEIGHBORHOOD", "20/minute")
+RATE_LIMIT_ROOT_WORDS = os.environ.get("RATE_LIMIT_ROOT_WORDS", "60/minute")
+RATE_LIMIT_SIMILAR = os.environ.get("RATE_LIMIT_SIMILAR", "60/minute")
+
+# Write-behind queue for analyzed words (journal dir empty = no journal)
+WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("WRITE_BEHIND_BATCH_SIZE", "200"))
+WRITE_BEHIND_FLUSH_INTERVAL_SECONDS = float(os.environ.get("WRITE_BEHIND_FLUSH_INTERVAL_SECONDS", "0.5"))
+WRITE_BEHIND_MAX_PENDING = int(os.environ.get("WRITE_BEHIND_MAX_PENDING", "10000"))
+WRITE_BEHIND_ENQUEUE_TIMEOUT_SECONDS = float(os.environ.get("WRITE_BEHIND_ENQUEUE_TIMEOUT_SECONDS", "2"))
+WRITE_BEHIND_JOURNAL_DIR = os.environ.get("WRITE_BEHIND_JOURNAL_DIR", "/tmp/rhiza-write-behind")
+WRITE_BEHIND_FSYNC = os.environ.get("WRITE_BEHIND_FSYNC", "false").lower() == "true"
+# Failures of a non-retryable batch before it is split, and a single record dead-lettered
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.environ.get("WRITE_BEHIND_MAX_ATTEMPTS", "5"))
+# How long graph-traversal endpoints wait for a just-analyzed word to reach Neo4j
+WRITE_BEHIND_READ_TIMEOUT_SECONDS = float(os.environ.get("WRITE_BEHIND_READ_TIMEOUT_SECONDS", "5"))
+
+# Batch endpoint limits
+BATCH_MAX_WORDS = int(os.environ.get("BATCH_MAX_WORDS", "500"))
+BATCH_PROMPT_GROUP_SIZE = int(os.environ.get("BATCH_PROMPT_GROUP_SIZE", "25"))
+
+# Streaming text analysis limits
+TEXT_MAX_CHARS = int(os.environ.get("TEXT_MAX_CHARS", "200000"))
+TEXT_LOOKUP_CHUNK_SIZE = int(os.environ.get("TEXT_LOOKUP_CHUNK_SIZE", "200"))
+TEXT_AI_CONCURRENCY = int(os.environ.get("TEXT_AI_CONCURRENCY", "8"))
+
+# Related words shown per root in the graph view
+GRAPH_RELATED_LIMIT = int(os.environ.get("GRAPH_RELATED_LIMIT", "8"))
+
+# Server-side caps for multi-hop neighborhood graphs
+NEIGHBORHOOD_MAX_DEPTH = int(os.environ.get("NEIGHBORHOOD_MAX_DEPTH", "4"))
+NEIGHBORHOOD_MAX_NODES = int(os.environ.get("NEIGHBORHOOD_MAX_NODES", "300"))
+NEIGHBORHOOD_MAX_FANOUT = int(os.environ.get("NEIGHBORHOOD_MAX_FANOUT", "25"))
+
+# Prefix index for /suggest, rebuilt from Neo4j periodically (0 = only at startup)
+SUGGEST_REFRESH_SECONDS = float(os.environ.get("SUGGEST_REFRESH_SECONDS", "600"))
+SUGGEST_MAX_RESULTS = int(os.environ.get("SUGGEST_MAX_RESULTS", "25"))
+
+# Precomputed similar words per word, rebuilt from Neo4j periodically (0 = only at startup).
+# A word is scored against at most SIMILAR_MAX_ROOT_WORDS words of each root, so hub roots stay cheap
+SIMILAR_MAX_RESULTS = int(os.environ.get("SIMILAR_MAX_RESULTS", "50"))
+SIMILAR_MAX_ROOT_WORDS = int(os.environ.get("SIMILAR_MAX_ROOT_WORDS", "2000"))
+SIMILAR_REFRESH_SECONDS = float(os.environ.get("SIMILAR_REFRESH_SECONDS", "3600"))
+
+# Page sizes for GET /root/{root_name}/words
+ROOT_WORDS_DEFAULT_PAGE_SIZE = int(os.environ.get("ROOT_WORDS_DEFAULT_PAGE_SIZE", "100"))
+ROOT_WORDS_MAX_PAGE_SIZE = int(os.environ.get("ROOT_WORDS_MAX_PAGE_SIZE", "500"))
+
+# Response compression: bodies smaller than this are sent as-is
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
 
 # CORS configuration
 ALLOWED_ORIGINS = os.environ.get("ALLOWED_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173,http://localhost:3000").split(",")
@@ -99,35 +211,97 @@ class GraphEdge(BaseModel):
 class GraphResponse(BaseModel):
     nodes: List[GraphNode] = Field(..., description="Graph nodes.")
     edges: List[GraphEdge] = Field(..., description="Graph edges.")
+    truncated: bool = Field(False, description="Whether the node cap stopped the expansion.")
 
 class WordResponse(BaseModel):
     name: str = Field(..., description="The original English word provided.")
     roots: List[GreekRoot] = Field(..., description="An array of root objects.")
     word_info: Optional[EnglishWordNode] = Field(None, description="Additional word information.")
 
+class BatchWordsRequest(BaseModel):
+    words: List[str] = Field(..., description="English words to analyze.")
+
+class BatchWordResult(BaseModel):
+    word: str = Field(..., description="The word as submitted.")
+    status: str = Field(..., description="found, analyzed, invalid or error.")
+    result: Optional[WordResponse] = Field(None, description="Etymology when status is found or analyzed.")
+    detail: Optional[str] = Field(None, description="Reason when status is invalid or error.")
+
+class BatchWordsResponse(BaseModel):
+    results: List[BatchWordResult] = Field(..., description="One result per submitted word, in order.")
+
+class TextAnalysisRequest(BaseModel):
+    text: str = Field(..., description="Free text to tokenize and analyze.")
+
+class Suggestion(BaseModel):
+    text: str = Field(..., description="The word, or the root's transliteration.")
+    type: str = Field(..., description="word or root.")
+    name: Optional[str] = Field(None, description="Greek name of a root suggestion.")
+    meaning: Optional[str] = Field(None, description="Meaning of a root suggestion.")
+    frequency: Optional[str] = Field(None, description="Root frequency, or a word's most frequent root.")
+
+class SuggestResponse(BaseModel):
+    query: str = Field(..., description="The prefix that was searched.")
+    suggestions: List[Suggestion] = Field(..., description="Matches, most frequent first.")
+
+class SimilarWord(BaseModel):
+    word: str = Field(..., description="A word sharing roots with the requested one.")
+    score: float = Field(..., description="Summed weight of the shared roots; rarer roots weigh more.")
+    shared_roots: List[str] = Field(..., description="Greek names of the roots both words derive from.")
+
+class SimilarWordsResponse(BaseModel):
+    word: str = Field(..., description="The word that was looked up.")
+    similar: List[SimilarWord] = Field(..., description="Most similar words first.")
+
+class RelatedWordsResponse(BaseModel):
+    root: str = Field(..., description="The root as requested.")
+    words: List[str] = Field(..., description="One page of words deriving from the root.")
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` for the next page; null on the last page.")
+
 # --- AI Configuration ---
 
-# Configure Gemini if API key is available
-if GEMINI_API_KEY:
+# The SDKs take most of a second to import, so they are loaded on first use
+# (or warmed in the background at startup) rather than at import time
+def _build_bedrock_client():
+    import boto3
+    client = boto3.client(
+        'bedrock-runtime', 
+        region_name=AWS_REGION,
+        aws_access_key_id=None,
+        aws_secret_access_key=None,
+        aws_session_token=AWS_BEARER_TOKEN
+    )
+    logger.info(f"Bedrock client initialized with bearer token for region {AWS_REGION}")
+    return client
+
+def _build_gemini_client():
+    import google.generativeai as genai
     genai.configure(api_key=GEMINI_API_KEY)
     logger.info("Gemini API configured")
+    return genai
 
-# Initialize Bedrock client with bearer token
-bedrock_client = None
-try:
-    if AWS_BEARER_TOKEN:
-        bedrock_client = boto3.client(
-            'bedrock-runtime', 
-            region_name=AWS_REGION,
-            aws_access_key_id=None,
-            aws_secret_access_key=None,
-            aws_session_token=AWS_BEARER_TOKEN
-        )
-        logger.info(f"Bedrock client initialized with bearer token for region {AWS_REGION}")
-    else:
-        logger.warning("AWS_BEARER_TOKEN_BEDROCK not provided, Bedrock unavailable")
-except Exception as e:
-    logger.warning(f"Failed to initialize Bedrock client: {e}")
+bedrock = LazyClient("bedrock", _build_bedrock_client, enabled=bool(AWS_BEARER_TOKEN))
+gemini = LazyClient("gemini", _build_gemini_client, enabled=bool(GEMINI_API_KEY))
+ai_clients = {"bedrock": bedrock, "gemini": gemini}
+
+if not bedrock.enabled:
+    logger.warning("AWS_BEARER_TOKEN_BEDROCK not provided, Bedrock unavailable")
+
+# Dedicated, size-limited thread pools so blocking SDK calls never run on the event loop
+provider_pools = {
+    "bedrock": ProviderPool("bedrock", BEDROCK_MAX_CONCURRENCY, BEDROCK_TIMEOUT_SECONDS),
+    "gemini": ProviderPool("gemini", GEMINI_MAX_CONCURRENCY, GEMINI_TIMEOUT_SECONDS),
+}
+
+# Skip providers that keep failing and optionally hedge slow ones with the next provider
+ai_router = ProviderRouter(
+    failure_threshold=AI_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=AI_CIRCUIT_RESET_SECONDS,
+    hedge_delay=AI_HEDGE_DELAY_SECONDS,
+    hedge_quantile=AI_HEDGE_QUANTILE,
+    is_valid=lambda result: isinstance(result, dict),
+    on_fallback=lambda from_provider, to_provider: AI_PROVIDER_FALLBACKS.inc(from_provider, to_provider),
+)
 
 # --- FastAPI App Configuration ---
 
@@ -137,8 +311,13 @@ app = FastAPI(
     version="1.0.0",
 )
 
-# Configure rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Configure rate limiter; if shared storage is unreachable, limits fall back to per-worker memory
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    key_prefix="rhiza",
+    in_memory_fallback_enabled=True,
+)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -156,210 +335,494 @@ async def add_request_id(request: Request, call_next):
     response.headers["X-Request-ID"] = request_id
     return response
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    REQUESTS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started,
+            route.path if route is not None else "unmatched",
+            request.method,
+            status,
+            getattr(request.state, "lookup_source", "none"),
+        )
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
+    allow_headers=["Content-Type", "Authorization", "If-None-Match", "If-Modified-Since"],
+    expose_headers=["ETag", "Last-Modified", "X-Request-ID"],
 )
 
-# Initialize Neo4j service
-graph_service = EtymologyGraphService()
-
-# --- System Prompt ---
-
-SYSTEM_PROMPT = """
-You are an expert linguist and etymologist with a specialization in Ancient Greek and its influence on the English language. Your sole function is to analyze an English word and provide its Greek root components in a structured JSON format with enriched metadata.
-
-**Your Task:**
-Given an English word, identify its primary Ancient Greek root(s). For each root, you must provide the original Greek term, its common English transliteration, its concise meaning, and additional linguistic metadata.
-
-**Output Rules:**
-1.  Your response MUST be a single, valid JSON object.
-2.  Do NOT include any explanatory text, apologies, or markdown formatting like ```json before or after the JSON object.
-3.  The JSON object must conform to the following structure:
-    - `name`: The original English word provided.
-    - `roots`: An array of root objects.
-        - Each root object must contain these string keys:
-          - `name` (the root in Ancient Greek script)
-          - `transliteration` (the common English transliteration)
-          - `meaning` (a concise English meaning)
-          - `category` (semantic category: emotion, abstract_concept, political, academic, nature, psychology, religion, human, skill, communication, size, distance, perception, or other)
-          - `frequency` (usage frequency in English: very_high, high, medium, low)
-          - `part_of_speech` (grammatical category: noun, adjective, verb, adverb, or other)
-4.  If the word is not of Greek origin, the `roots` array MUST be empty (`[]`).
-5.  If the word has multiple Greek roots, include an object for each root in the `roots` array.
-
-**Category Guidelines:**
-- emotion: feelings, emotions (φίλος, φόβος)
-- abstract_concept: ideas, concepts (σοφία, ἀρετή)
-- political: government, power (δῆμος, κρατία)
-- academic: study, knowledge (λόγος, μάθημα)
-- nature: natural world (βίος, γῆ, φύσις)
-- psychology: mind, soul (ψυχή, νοῦς)
-- religion: divine, sacred (θεός, ἱερός)
-- human: people, humanity (ἄνθρωπος)
-- communication: speech, writing (φωνή, γραφή)
-- perception: senses, observation (σκοπεῖν, ὁράω)
-
----
-Now, analyze the following word:
-"""
+# Initialize Neo4j service behind in-process and (optionally) shared read-through caches
+graph_service = CachedEtymologyGraphService(
+    EtymologyGraphService(),
+    maxsize=GRAPH_CACHE_MAX_ENTRIES,
+    ttl=GRAPH_CACHE_TTL_SECONDS,
+    shared=create_shared_cache(SHARED_CACHE_URL),
+    shared_ttl=SHARED_CACHE_TTL_SECONDS,
+)
+
+# Analyzed words are written to Neo4j in the background, in batches
+write_queue = WriteBehindQueue(
+    graph_service,
+    journal_dir=WRITE_BEHIND_JOURNAL_DIR or None,
+    batch_size=WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+    max_pending=WRITE_BEHIND_MAX_PENDING,
+    enqueue_timeout=WRITE_BEHIND_ENQUEUE_TIMEOUT_SECONDS,
+    fsync=WRITE_BEHIND_FSYNC,
+    max_attempts=WRITE_BEHIND_MAX_ATTEMPTS,
+)
+
+# Search-as-you-type over every known word and root, answered from memory
+suggestion_index = SuggestionIndex()
+suggestion_refresh_task: Optional[asyncio.Task] = None
+
+# Top similar words per word, for /word/{english_word}/similar and the graph view
+similarity_index = SimilarityIndex(capacity=SIMILAR_MAX_RESULTS, max_root_words=SIMILAR_MAX_ROOT_WORDS)
+similarity_refresh_task: Optional[asyncio.Task] = None
+
+async def initialize_graph():
+    await graph_service.create_indexes()
+    await graph_service.backfill_root_keys()
+
+# Index creation retries in the background, so startup never waits for Neo4j
+graph_init = BackgroundInit("neo4j_indexes", initialize_graph)
+ai_warm_task: Optional[asyncio.Future] = None
+
+# Coalesce concurrent misses for the same word into a single analysis
+word_lock_backend = FileLockBackend(SINGLE_FLIGHT_LOCK_DIR) if SINGLE_FLIGHT_LOCK_BACKEND == "file" else None
+analysis_flight = SingleFlight(lock_backend=word_lock_backend, lock_timeout=SINGLE_FLIGHT_LOCK_TIMEOUT)
+
+# Words whose analysis just failed are not retried until the TTL expires
+failed_analyses = FailedAnalysisCache(ttl=FAILED_ANALYSIS_TTL_SECONDS)
+
+# State that already lives on these objects is read when /metrics is scraped
+def _cache_samples(field: str) -> List[tuple]:
+    return [({"cache": name}, stats[field]) for name, stats in graph_service.cache_stats().items()]
+
+for _field, _type in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"),
+                      ("expirations", "counter"), ("size", "gauge"), ("hit_ratio", "gauge")):
+    REGISTRY.collector(
+        f"rhiza_graph_cache_{_field}" + ("_total" if _type == "counter" else ""),
+        f"Graph read cache {_field.replace('_', ' ')} by cache.",
+        _type,
+        functools.partial(_cache_samples, _field),
+    )
+def _shared_cache_samples(field: str) -> List[tuple]:
+    stats = graph_service.shared_cache_stats()
+    return [({"backend": stats["backend"]}, stats[field])] if stats else []
+
+for _field in ("hits", "misses", "errors"):
+    REGISTRY.collector(
+        f"rhiza_shared_cache_{_field}_total",
+        f"Shared result cache {_field} seen by this worker.",
+        "counter",
+        functools.partial(_shared_cache_samples, _field),
+    )
+REGISTRY.collector(
+    "rhiza_ai_provider_in_flight",
+    "AI provider calls currently occupying a pool slot.",
+    "gauge",
+    lambda: [({"provider": name}, pool.in_flight) for name, pool in provider_pools.items()],
+)
+REGISTRY.collector(
+    "rhiza_ai_circuit_open",
+    "1 when a provider's circuit breaker is open or half-open, else 0.",
+    "gauge",
+    lambda: [({"provider": name}, int(stats["state"] != "closed")) for name, stats in ai_router.stats().items()],
+)
+REGISTRY.collector(
+    "rhiza_write_behind_pending",
+    "Analyzed words queued for writing to Neo4j.",
+    "gauge",
+    lambda: [({}, write_queue.stats()["pending"])],
+)
+for _field in ("flushed", "failed_flushes", "dropped", "dead_lettered", "journal_errors"):
+    REGISTRY.collector(
+        f"rhiza_write_behind_{_field}_total",
+        f"Write-behind queue {_field.replace('_', ' ')} count.",
+        "counter",
+        functools.partial(lambda field: [({}, write_queue.stats()[field])], _field),
+    )
+REGISTRY.collector(
+    "rhiza_analyses_in_flight",
+    "Distinct word analyses currently running in this worker.",
+    "gauge",
+    lambda: [({}, analysis_flight.in_flight())],
+)
+
+# --- System Prompts ---
+
+# Compact schema: roots are positional rows, expanded by services.llm_json
+
+ROOT_ROW_SPEC = """Each root is a row: [greek, transliteration, meaning, category, frequency, pos]
+greek: the root in Greek script; meaning: a concise English gloss
+category: emotion|abstract_concept|political|academic|nature|psychology|religion|human|skill|communication|size|distance|perception|other
+frequency (use in English): very_high|high|medium|low
+pos: noun|adjective|verb|adverb|other
+A word not of Greek origin has no rows.
+Reply with the JSON only, no prose or markdown."""
+
+SYSTEM_PROMPT = f"""You are an etymologist of Ancient Greek. List the Greek roots of the English word below as
+{{"r":[row,...]}}
+{ROOT_ROW_SPEC}
+Example: philosophy -> {{"r":[["φίλος","philos","loving","emotion","high","adjective"],["σοφία","sophia","wisdom","abstract_concept","medium","noun"]]}}
+Word:"""
+
+BATCH_SYSTEM_PROMPT = f"""You are an etymologist of Ancient Greek. List the Greek roots of each English word below (one per line) as
+{{"w":{{"word":[row,...],...}}}}
+with one entry per word.
+{ROOT_ROW_SPEC}
+Example: philosophy, table -> {{"w":{{"philosophy":[["φίλος","philos","loving","emotion","high","adjective"],["σοφία","sophia","wisdom","abstract_concept","medium","noun"]],"table":[]}}}}
+Words:"""
 
 # --- Utility Functions ---
 
 def is_valid_english_word(word: str) -> bool:
     """Enhanced validation for English words with security checks."""
-    if not word or not isinstance(word, str):
-        return False
-    
-    # Strip whitespace and convert to lowercase for validation
-    word = word.strip().lower()
-    
-    # Length constraints
-    if len(word) < 1 or len(word) > 50:
-        return False
-    
-    # Only allow letters, hyphens, apostrophes, and spaces
-    if not re.match(r"^[a-zA-Z\s'-]+$", word):
-        return False
-    
-    # Prevent SQL injection patterns
-    sql_patterns = [
-        r"(union|select|insert|update|delete|drop|create|alter|exec|execute)",
-        r"(script|javascript|vbscript|onload|onerror)",
-        r"(<|>|&lt;|&gt;|%3c|%3e)",
-        r"(--|#|/\*|\*/)"
-    ]
-    
-    for pattern in sql_patterns:
-        if re.search(pattern, word, re.IGNORECASE):
-            return False
-    
-    # Reject obvious non-English patterns
-    if re.search(r'[qxz]{3,}|[bcdfghjklmnpqrstvwxyz]{6,}', word):
-        return False
-    
-    # Reject repeated characters (potential DoS)
-    if re.search(r'(.)\1{10,}', word):
-        return False
-    
-    # Reject common attack strings
-    attack_strings = ['null', 'undefined', 'eval', 'function', 'constructor']
-    if word.lower() in attack_strings:
-        return False
-    
-    return True
+    return validate_word(word) is None
 
-def sanitize_input(text: str) -> str:
-    """Sanitize input text to prevent XSS and injection attacks."""
-    if not text or not isinstance(text, str):
-        return ""
+def word_etag(result: dict) -> str:
+    """ETag for a word result, computed over exactly the fields WordResponse renders."""
+    return compute_etag({
+        "name": result["name"],
+        "roots": [{key: root.get(key) for key in ROOT_NODE_PROPERTIES} for root in result["roots"]],
+    })
+
+def negotiated_response(
+    request: Request,
+    content: Any,
+    cache_control: Optional[str] = None,
+    etag: Optional[str] = None,
+    last_modified_ms: Optional[int] = None,
+    compactable: bool = False,
+    bodies: Optional[dict] = None,
+) -> Response:
+    """Render ``content`` in the representation the client asked for.
+
+    Graph payloads (``compactable``) can be sent in the compact graph encoding,
+    and any body over RESPONSE_COMPRESSION_MIN_BYTES is compressed. Each
+    representation gets its own ETag. Rendered bodies are kept in ``bodies``
+    when given, so cached payloads are encoded once per representation.
+    ``content`` may be a zero-argument callable; with an ``etag`` it is only
+    built and rendered when the client's copy is stale.
+    """
+    representation = negotiate(request.headers.get("accept", ""), request.headers.get("accept-encoding", ""), compactable)
+    headers = {"Vary": "Accept, Accept-Encoding" if compactable else "Accept-Encoding"}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
     
-    # Remove null bytes and control characters
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+    if etag is not None:
+        # Validate before rendering. Small bodies go out uncompressed whatever was
+        # negotiated, so the client may hold the negotiated or the identity tag
+        candidates = [representation.etag(etag), representation._replace(encoding=None).etag(etag)]
+        validated_etag = matching_etag(request, candidates) or candidates[0]
+        not_modified = apply_cache_validators(request, Response(), validated_etag, cache_control, last_modified_ms)
+        if not_modified:
+            not_modified.headers.update(headers)
+            return not_modified
     
-    # HTML entity encoding for dangerous characters
-    text = text.replace('&', '&amp;')
-    text = text.replace('<', '&lt;')
-    text = text.replace('>', '&gt;')
-    text = text.replace('"', '&quot;')
-    text = text.replace("'", '&#x27;')
+    rendered = bodies.get(representation) if bodies is not None else None
+    if rendered is None:
+        rendered = render(content() if callable(content) else content, representation, RESPONSE_COMPRESSION_MIN_BYTES)
+        if bodies is not None:
+            bodies[representation] = rendered
+    body, encoding = rendered
     
-    # Limit length to prevent DoS
-    return text[:100].strip()
+    if etag is not None:
+        # Tag the coding actually applied
+        headers["ETag"] = representation._replace(encoding=encoding).etag(etag)
+        if last_modified_ms:
+            headers["Last-Modified"] = http_date(last_modified_ms)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=representation.media_type, headers=headers)
+
+WORD_TOKEN_PATTERN = re.compile(r"[A-Za-z]+(?:-[A-Za-z]+)*")
+
+def iter_unique_words(text: str) -> Iterator[str]:
+    """Yield each valid word in ``text`` once, lowercased, in order of first appearance."""
+    seen = set()
+    for match in WORD_TOKEN_PATTERN.finditer(text):
+        word = match.group().lower()
+        if word in seen:
+            continue
+        seen.add(word)
+        if is_valid_english_word(word):
+            yield word
 
 # --- AI Service Functions ---
 
-async def call_bedrock_ai(word: str) -> dict:
+def _bedrock_text(events) -> Iterator[str]:
+    """Text deltas of a Bedrock Claude response stream."""
+    for event in events:
+        chunk = json.loads(event["chunk"]["bytes"])
+        if chunk.get("type") == "content_block_delta":
+            yield chunk["delta"].get("text", "")
+
+def _invoke_bedrock(prompt: str, max_tokens: int) -> Tuple[Any, int]:
+    """Blocking streamed Bedrock invocation; runs on the Bedrock provider pool.
+
+    Returns the parsed JSON answer and the characters read. The stream is closed
+    as soon as the answer is complete.
+    """
+    response = bedrock.get().invoke_model_with_response_stream(
+        modelId='us.anthropic.claude-sonnet-4-20250514-v1:0',
+        body=json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        })
+    )
+    events = response['body']
+    try:
+        return read_json_object(_bedrock_text(events))
+    finally:
+        events.close()
+
+def _invoke_gemini(prompt: str, max_tokens: int) -> Tuple[Any, int]:
+    """Blocking streamed Gemini invocation; runs on the Gemini provider pool.
+
+    Returns the parsed JSON answer and the characters read. The stream is
+    cancelled as soon as the answer is complete.
+    """
+    model = gemini.get().GenerativeModel('gemini-1.5-flash')
+    response = model.generate_content(
+        prompt,
+        stream=True,
+        generation_config={"max_output_tokens": max_tokens, "response_mime_type": "application/json"},
+    )
+    chunks = (chunk.text for chunk in response)
+    try:
+        return read_json_object(chunks)
+    finally:
+        chunks.close()
+        # Stopping iteration alone leaves the gRPC/REST stream generating. The SDK has no public
+        # way to cancel it, so this reaches for the private stream and says so if that is gone
+        cancel = getattr(getattr(response, "_iterator", None), "cancel", None)
+        if callable(cancel):
+            cancel()
+        else:
+            logger.warning("Cannot cancel Gemini stream; it will generate until max_output_tokens",
+                           response_type=type(response).__name__)
+
+async def call_bedrock_ai(word: str, system_prompt: str = SYSTEM_PROMPT, max_tokens: int = AI_MAX_TOKENS) -> dict:
     """Call AWS Bedrock Claude model for etymology analysis."""
-    if not bedrock_client:
+    if not bedrock.enabled:
         raise Exception("Bedrock client not available")
     
+    started = time.perf_counter()
     try:
-        full_prompt = f"{SYSTEM_PROMPT}\n{word}"
+        full_prompt = f"{system_prompt}\n{word}"
         
         logger.info("Calling Bedrock API", word=word, model="claude-sonnet-4")
         
-        response = bedrock_client.invoke_model(
-            modelId='us.anthropic.claude-sonnet-4-20250514-v1:0',
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "messages": [{"role": "user", "content": full_prompt}]
-            })
-        )
-        
-        response_body = json.loads(response['body'].read())
-        content = response_body['content'][0]['text']
+        answer, response_length = await provider_pools["bedrock"].run(_invoke_bedrock, full_prompt, max_tokens)
         
-        # Parse the JSON response
-        result = json.loads(content)
+        # Validate the answer and expand the compact schema
+        result = normalize_etymology(answer, word)
+        AI_PROVIDER_LATENCY.observe(time.perf_counter() - started, "bedrock", "success")
         
         logger.info("Bedrock API success", 
                    word=word, 
                    roots_found=len(result.get('roots', [])),
-                   response_length=len(content))
+                   response_length=response_length)
         return result
         
-    except (ClientError, NoCredentialsError, json.JSONDecodeError) as e:
+    except Exception as e:
+        AI_PROVIDER_LATENCY.observe(time.perf_counter() - started, "bedrock", "error")
         logger.error("Bedrock API error", word=word, error=str(e), error_type=type(e).__name__)
         raise Exception(f"Bedrock API error: {e}")
 
-async def call_gemini_ai(word: str) -> dict:
+async def call_gemini_ai(word: str, system_prompt: str = SYSTEM_PROMPT, max_tokens: int = AI_MAX_TOKENS) -> dict:
     """Call Google Gemini model for etymology analysis."""
-    if not GEMINI_API_KEY:
+    if not gemini.enabled:
         raise Exception("Gemini API key not available")
     
+    started = time.perf_counter()
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        full_prompt = f"{SYSTEM_PROMPT}\n{word}"
+        full_prompt = f"{system_prompt}\n{word}"
         
         logger.info("Calling Gemini API", word=word, model="gemini-1.5-flash")
         
-        response = model.generate_content(full_prompt)
+        answer, response_length = await provider_pools["gemini"].run(_invoke_gemini, full_prompt, max_tokens)
         
-        # Parse the JSON response
-        result = json.loads(response.text)
+        # Validate the answer and expand the compact schema
+        result = normalize_etymology(answer, word)
+        AI_PROVIDER_LATENCY.observe(time.perf_counter() - started, "gemini", "success")
         
         logger.info("Gemini API success", 
                    word=word, 
                    roots_found=len(result.get('roots', [])),
-                   response_length=len(response.text))
+                   response_length=response_length)
         return result
         
-    except (json.JSONDecodeError, Exception) as e:
+    except Exception as e:
+        AI_PROVIDER_LATENCY.observe(time.perf_counter() - started, "gemini", "error")
         logger.error("Gemini API error", word=word, error=str(e), error_type=type(e).__name__)
         raise Exception(f"Gemini API error: {e}")
 
-async def get_ai_etymology(word: str) -> dict:
-    """Get etymology from AI with Bedrock first, Gemini fallback."""
+async def get_ai_etymology(word: str, system_prompt: str = SYSTEM_PROMPT, max_tokens: int = AI_MAX_TOKENS) -> dict:
+    """Get etymology from AI, preferring Bedrock and falling back to Gemini.
+
+    The router skips a provider whose circuit is open, so a failing Bedrock does
+    not add its failure latency to every miss.
+    """
     logger.info("Starting AI etymology analysis", word=word)
     
-    # Try Bedrock first
-    if bedrock_client:
+    providers = []
+    if bedrock.enabled:
+        providers.append(("bedrock", call_bedrock_ai))
+    if gemini.enabled:
+        providers.append(("gemini", call_gemini_ai))
+    
+    # No AI providers available - return empty result instead of error
+    if not providers:
+        logger.warning("No AI providers configured, returning empty result", word=word)
+        return {"name": word, "roots": []}
+    
+    try:
+        provider, result = await ai_router.call(providers, word, system_prompt, max_tokens)
+    except AllProvidersFailedError as e:
+        logger.error("All AI providers failed", word=word, error=str(e))
+        raise HTTPException(status_code=503, detail="AI services unavailable")
+    
+    logger.info("AI etymology completed", word=word, provider=provider)
+    return result
+
+async def get_ai_etymologies(words: List[str]) -> Dict[str, dict]:
+    """Analyze many words with grouped prompts; returns results for the words the AI answered."""
+    if not (bedrock.enabled or gemini.enabled):
+        # Same as a single-word lookup without providers: empty roots, nothing stored
+        logger.warning("No AI providers configured, returning empty results", words=len(words))
+        return {word: {"name": word, "roots": []} for word in words}
+    
+    groups = [words[i:i + BATCH_PROMPT_GROUP_SIZE] for i in range(0, len(words), BATCH_PROMPT_GROUP_SIZE)]
+    
+    async def analyze_group(group: List[str]) -> Dict[str, dict]:
         try:
-            result = await call_bedrock_ai(word)
-            logger.info("AI etymology completed", word=word, provider="bedrock")
-            return result
-        except Exception as e:
-            logger.warning("Bedrock failed, trying Gemini", word=word, error=str(e))
+            response = await get_ai_etymology(
+                "\n".join(group),
+                system_prompt=BATCH_SYSTEM_PROMPT,
+                max_tokens=AI_BATCH_TOKENS_PER_WORD * (len(group) + 1),
+            )
+        except HTTPException:
+            for word in group:
+                failed_analyses.record(word)
+            return {}
+        
+        answered = {}
+        for item in response.get("words", []):
+            if isinstance(item, dict) and isinstance(item.get("name"), str):
+                answered[item["name"].strip().lower()] = item
+        
+        results = {}
+        for word in group:
+            item = answered.get(word)
+            if item is None:
+                continue
+            try:
+                roots = [GreekRoot(**root).dict() for root in item.get("roots") or []]
+            except Exception as e:
+                logger.warning("Discarding malformed AI result", word=word, error=str(e))
+                continue
+            results[word] = {"name": word, "roots": roots}
+        return results
+    
+    results = {}
+    for group_results in await asyncio.gather(*(analyze_group(group) for group in groups)):
+        results.update(group_results)
+    return results
+
+async def analyze_and_store(word: str, refresh: bool = False) -> dict:
+    """Analyze a word with AI and store the result; runs once per word via single-flight."""
+    # Another request or worker may have stored the word while this one waited
+    if not refresh:
+        cached_result = write_queue.pending(word) or await graph_service.find_word_roots(word)
+        if cached_result:
+            logger.info("Found cached result after waiting", word=word, source="graph_db")
+            return cached_result
+    
+    logger.info("No cached result, using AI", word=word, refresh=refresh)
+    try:
+        result = await get_ai_etymology(word)
+    except HTTPException as e:
+        if e.status_code == 503:
+            failed_analyses.record(word)
+        raise
+    
+    if not result["roots"] and not (bedrock.enabled or gemini.enabled):
+        # Nothing was actually analyzed, so don't persist a negative result
+        return result
     
-    # Fallback to Gemini
-    if GEMINI_API_KEY:
+    # Store the result in graph for future queries (even if no roots found)
+    if await queue_etymology(word, result["roots"]):
+        logger.info("Queued etymology for graph write", word=word, roots_count=len(result["roots"]))
+        if word_lock_backend is not None and graph_service.shared is None:
+            # Workers waiting on this word's lock can only find the result in the graph,
+            # so write it before the lock is released or they would analyze it again
+            await write_queue.wait_flushed(word, WRITE_BEHIND_READ_TIMEOUT_SECONDS)
+    return result
+
+async def queue_etymology(word: str, roots: List[Dict]) -> bool:
+    """Hand a result to the write-behind queue and serve it from the cache until it is flushed."""
+    queued = await write_queue.enqueue(word, roots)
+    if queued:
+        await graph_service.prime({"name": word, "roots": roots})
+        suggestion_index.add_etymology(word, roots)
+        similarity_index.add_word(word, roots)
+    return queued
+
+async def refresh_suggestion_index():
+    """Build the suggestion index, then rebuild it to pick up words stored by other workers."""
+    # The first load would fail while Neo4j is still coming up
+    await graph_init.wait()
+    while True:
+        try:
+            await suggestion_index.load(graph_service.iter_suggestion_entries())
+        except Exception as e:
+            logger.warning("Failed to load suggestion index", error=str(e))
+        if SUGGEST_REFRESH_SECONDS <= 0:
+            return
+        await asyncio.sleep(SUGGEST_REFRESH_SECONDS)
+
+async def refresh_similarity_index():
+    """Build the similarity index, then rebuild it to pick up words stored by other workers."""
+    # The first load would fail while Neo4j is still coming up
+    await graph_init.wait()
+    while True:
         try:
-            result = await call_gemini_ai(word)
-            logger.info("AI etymology completed", word=word, provider="gemini")
-            return result
+            await similarity_index.load(graph_service.iter_word_roots())
         except Exception as e:
-            logger.error("All AI providers failed", word=word, error=str(e))
-            raise HTTPException(status_code=503, detail="AI services unavailable")
+            logger.warning("Failed to load similarity index", error=str(e))
+        if SIMILAR_REFRESH_SECONDS <= 0:
+            return
+        await asyncio.sleep(SIMILAR_REFRESH_SECONDS)
+
+async def resolve_etymology(word: str, refresh: bool = False) -> dict:
+    """Analyze a word that missed the graph, sharing the work with concurrent misses."""
+    if refresh:
+        failed_analyses.forget(word)
+    elif failed_analyses.has_failed(word):
+        logger.info("Skipping AI for recently failed word", word=word, source="negative_cache")
+        raise HTTPException(status_code=503, detail="AI services unavailable")
     
-    # No AI providers available - return empty result instead of error
-    logger.warning("No AI providers configured, returning empty result", word=word)
-    return {"name": word, "roots": []}
+    key = f"{word}:refresh" if refresh else word
+    return await analysis_flight.do(key, analyze_and_store, word, refresh)
 
 # --- Event Handlers ---
 
@@ -382,33 +845,29 @@ async def startup_event():
     
     logger.info("🚀 Initializing Rhiza API services...")
     
-    # Database connection with enhanced logging - non-blocking
-    max_retries = 10
-    retry_delay = 2
+    # Replay writes journaled by stopped workers; flushes retry until Neo4j is reachable
+    await write_queue.start()
     
-    logger.info("🔌 Connecting to Neo4j database...")
-    for attempt in range(max_retries):
-        try:
-            await graph_service.create_indexes()
-            logger.info("✅ Database connected and indexes created successfully")
-            break
-        except Exception as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"⚠️  Database connection failed (attempt {attempt + 1}/{max_retries}), retrying in {retry_delay}s", error=str(e))
-                await asyncio.sleep(retry_delay)
-            else:
-                logger.error("❌ Failed to connect to database after all retries")
-                logger.warning("⚠️  API will start without database - using AI fallback only")
+    # Everything below runs in the background so the app accepts traffic right away
+    logger.info("🔌 Connecting to Neo4j database in the background...")
+    graph_init.start()
+    
+    # Loaded in the background so a large graph does not delay startup
+    global suggestion_refresh_task, similarity_refresh_task, ai_warm_task
+    suggestion_refresh_task = asyncio.create_task(refresh_suggestion_index())
+    similarity_refresh_task = asyncio.create_task(refresh_similarity_index())
     
     # AI providers status
     ai_status = []
-    if bedrock_client:
+    if bedrock.enabled:
         ai_status.append("🧠 AWS Bedrock (Claude Sonnet 4)")
-    if GEMINI_API_KEY:
+    if gemini.enabled:
         ai_status.append("🔮 Google Gemini")
     
     if ai_status:
-        logger.info(f"🤖 AI providers ready: {', '.join(ai_status)}")
+        logger.info(f"🤖 AI providers configured: {', '.join(ai_status)}")
+        if AI_WARM_CLIENTS:
+            ai_warm_task = asyncio.gather(*(client.warm() for client in ai_clients.values()))
     else:
         logger.warning("⚠️  No AI providers configured")
     
@@ -416,7 +875,16 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    for task in (suggestion_refresh_task, similarity_refresh_task, ai_warm_task):
+        if task is not None:
+            task.cancel()
+    graph_init.cancel()
+    await write_queue.close()
+    if graph_service.shared is not None:
+        await graph_service.shared.close()
     await graph_service.close()
+    for pool in provider_pools.values():
+        pool.shutdown()
 
 # --- API Endpoints ---
 
@@ -427,87 +895,97 @@ async def health_check():
 
 @app.get("/ready")
 async def readiness_check():
-    """Readiness check - verifies dependencies are available"""
+    """Readiness check - reports the state of each dependency.
+
+    Returns 503 only when Neo4j is unreachable. Missing indexes or AI clients
+    that are still initializing make the status ``degraded`` but keep the
+    worker in rotation.
+    """
     try:
         # Test Neo4j connection
         async with graph_service.driver.session() as session:
             await session.run("RETURN 1")
-        
-        # Test AI providers (non-blocking)
-        ai_status = {
-            "bedrock": bedrock_client is not None,
-            "gemini": GEMINI_API_KEY is not None
-        }
-        
-        return {
-            "status": "ready",
-            "dependencies": {
-                "neo4j": "healthy",
-                "ai_providers": ai_status
-            }
-        }
+        neo4j_state = "healthy"
     except Exception as e:
         logger.error("Readiness check failed", error=str(e))
-        raise HTTPException(status_code=503, detail="Service not ready")
+        neo4j_state = "unavailable"
+    
+    # AI clients are built lazily: cold or initializing clients are fine, failed ones are not
+    ai_status = {name: client.stats() for name, client in ai_clients.items()}
+    degraded = not graph_init.ready or any(client.state == "failed" for client in ai_clients.values())
+    status = "not_ready" if neo4j_state != "healthy" else "degraded" if degraded else "ready"
+    
+    content = {
+        "status": status,
+        "dependencies": {
+            "neo4j": neo4j_state,
+            "neo4j_indexes": graph_init.stats(),
+            "ai_providers": ai_status,
+            "ai_provider_pools": {name: pool.stats() for name, pool in provider_pools.items()},
+            "ai_circuit_breakers": ai_router.stats()
+        },
+        "write_behind": write_queue.stats(),
+        "suggestion_index": suggestion_index.stats(),
+        "similarity_index": similarity_index.stats(),
+        "cache": graph_service.cache_stats(),
+        "shared_cache": graph_service.shared_cache_stats(),
+        "rate_limit_storage": RATE_LIMIT_STORAGE_URI.split("://", 1)[0]
+    }
+    if neo4j_state != "healthy":
+        return JSONResponse(status_code=503, content=content)
+    return content
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of this worker's metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/word/{english_word}", response_model=WordResponse)
-@limiter.limit("30/minute")  # 30 requests per minute per IP
-async def get_word_roots(request: Request, english_word: str, response: Response):
+@limiter.limit(RATE_LIMIT_WORD)  # Per client IP
+async def get_word_roots(request: Request, english_word: str, refresh: bool = False):
     """
     Analyzes an English word to find its Ancient Greek roots.
     Checks graph database first, falls back to AI if not found.
+    Pass ``refresh=true`` to force re-analysis of a cached word.
     """
-    response.headers["Content-Type"] = "application/json; charset=utf-8"
-    
     # Sanitize input first
     english_word = sanitize_input(english_word)
     
     logger.info("Etymology request started", word=english_word)
     
     # Enhanced input validation
-    if not is_valid_english_word(english_word):
-        logger.warning("Invalid word format", word=english_word, ip=get_remote_address(request))
-        if not english_word.strip():
-            raise HTTPException(status_code=400, detail="Please enter a word to search")
-        elif len(english_word) < 1:
-            raise HTTPException(status_code=400, detail="Word cannot be empty")
-        elif len(english_word) > 50:
-            raise HTTPException(status_code=400, detail="Word is too long (maximum 50 characters)")
-        elif not re.match(r"^[a-zA-Z\s'-]+$", english_word):
-            raise HTTPException(status_code=400, detail="Please use only letters, spaces, hyphens, and apostrophes")
-        else:
-            raise HTTPException(status_code=400, detail="Invalid input detected. Please enter a valid English word")
+    rejection = validate_word(english_word)
+    if rejection is not None:
+        logger.warning("Invalid word format", word=english_word, reason=rejection, ip=get_remote_address(request))
+        raise HTTPException(status_code=400, detail=reason_message(rejection))
     
     # Normalize word for processing
     normalized_word = english_word.strip().lower()
     
     try:
-        # First, check if we have this word in our graph
-        cached_result = await graph_service.find_word_roots(normalized_word)
+        # First, check if we have this word in our graph (including known no-root words)
+        cached_result = None if refresh else await graph_service.find_word_roots(normalized_word)
         if cached_result:
             logger.info("Found cached result", word=normalized_word, source="graph_db")
+            request.state.lookup_source = "graph"
+            WORD_LOOKUPS.inc("word", "graph")
             # Cache for 1 hour since data is stable
-            response.headers["Cache-Control"] = "public, max-age=3600"
-            response.headers["ETag"] = f'"{hash(str(cached_result))}"'
-            return cached_result
-        
-        # If not in graph, use AI to analyze the word
-        logger.info("No cached result, using AI", word=normalized_word)
-        result = await get_ai_etymology(normalized_word)
-        
-        # Store the result in graph for future queries (even if no roots found)
-        await graph_service.store_etymology(normalized_word, result["roots"])
-        if result.get("roots"):
-            logger.info("Stored etymology in graph", word=normalized_word, roots_count=len(result["roots"]))
-        else:
-            logger.info("Stored word with no roots in graph", word=normalized_word)
+            return negotiated_response(
+                request, lambda: jsonable_encoder(WordResponse(**cached_result)), "public, max-age=3600",
+                word_etag(cached_result), cached_result.get("analyzed_at"),
+            )
         
-        # Cache new results for 1 hour
-        response.headers["Cache-Control"] = "public, max-age=3600"
-        response.headers["ETag"] = f'"{hash(str(result))}"'
+        # If not in graph, use AI to analyze the word (once, however many requests are waiting)
+        request.state.lookup_source = "ai"
+        WORD_LOOKUPS.inc("word", "ai")
+        result = await resolve_etymology(normalized_word, refresh)
         
         logger.info("Etymology request completed", word=normalized_word, roots_found=len(result.get("roots", [])))
-        return result
+        # Cache new results for 1 hour
+        return negotiated_response(
+            request, lambda: jsonable_encoder(WordResponse(**result)), "public, max-age=3600",
+            word_etag(result), result.get("analyzed_at"),
+        )
 
     except HTTPException:
         raise
@@ -520,10 +998,187 @@ async def get_word_roots(request: Request, english_word: str, response: Response
         else:
             raise HTTPException(status_code=500, detail="An unexpected error occurred. Please try again.")
 
-@app.get("/root/{root_name}/words")
-async def get_words_from_root(root_name: str):
+@app.post("/words", response_model=BatchWordsResponse)
+@limiter.limit(RATE_LIMIT_BATCH)
+async def get_words_roots(request: Request, payload: BatchWordsRequest):
     """
-    Find all words that derive from a specific Greek root.
+    Analyzes many English words at once.
+    Known words are resolved in a single graph query; only the misses are sent to
+    the AI in grouped prompts, and their results are written back in one batch.
+    """
+    if len(payload.words) > BATCH_MAX_WORDS:
+        raise HTTPException(status_code=400, detail=f"Too many words (maximum {BATCH_MAX_WORDS})")
+    
+    # Validate and normalize, keeping the first occurrence of each word
+    normalized = {}
+    invalid = {}
+    for submitted in payload.words:
+        word = sanitize_input(submitted)
+        rejection = validate_word(word)
+        if rejection is not None:
+            invalid[submitted] = reason_message(rejection)
+        else:
+            normalized.setdefault(submitted, word.strip().lower())
+    unique_words = list(dict.fromkeys(normalized.values()))
+    
+    logger.info("Batch etymology request started", words=len(payload.words), unique=len(unique_words), invalid=len(invalid))
+    
+    try:
+        found = await graph_service.find_words_roots(unique_words)
+        
+        misses = [word for word in unique_words if word not in found]
+        failed = {word for word in misses if failed_analyses.has_failed(word)}
+        to_analyze = [word for word in misses if word not in failed]
+        WORD_LOOKUPS.inc("words", "graph", amount=len(found))
+        WORD_LOOKUPS.inc("words", "ai", amount=len(to_analyze))
+        
+        analyzed = await get_ai_etymologies(to_analyze) if to_analyze else {}
+        if analyzed and (bedrock.enabled or gemini.enabled):
+            for item in analyzed.values():
+                await queue_etymology(item["name"], item["roots"])
+    except Exception as e:
+        logger.error("Unexpected error in batch etymology request", error=str(e), error_type=type(e).__name__)
+        raise HTTPException(status_code=500, detail="An unexpected error occurred. Please try again.")
+    
+    results = []
+    for submitted in payload.words:
+        if submitted in invalid:
+            results.append(BatchWordResult(word=submitted, status="invalid", detail=invalid[submitted]))
+            continue
+        word = normalized[submitted]
+        if word in found:
+            results.append(BatchWordResult(word=submitted, status="found", result=found[word]))
+        elif word in analyzed:
+            results.append(BatchWordResult(word=submitted, status="analyzed", result=analyzed[word]))
+        else:
+            results.append(BatchWordResult(word=submitted, status="error", detail="Etymology analysis unavailable, please try again"))
+    
+    logger.info("Batch etymology request completed", found=len(found), analyzed=len(analyzed),
+               errors=len(unique_words) - len(found) - len(analyzed))
+    return negotiated_response(request, jsonable_encoder(BatchWordsResponse(results=results)))
+
+def _format_stream_event(payload: dict, sse: bool) -> bytes:
+    data = json.dumps(payload, ensure_ascii=False)
+    if sse:
+        return f"event: {payload['type']}\ndata: {data}\n\n".encode("utf-8")
+    return f"{data}\n".encode("utf-8")
+
+async def stream_text_etymologies(text: str, sse: bool) -> AsyncIterator[bytes]:
+    """Yield etymologies for every unique word in ``text`` as soon as each one resolves.
+    
+    Words already in the graph are looked up in chunks and emitted first; the
+    misses are then analyzed with bounded concurrency and emitted in completion
+    order. Nothing is accumulated apart from the list of missed words.
+    """
+    counts = {"found": 0, "analyzed": 0, "error": 0}
+    misses = []
+    
+    words = iter_unique_words(text)
+    while True:
+        chunk = [word for _, word in zip(range(TEXT_LOOKUP_CHUNK_SIZE), words)]
+        if not chunk:
+            break
+        found = await graph_service.find_words_roots(chunk)
+        for word in chunk:
+            if word in found:
+                counts["found"] += 1
+                yield _format_stream_event({"type": "result", "word": word, "status": "found", "result": found[word]}, sse)
+            else:
+                misses.append(word)
+    
+    async def analyze(word: str) -> dict:
+        try:
+            result = await resolve_etymology(word)
+            return {"type": "result", "word": word, "status": "analyzed", "result": result}
+        except HTTPException as e:
+            return {"type": "result", "word": word, "status": "error", "detail": e.detail}
+        except Exception as e:
+            logger.warning("Streaming analysis failed for word", word=word, error=str(e))
+            return {"type": "result", "word": word, "status": "error", "detail": "Etymology analysis unavailable"}
+    
+    pending = set()
+    remaining = iter(misses)
+    try:
+        while True:
+            for word in remaining:
+                pending.add(asyncio.ensure_future(analyze(word)))
+                if len(pending) >= TEXT_AI_CONCURRENCY:
+                    break
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                event = task.result()
+                counts[event["status"]] += 1
+                yield _format_stream_event(event, sse)
+    finally:
+        # Client went away: stop scheduling work (in-flight analyses still complete and get stored)
+        for task in pending:
+            task.cancel()
+    
+    yield _format_stream_event({"type": "done", **counts}, sse)
+
+@app.post("/text/etymologies")
+@limiter.limit(RATE_LIMIT_TEXT)
+async def stream_text_analysis(request: Request, payload: TextAnalysisRequest):
+    """
+    Streams the etymology of every unique word in a text.
+    Responds with NDJSON, or Server-Sent Events when the client accepts text/event-stream.
+    """
+    if len(payload.text) > TEXT_MAX_CHARS:
+        raise HTTPException(status_code=400, detail=f"Text is too long (maximum {TEXT_MAX_CHARS} characters)")
+    
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    logger.info("Text analysis stream started", characters=len(payload.text), sse=sse)
+    return StreamingResponse(
+        stream_text_etymologies(payload.text, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/suggest", response_model=SuggestResponse)
+@limiter.limit(RATE_LIMIT_SUGGEST)
+async def suggest(request: Request, response: Response,
+                  q: str = Query(..., min_length=1, max_length=50),
+                  limit: int = Query(10, ge=1, le=SUGGEST_MAX_RESULTS)):
+    """
+    Prefix suggestions over known English words and Greek roots (Latin or Greek script).
+    Served from an in-memory index, so typing never triggers an AI analysis.
+    """
+    response.headers["Cache-Control"] = "public, max-age=60"
+    return {"query": q, "suggestions": suggestion_index.suggest(q, limit)}
+
+def encode_cursor(after: List) -> str:
+    return base64.urlsafe_b64encode(json.dumps(after, ensure_ascii=False).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> List:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("malformed cursor")
+    if not (isinstance(after, list) and len(after) == 2 and isinstance(after[1], str)
+            and isinstance(after[0], (str, int, float))):
+        raise ValueError("malformed cursor")
+    return after
+
+@app.get("/root/{root_name}/words", response_model=RelatedWordsResponse)
+@limiter.limit(RATE_LIMIT_ROOT_WORDS)
+async def get_words_from_root(
+    request: Request,
+    root_name: str,
+    response: Response,
+    limit: int = Query(ROOT_WORDS_DEFAULT_PAGE_SIZE, ge=1, le=ROOT_WORDS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, max_length=512, description="`next_cursor` from the previous page."),
+    sort: str = Query("name", pattern="^(name|first_use_year)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    field: Optional[str] = Query(None, max_length=100),
+    complexity_level: Optional[str] = Query(None, max_length=50),
+):
+    """
+    Find the words that derive from a specific Greek root, one page at a time.
+    Follow `next_cursor` until it is null; a cursor is only valid with the same
+    sort, order and filters it was issued for.
     """
     # Sanitize and validate input
     root_name = sanitize_input(root_name)
@@ -531,115 +1186,272 @@ async def get_words_from_root(root_name: str):
     if not root_name or len(root_name) > 100:
         raise HTTPException(status_code=400, detail="Invalid root name")
     
-    # Allow Greek characters, Latin characters, and common transliteration symbols
-    if not re.match(r"^[\u0370-\u03FF\u1F00-\u1FFFa-zA-Z\s'-]+$", root_name):
+    # Allow Greek characters (precomposed or with combining accents), Latin characters,
+    # and common transliteration symbols
+    if not re.match(r"^[\u0300-\u036F\u0370-\u03FF\u1F00-\u1FFFa-zA-Z\s'-]+$", root_name):
         raise HTTPException(status_code=400, detail="Invalid characters in root name")
     
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
     try:
-        words = await graph_service.get_related_words(root_name.strip())
-        return {"root": root_name, "words": words}
+        page = await graph_service.get_related_words_page(
+            root_name.strip(),
+            limit,
+            sort=sort,
+            descending=order == "desc",
+            after=after,
+            field=field,
+            complexity_level=complexity_level,
+        )
+        payload = {
+            "root": root_name,
+            "words": page["words"],
+            "next_cursor": encode_cursor(page["next_after"]) if page["next_after"] else None,
+        }
+        not_modified = apply_cache_validators(request, response, compute_etag(payload), "public, max-age=300")
+        return not_modified or payload
     except Exception as e:
         logger.error("Error in related words request", root=root_name, error=str(e))
         raise HTTPException(status_code=500, detail="Unable to retrieve related words")
 
+def build_word_graph(english_word: str, roots: List[dict]) -> dict:
+    """Build visualization nodes and links for a word, its roots and any related words."""
+    nodes = []
+    edges = []
+    seen_related = set()
+    
+    # Add English word node
+    word_node = GraphNode(
+        id=f"word_{english_word}",
+        label=english_word,
+        type="word",
+        properties={"name": english_word}
+    )
+    nodes.append(word_node)
+    
+    # Add root nodes and edges
+    for root_data in roots:
+        root = GreekRoot(**root_data)
+        root_node = GraphNode(
+            id=f"root_{root.transliteration}",
+            label=f"{root.name}\n({root.transliteration})",
+            type="root",
+            properties={
+                "name": root.name,
+                "transliteration": root.transliteration,
+                "meaning": root.meaning,
+                "category": root.category,
+                "frequency": root.frequency,
+                "part_of_speech": root.part_of_speech
+            }
+        )
+        nodes.append(root_node)
+        
+        # Add derivation edge
+        edge = GraphEdge(
+            source=f"word_{english_word}",
+            target=f"root_{root.transliteration}",
+            type="DERIVES_FROM",
+            properties={"strength": 0.9}
+        )
+        edges.append(edge)
+        
+        # Add related words returned with the root (already limited by the query)
+        for related_word in root_data.get("related", []):
+            if related_word.lower() == english_word.lower():
+                continue
+            if related_word not in seen_related:
+                seen_related.add(related_word)
+                related_node = GraphNode(
+                    id=f"word_{related_word}",
+                    label=related_word,
+                    type="related",
+                    properties={"name": related_word}
+                )
+                nodes.append(related_node)
+            
+            related_edge = GraphEdge(
+                source=f"root_{root.transliteration}",
+                target=f"word_{related_word}",
+                type="DERIVES_FROM",
+                properties={"strength": 0.7}
+            )
+            edges.append(related_edge)
+    
+    return {"nodes": [node.dict() for node in nodes], "links": [edge.dict() for edge in edges]}
+
+WORD_NODE_PROPERTIES = ("name", "definition", "first_use_year", "field", "complexity_level")
+ROOT_NODE_PROPERTIES = ("name", "transliteration", "meaning", "category", "frequency", "part_of_speech")
+
+def build_neighborhood_graph(neighborhood: dict) -> GraphResponse:
+    """Convert a neighborhood query result into deduplicated graph nodes and edges."""
+    nodes = []
+    node_ids = {}
+    for entry in neighborhood["nodes"]:
+        props = entry["properties"]
+        if "GreekRoot" in entry["labels"]:
+            node_id = f"root_{props.get('transliteration')}"
+            label = f"{props.get('name')}\n({props.get('transliteration')})"
+            node_type = "GreekRoot"
+            properties = {key: props.get(key) for key in ROOT_NODE_PROPERTIES}
+        else:
+            node_id = f"word_{props.get('name')}"
+            label = props.get("name")
+            node_type = "EnglishWord"
+            properties = {key: props.get(key) for key in WORD_NODE_PROPERTIES}
+        properties["depth"] = entry["depth"]
+        node_ids[entry["id"]] = node_id
+        nodes.append(GraphNode(id=node_id, label=label, type=node_type, properties=properties))
+    
+    edges = [
+        GraphEdge(
+            source=node_ids[source],
+            target=node_ids[target],
+            type="DERIVES_FROM",
+            properties={"strength": 0.9 if node_ids[source] == nodes[0].id else 0.7}
+        )
+        for source, target in neighborhood["links"]
+    ]
+    return GraphResponse(nodes=nodes, edges=edges, truncated=neighborhood["truncated"])
+
+@app.get("/word/{english_word}/neighborhood", response_model=GraphResponse)
+@limiter.limit(RATE_LIMIT_NEIGHBORHOOD)
+async def get_word_neighborhood(
+    request: Request,
+    english_word: str,
+    depth: int = Query(2, ge=1, le=NEIGHBORHOOD_MAX_DEPTH),
+    max_nodes: int = Query(100, ge=1, le=NEIGHBORHOOD_MAX_NODES),
+    fanout: int = Query(10, ge=1, le=NEIGHBORHOOD_MAX_FANOUT),
+):
+    """
+    Get the multi-hop neighborhood of a word (word -> root -> word -> root ...).
+    Built with a single graph query, with depth, total node and per-node fan-out caps.
+    """
+    if not re.match(r"^[a-zA-Z\s'-]+$", english_word):
+        raise HTTPException(status_code=400, detail="Invalid characters in word")
+    
+    normalized_word = english_word.strip().lower()
+    try:
+        neighborhood = await graph_service.find_neighborhood(normalized_word, depth, max_nodes, fanout)
+        if neighborhood is None:
+            # Unknown word: analyze it first so the neighborhood has a center
+            await resolve_etymology(normalized_word)
+            await write_queue.wait_flushed(normalized_word, WRITE_BEHIND_READ_TIMEOUT_SECONDS)
+            neighborhood = await graph_service.find_neighborhood(normalized_word, depth, max_nodes, fanout)
+        if neighborhood is None:
+            raise HTTPException(status_code=404, detail="Word not found")
+        
+        logger.info("Neighborhood request completed", word=normalized_word, depth=depth,
+                   nodes=len(neighborhood["nodes"]), links=len(neighborhood["links"]))
+        return negotiated_response(
+            request, jsonable_encoder(build_neighborhood_graph(neighborhood)), compactable=True
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error in neighborhood request", word=normalized_word, error=str(e))
+        raise HTTPException(status_code=500, detail="Unable to generate neighborhood graph")
+
+def has_similar_words(word: str) -> bool:
+    """Whether the similarity index is loaded and can rank related words for ``word``."""
+    return similarity_index.loaded_at is not None and word in similarity_index
+
+@app.get("/word/{english_word}/similar", response_model=SimilarWordsResponse)
+@limiter.limit(RATE_LIMIT_SIMILAR)
+async def get_similar_words(request: Request, english_word: str, response: Response,
+                            limit: int = Query(10, ge=1, le=SIMILAR_MAX_RESULTS)):
+    """
+    Words sharing the most Greek roots with this one, rarer roots counting more.
+    Answered from a precomputed index; an unknown word is analyzed first.
+    """
+    english_word = sanitize_input(english_word)
+    rejection = validate_word(english_word)
+    if rejection is not None:
+        raise HTTPException(status_code=400, detail=reason_message(rejection))
+    
+    normalized_word = english_word.strip().lower()
+    try:
+        if normalized_word not in similarity_index:
+            word_data = await graph_service.find_word_roots(normalized_word)
+            if word_data:
+                similarity_index.add_word(normalized_word, word_data["roots"])
+            else:
+                # Analyzing the word adds it to the index
+                await resolve_etymology(normalized_word)
+        
+        response.headers["Cache-Control"] = "public, max-age=300"
+        return {"word": normalized_word, "similar": similarity_index.similar(normalized_word, limit)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error in similar words request", word=normalized_word, error=str(e))
+        raise HTTPException(status_code=500, detail="Unable to retrieve similar words")
+
+GRAPH_CACHE_CONTROL = "public, max-age=300"
+
 @app.get("/word/{english_word}/graph")
-async def get_word_graph(english_word: str, include_related: bool = False):
+@limiter.limit(RATE_LIMIT_GRAPH)
+async def get_word_graph(request: Request, english_word: str,
+                         include_related: bool = False, refresh: bool = False):
     """Get enriched graph data for visualization."""
     if not re.match(r"^[a-zA-Z\s'-]+$", english_word):
         raise HTTPException(status_code=400, detail="Invalid characters in word")
     
     try:
-        # Use the existing etymology endpoint logic
         normalized_word = english_word.strip().lower()
         
-        # First, check if we have this word in our graph
-        cached_result = await graph_service.find_word_roots(normalized_word)
-        if cached_result:
-            # Convert cached result to WordResponse format
-            word_data = WordResponse(
-                name=cached_result["name"],
-                roots=[GreekRoot(**root) for root in cached_result["roots"]],
-                word_info=None
-            )
+        # Hot words are answered with the bytes rendered for an earlier request
+        payload_key = (english_word, include_related)
+        cached_payload = None if refresh else graph_service.graph_payloads.get(payload_key)
+        if cached_payload is not None:
+            etag, graph, bodies = cached_payload
+            request.state.lookup_source = "cache"
+            WORD_LOOKUPS.inc("graph", "cache")
+            return negotiated_response(request, graph, GRAPH_CACHE_CONTROL, etag, compactable=True, bodies=bodies)
+        generation = graph_service.graph_payloads.generation
+        
+        # Otherwise, check if we have this word in our graph. Related words come from
+        # the similarity index when it knows the word; otherwise the word, its roots
+        # and their related words come back in a single query
+        if refresh:
+            word_data = None
+        elif include_related and not has_similar_words(normalized_word):
+            word_data = await graph_service.find_word_graph(normalized_word, GRAPH_RELATED_LIMIT)
         else:
-            # If not in graph, use AI to analyze the word
-            logger.info("No cached result, using AI", word=normalized_word)
-            ai_result = await get_ai_etymology(normalized_word)
-            
-            # Store the result in graph for future queries
-            await graph_service.store_etymology(normalized_word, ai_result["roots"])
-            
-            word_data = WordResponse(
-                name=ai_result["name"],
-                roots=[GreekRoot(**root) for root in ai_result["roots"]],
-                word_info=None
-            )
+            word_data = await graph_service.find_word_roots(normalized_word)
         
-        # Build graph nodes and edges
-        nodes = []
-        edges = []
+        request.state.lookup_source = "ai" if not word_data else "graph"
+        WORD_LOOKUPS.inc("graph", request.state.lookup_source)
+        if not word_data:
+            # If not in graph, use AI to analyze the word
+            word_data = await resolve_etymology(normalized_word, refresh)
+            if include_related and word_data["roots"] and not has_similar_words(normalized_word):
+                await write_queue.wait_flushed(normalized_word, WRITE_BEHIND_READ_TIMEOUT_SECONDS)
+                word_data = await graph_service.find_word_graph(normalized_word, GRAPH_RELATED_LIMIT) or word_data
+        if include_related and has_similar_words(normalized_word):
+            related = similarity_index.related_by_root(normalized_word, GRAPH_RELATED_LIMIT)
+            word_data = dict(word_data, roots=[
+                dict(root, related=related.get(root["name"], [])) for root in word_data["roots"]
+            ])
         
-        # Add English word node
-        word_node = GraphNode(
-            id=f"word_{english_word}",
-            label=english_word,
-            type="word",
-            properties={"name": english_word}
+        # The graph is derived entirely from these inputs
+        etag = compute_etag(["graph", english_word, include_related, word_data["roots"]])
+        graph = build_word_graph(english_word, word_data["roots"])
+        bodies = {}
+        graph_service.graph_payloads.set(
+            payload_key, (etag, graph, bodies),
+            tags=graph_service.payload_tags(normalized_word, word_data["roots"]),
+            generation=generation,
         )
-        nodes.append(word_node)
-        
-        # Add root nodes and edges
-        for root in word_data.roots:
-            root_node = GraphNode(
-                id=f"root_{root.transliteration}",
-                label=f"{root.name}\n({root.transliteration})",
-                type="root",
-                properties={
-                    "name": root.name,
-                    "transliteration": root.transliteration,
-                    "meaning": root.meaning,
-                    "category": getattr(root, 'category', None),
-                    "frequency": getattr(root, 'frequency', None),
-                    "part_of_speech": getattr(root, 'part_of_speech', None)
-                }
-            )
-            nodes.append(root_node)
-            
-            # Add derivation edge
-            edge = GraphEdge(
-                source=f"word_{english_word}",
-                target=f"root_{root.transliteration}",
-                type="DERIVES_FROM",
-                properties={"strength": 0.9}
-            )
-            edges.append(edge)
-            
-            # Add related words if requested
-            if include_related:
-                try:
-                    related_words = await graph_service.get_related_words(root.transliteration)
-                    for related_word in related_words[:8]:  # Limit to 8 per root
-                        if related_word.lower() != english_word.lower():
-                            related_node = GraphNode(
-                                id=f"word_{related_word}",
-                                label=related_word,
-                                type="related",
-                                properties={"name": related_word}
-                            )
-                            nodes.append(related_node)
-                            
-                            related_edge = GraphEdge(
-                                source=f"root_{root.transliteration}",
-                                target=f"word_{related_word}",
-                                type="DERIVES_FROM",
-                                properties={"strength": 0.7}
-                            )
-                            edges.append(related_edge)
-                except Exception as e:
-                    logger.warning(f"Could not fetch related words for {root.transliteration}: {e}")
-        
-        return {"nodes": [node.dict() for node in nodes], "links": [edge.dict() for edge in edges]}
+        return negotiated_response(request, graph, GRAPH_CACHE_CONTROL, etag, compactable=True, bodies=bodies)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error in graph request", word=english_word, error=str(e))
         raise HTTPException(status_code=500, detail="Unable to generate graph data")
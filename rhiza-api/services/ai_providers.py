@@ -0,0 +1,343 @@
+"""
+Bounded execution layer for AI provider calls.
+
+The Bedrock and Gemini SDKs are synchronous. Running them directly inside an
+async handler blocks the event loop for the full duration of the LLM call, so
+every provider gets its own small thread pool, a concurrency limit and a
+timeout instead. ``ProviderRouter`` decides which provider to call: unhealthy
+providers are skipped by a circuit breaker and slow ones can be hedged.
+``LazyClient`` defers importing and configuring an SDK until it is first
+needed, so neither slows down startup.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class ProviderTimeoutError(Exception):
+    """Raised when a provider call does not complete within its timeout."""
+
+
+class ProviderPool:
+    """Runs blocking provider calls off the event loop with bounded concurrency."""
+
+    def __init__(self, name: str, max_concurrency: int, timeout: float):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.in_flight = 0
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix=f"ai-{name}",
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` on this provider's thread pool.
+
+        The timeout covers both waiting for a free slot and the call itself. A
+        slot is only released once the worker thread has actually finished, so
+        timed-out calls still count against the limit until they return.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._semaphore.acquire()
+                self.in_flight += 1
+                future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+                future.add_done_callback(self._release)
+                return await asyncio.shield(future)
+        except TimeoutError:
+            logger.warning("AI provider call timed out", provider=self.name, timeout=self.timeout)
+            raise ProviderTimeoutError(f"{self.name} call timed out after {self.timeout}s")
+
+    def _release(self, _future: asyncio.Future) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "timeout": self.timeout,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LazyClient:
+    """A provider SDK client that is imported and built on first use.
+
+    ``get`` is blocking and thread-safe, so it can be called from a provider
+    pool thread; ``warm`` builds the client off the event loop ahead of the
+    first request. A failed build is retried by the next ``get``.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self._factory = factory
+        self._client: Any = None
+        self._lock = threading.Lock()
+        self.state = "cold" if enabled else "disabled"
+        self.error: Optional[str] = None
+        self.build_seconds: Optional[float] = None
+
+    def get(self) -> Any:
+        if self._client is not None:
+            return self._client
+        if not self.enabled:
+            raise RuntimeError(f"{self.name} is not configured")
+        with self._lock:
+            if self._client is None:
+                self.state = "initializing"
+                started = time.monotonic()
+                try:
+                    self._client = self._factory()
+                except Exception as e:
+                    self.state, self.error = "failed", str(e)
+                    logger.warning("AI provider client failed to initialize", provider=self.name, error=str(e))
+                    raise
+                self.build_seconds = round(time.monotonic() - started, 3)
+                self.state, self.error = "ready", None
+                logger.info("AI provider client initialized", provider=self.name, seconds=self.build_seconds)
+        return self._client
+
+    async def warm(self) -> None:
+        """Build the client in a worker thread; failures are only recorded."""
+        if not self.enabled or self._client is not None:
+            return
+        try:
+            await asyncio.to_thread(self.get)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "error": self.error, "build_seconds": self.build_seconds}
+
+
+class AllProvidersFailedError(Exception):
+    """Raised when no provider returned a valid response."""
+
+
+class CircuitBreaker:
+    """Per-provider circuit breaker with a rolling latency sample.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and the
+    provider is skipped for ``reset_timeout`` seconds. It then half-opens and
+    lets a single probe call through; success closes it, failure reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 latency_window: int = 200, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def _refresh(self) -> None:
+        if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def available(self) -> bool:
+        """Whether the provider would take a call now (closed, or a free half-open probe)."""
+        self._refresh()
+        return self.state == self.CLOSED or (self.state == self.HALF_OPEN and not self._probe_in_flight)
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; claims the probe slot when half-open."""
+        self._refresh()
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self, latency: float) -> None:
+        if self.state != self.CLOSED:
+            logger.info("Circuit closed", provider=self.name)
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        self._latencies.append(latency)
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Circuit opened", provider=self.name, failures=self.consecutive_failures)
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+
+    def release(self) -> None:
+        """Give back a probe slot for a call that was cancelled without an outcome."""
+        self._probe_in_flight = False
+
+    def latency_quantile(self, quantile: float, min_samples: int = 20) -> Optional[float]:
+        if len(self._latencies) < min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def stats(self) -> Dict[str, Any]:
+        self._refresh()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "p95_seconds": self.latency_quantile(0.95),
+        }
+
+
+ProviderCall = Callable[..., Awaitable[Any]]
+
+
+class ProviderRouter:
+    """Calls AI providers in health order with circuit breaking and optional hedging.
+
+    ``call`` receives the currently configured providers in preference order.
+    Providers with an open circuit are skipped (unless every provider is open,
+    in which case the one that opened first is tried anyway rather than
+    failing outright). With hedging enabled, the next provider is started when
+    the current one has not answered within the hedge delay, and the first
+    valid response wins; the slower call is cancelled.
+
+    The hedge delay is either a fixed number of seconds or, when
+    ``hedge_quantile`` is set, that latency quantile of the provider being
+    hedged, falling back to ``hedge_delay`` until enough samples exist.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        hedge_delay: Optional[float] = None,
+        hedge_quantile: Optional[float] = None,
+        is_valid: Callable[[Any], bool] = lambda result: result is not None,
+        on_fallback: Optional[Callable[[str, str], None]] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+        self.is_valid = is_valid
+        self.on_fallback = on_fallback
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+        return self.breakers[name]
+
+    @property
+    def hedging(self) -> bool:
+        return self.hedge_delay is not None or self.hedge_quantile is not None
+
+    def order(self, providers: List[Tuple[str, ProviderCall]]) -> List[Tuple[str, ProviderCall]]:
+        """Available providers first in configured order, then open ones by age.
+
+        A half-open provider keeps its configured position so that the probe
+        which can close its circuit actually gets sent.
+        """
+        def key(provider: Tuple[str, ProviderCall]) -> Tuple[int, float]:
+            breaker = self.breaker(provider[0])
+            return (0, 0.0) if breaker.available() else (1, breaker.opened_at)
+
+        return sorted(providers, key=key)
+
+    def _delay_for(self, name: str) -> Optional[float]:
+        if self.hedge_quantile is not None:
+            observed = self.breaker(name).latency_quantile(self.hedge_quantile)
+            if observed is not None:
+                return observed
+        return self.hedge_delay
+
+    async def _attempt(self, name: str, func: ProviderCall, args: Tuple[Any, ...]) -> Any:
+        breaker = self.breaker(name)
+        started = time.monotonic()
+        try:
+            result = await func(*args)
+            if not self.is_valid(result):
+                raise ValueError(f"{name} returned an invalid response")
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success(time.monotonic() - started)
+        return result
+
+    async def call(self, providers: List[Tuple[str, ProviderCall]], *args: Any) -> Tuple[str, Any]:
+        """Return ``(provider_name, result)`` from the first provider to answer validly."""
+        candidates = self.order(providers)
+        # When every circuit is open, try the one that opened first instead of failing fast
+        forced = bool(candidates) and not any(self.breaker(name).available() for name, _ in candidates)
+        pending: Dict[asyncio.Task, str] = {}
+        errors: List[str] = []
+        previous: Optional[str] = None
+
+        def start_next() -> bool:
+            nonlocal previous, forced
+            while candidates:
+                name, func = candidates.pop(0)
+                if not self.breaker(name).allow() and not forced:
+                    continue
+                forced = False
+                if previous is not None and self.on_fallback:
+                    self.on_fallback(previous, name)
+                previous = name
+                pending[asyncio.ensure_future(self._attempt(name, func, args))] = name
+                return True
+            return False
+
+        try:
+            start_next()
+            while pending:
+                delay = self._delay_for(previous) if self.hedging and candidates else None
+                done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info("Hedging slow provider", provider=previous, delay=delay)
+                    start_next()
+                    continue
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is None:
+                        return name, task.result()
+                    logger.warning("AI provider failed", provider=name, error=str(task.exception()))
+                    errors.append(f"{name}: {task.exception()}")
+                if not pending:
+                    start_next()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let the losers finish cancelling so their probe slots are released before returning
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise AllProvidersFailedError("; ".join(errors) or "no provider available")
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
@@ -0,0 +1,157 @@
+"""
+Offline backfill: warms the graph from a frequency-ranked word list so the most
+common words never wait on an AI provider in the request path.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class RateLimiter:
+    """Spaces calls evenly so no more than ``rate`` start per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class BackfillCheckpoint:
+    """Progress through the word list, saved atomically after every batch.
+
+    ``failed_words`` holds words whose analysis or store failed; they are
+    retried at the start of the next run, and ``failed`` counts them.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.state: Dict[str, Any] = {"position": 0, "analyzed": 0, "skipped": 0, "failed": 0, "failed_words": []}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.state.update(json.load(f))
+            logger.info("Resuming backfill from checkpoint", path=path, **self.counters())
+
+    def counters(self) -> Dict[str, int]:
+        return {key: value for key, value in self.state.items() if key != "failed_words"}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+
+class BackfillWorker:
+    """Analyzes and stores every word in a ranked list that the graph does not know yet.
+
+    Words are processed in batches: one existence query per batch filters out
+    known words, then the rest are analyzed with at most ``concurrency`` calls in
+    flight and no more than ``rate`` calls started per second. The checkpoint
+    is saved once a whole batch is done, so a crash repeats at most one batch.
+    Words that fail are kept in the checkpoint and retried before the list
+    continues, so moving past them never loses them.
+    """
+
+    def __init__(
+        self,
+        graph_service: Any,
+        analyze: Callable[[str], Awaitable[dict]],
+        is_valid: Callable[[str], bool],
+        checkpoint: BackfillCheckpoint,
+        batch_size: int = 100,
+        concurrency: int = 4,
+        rate: float = 2.0,
+    ):
+        self.graph_service = graph_service
+        self.analyze = analyze
+        self.is_valid = is_valid
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.rate_limiter = RateLimiter(rate)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(self, words: Iterable[str], limit: Optional[int] = None) -> Dict[str, Any]:
+        retry = list(self.checkpoint.state["failed_words"])
+        if retry:
+            logger.info("Retrying previously failed words", count=len(retry))
+        for start in range(0, len(retry), self.batch_size):
+            await self._process(retry[start:start + self.batch_size], advance=False)
+        for batch in self._batches(words, limit):
+            await self._process(batch, advance=True)
+        return self.checkpoint.state
+
+    async def _process(self, batch: List[str], advance: bool) -> None:
+        """Backfill one batch; ``advance`` moves the list position past it."""
+        state = self.checkpoint.state
+        candidates = list(dict.fromkeys(
+            word.strip().lower() for word in batch if self.is_valid(word)
+        ))
+        existing = await self.graph_service.existing_words(candidates)
+        missing = [word for word in candidates if word not in existing]
+
+        results = await asyncio.gather(*(self._backfill_word(word) for word in missing))
+
+        done = set(candidates)
+        failed = [word for word, ok in zip(missing, results) if not ok]
+        state["failed_words"] = [word for word in state["failed_words"] if word not in done] + failed
+        if advance:
+            state["position"] += len(batch)
+        state["skipped"] += len(batch) - len(missing)
+        state["analyzed"] += sum(1 for ok in results if ok)
+        state["failed"] = len(state["failed_words"])
+        self.checkpoint.save()
+        logger.info("Backfill batch completed", retry=not advance, **self.checkpoint.counters())
+
+    def _batches(self, words: Iterable[str], limit: Optional[int]) -> Iterator[List[str]]:
+        position = self.checkpoint.state["position"]
+        batch = []
+        for index, word in enumerate(words):
+            if limit is not None and index >= limit:
+                break
+            if index < position:
+                continue
+            batch.append(word)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _backfill_word(self, word: str) -> bool:
+        async with self._semaphore:
+            await self.rate_limiter.wait()
+            try:
+                result = await self.analyze(word)
+                await self.graph_service.store_etymology(word, result.get("roots") or [])
+                return True
+            except Exception as e:
+                logger.warning("Backfill failed for word", word=word, error=str(e))
+                return False
+
+
+def read_word_list(path: str) -> Iterator[str]:
+    """Yield the first column of a ranked word list (``word`` or ``word<whitespace>count`` lines)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.split()
+            if fields and not fields[0].startswith("#"):
+                yield fields[0]
@@ -0,0 +1,119 @@
+"""
+Bounded in-process caches.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+
+class TTLCache:
+    """LRU cache with a per-entry time-to-live and hit/miss/eviction counters.
+
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class TaggedTTLCache(TTLCache):
+    """TTLCache whose entries are tagged with what they were built from.
+
+    ``invalidate_tags`` drops every entry carrying one of the tags. Each call
+    also bumps ``generation``; a value computed before an invalidation is not
+    cached when ``set`` is given the generation read before computing it, so a
+    slow request cannot put back data that a concurrent write just made stale.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl)
+        self.generation = 0
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+        self._tags_by_key: Dict[Hashable, Tuple[str, ...]] = {}
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (), generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        super().set(key, value)
+        if key not in self._entries:
+            return
+        tags = tuple(tags)
+        self._tags_by_key[key] = tags
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        # Evicted and expired keys linger in the tag index; rebuild it once they dominate
+        if len(self._tags_by_key) > 2 * self.maxsize:
+            self._reindex()
+
+    def _reindex(self) -> None:
+        self._tags_by_key = {key: self._tags_by_key[key] for key in self._entries if key in self._tags_by_key}
+        self._keys_by_tag = {}
+        for key, tags in self._tags_by_key.items():
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        self.generation += 1
+        for tag in tags:
+            for key in self._keys_by_tag.pop(tag, ()):
+                self.delete(key)
+                self._tags_by_key.pop(key, None)
+
+    def clear(self) -> None:
+        super().clear()
+        self.generation += 1
+        self._keys_by_tag.clear()
+        self._tags_by_key.clear()
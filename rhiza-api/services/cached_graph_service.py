@@ -0,0 +1,162 @@
+"""
+Read-through cache in front of EtymologyGraphService: in-process first, then an
+optional cache shared by all workers.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from services.cache import TaggedTTLCache, TTLCache
+from services.neo4j_service import EtymologyGraphService
+from services.normalize import fold_key
+from services.shared_cache import SharedCache
+
+logger = structlog.get_logger(__name__)
+
+
+class CachedEtymologyGraphService:
+    """Serves hot word and root lookups from memory instead of a bolt round trip.
+
+    Only positive graph results are cached; a miss is about to be analyzed and
+    stored, which invalidates the entry anyway. Writes through this wrapper
+    invalidate the word and every root it touches. Other workers are not
+    notified, so their copies may stay stale for up to ``ttl`` seconds.
+    Everything not overridden here is delegated to the wrapped service.
+
+    With a ``shared`` cache, word results missing locally are looked up there
+    before Neo4j, and writes update it, so a word analyzed by one worker is
+    served to the others without a graph round trip even before it is flushed.
+
+    ``graph_payloads`` holds built graphs and their rendered bodies for the graph endpoint,
+    tagged with ``payload_tags``; any write through this wrapper that touches
+    the word or one of its roots drops them.
+    """
+
+    MAX_PAGES_PER_ROOT = 64
+
+    def __init__(
+        self,
+        service: EtymologyGraphService,
+        maxsize: int = 10000,
+        ttl: float = 300,
+        shared: Optional[SharedCache] = None,
+        shared_ttl: float = 3600,
+    ):
+        self.service = service
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self.word_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.related_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.graph_payloads = TaggedTTLCache(maxsize=maxsize, ttl=ttl)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.service, name)
+
+    async def find_word_roots(self, word: str) -> Optional[Dict]:
+        key = word.lower()
+        cached = self.word_cache.get(key)
+        if cached is not None:
+            return cached
+        if self.shared is not None:
+            cached = await self.shared.get(f"word:{key}")
+            if cached is not None:
+                self.word_cache.set(key, cached)
+                return cached
+        result = await self.service.find_word_roots(word)
+        if result is not None:
+            self.word_cache.set(key, result)
+            await self._share({key: result})
+        return result
+
+    async def find_words_roots(self, words: List[str]) -> Dict[str, Dict]:
+        found = {}
+        misses = []
+        for word in words:
+            key = word.lower()
+            cached = self.word_cache.get(key)
+            if cached is not None:
+                found[key] = cached
+            else:
+                misses.append(key)
+        if misses and self.shared is not None:
+            shared = await self.shared.get_many([f"word:{key}" for key in misses])
+            for key in misses:
+                cached = shared.get(f"word:{key}")
+                if cached is not None:
+                    self.word_cache.set(key, cached)
+                    found[key] = cached
+            misses = [key for key in misses if key not in found]
+        if misses:
+            fetched = await self.service.find_words_roots(misses)
+            for key, result in fetched.items():
+                self.word_cache.set(key, result)
+            await self._share(fetched)
+            found.update(fetched)
+        return found
+
+    async def store_etymology(self, word: str, roots: List[Dict]):
+        await self.service.store_etymology(word, roots)
+        self.invalidate(word, roots)
+        await self._unshare([word])
+
+    async def store_etymologies(self, etymologies: List[Dict]):
+        await self.service.store_etymologies(etymologies)
+        for item in etymologies:
+            self.invalidate(item["name"], item.get("roots") or [])
+        await self._unshare([item["name"] for item in etymologies])
+
+    async def _share(self, results: Dict[str, Dict]) -> None:
+        if self.shared is not None and results:
+            await self.shared.set_many({f"word:{key}": result for key, result in results.items()}, self.shared_ttl)
+
+    async def _unshare(self, words: List[str]) -> None:
+        # The stored node (with its analyzed_at) is re-shared on the next read
+        if self.shared is not None and words:
+            await self.shared.delete([f"word:{word.lower()}" for word in words])
+
+    async def get_related_words_page(self, root_name: str, limit: int, **options: Any) -> Dict:
+        # All pages of a root share one entry keyed like the graph lookup, so spelling
+        # variants hit the same pages and a write to the root drops every page at once
+        key = fold_key(root_name)
+        page_key = (limit, tuple(sorted((name, repr(value)) for name, value in options.items())))
+        pages = self.related_cache.get(key)
+        if pages is not None and page_key in pages:
+            return pages[page_key]
+        page = await self.service.get_related_words_page(root_name, limit, **options)
+        pages = dict(pages or {})
+        if len(pages) >= self.MAX_PAGES_PER_ROOT:
+            pages.clear()
+        pages[page_key] = page
+        self.related_cache.set(key, pages)
+        return page
+
+    async def prime(self, result: Dict) -> None:
+        """Serve a result that is queued for writing before it reaches the graph."""
+        self.invalidate(result["name"], result.get("roots") or [])
+        self.word_cache.set(result["name"].lower(), result)
+        await self._share({result["name"].lower(): result})
+
+    def invalidate(self, word: str, roots: List[Dict]) -> None:
+        """Drop cached entries for a word and the roots it derives from."""
+        self.word_cache.delete(word.lower())
+        for root in roots:
+            for value in (root.get("name"), root.get("transliteration")):
+                if value:
+                    self.related_cache.delete(fold_key(value))
+        self.graph_payloads.invalidate_tags(self.payload_tags(word, roots))
+
+    @staticmethod
+    def payload_tags(word: str, roots: List[Dict]) -> List[str]:
+        """Tags for a payload built from ``word`` and ``roots`` (related words hang off the roots)."""
+        return [f"word:{word.lower()}"] + [f"root:{fold_key(root['name'])}" for root in roots if root.get("name")]
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "word_roots": self.word_cache.stats(),
+            "related_words": self.related_cache.stats(),
+            "graph_payloads": self.graph_payloads.stats(),
+        }
+
+    def shared_cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.shared.stats() if self.shared is not None else None
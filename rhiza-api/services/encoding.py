@@ -0,0 +1,141 @@
+"""
+Response representations: JSON, a compact graph encoding, and compression.
+
+Graph responses repeat the same property keys on every node and the
+``word_``/``root_`` ids on every link. The compact encoding (requested with
+``Accept: application/vnd.rhiza.compact-graph+json``) lists each node once,
+interns property key lists as shapes, and refers to nodes from links by
+index. ``decodeCompactGraph`` in the UI's ``enriched_graph.js`` restores the
+original shape exactly.
+
+Bodies of at least ``min_size`` bytes are compressed with brotli (when the
+optional ``brotli`` package is installed) or gzip, whichever the client
+prefers.
+"""
+
+import gzip
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+COMPACT_GRAPH_MEDIA_TYPE = "application/vnd.rhiza.compact-graph+json"
+COMPACT_GRAPH_FORMAT = "rhiza-compact-graph/1"
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def serialize_json(content: Any) -> bytes:
+    """Encode like FastAPI's JSONResponse, for bodies that are cached and sent as-is."""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def compact_graph(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode a ``{"nodes", "links"|"edges", ...}`` graph as an interned node table.
+
+    Nodes become ``[id, label, type, shape, values]`` rows, where ``type`` and
+    ``shape`` index the ``types`` and ``shapes`` tables and ``values`` follow
+    the shape's property keys. Links become ``[source, target, type, shape,
+    values]`` with ``source``/``target`` indexing ``nodes``. Other top-level
+    fields are copied unchanged.
+    """
+    edge_key = "links" if "links" in graph else "edges"
+    types: List[str] = []
+    shapes: List[List[str]] = []
+    type_index: Dict[str, int] = {}
+    shape_index: Dict[Tuple[str, ...], int] = {}
+
+    def intern_type(name: str) -> int:
+        if name not in type_index:
+            type_index[name] = len(types)
+            types.append(name)
+        return type_index[name]
+
+    def intern_shape(properties: Dict[str, Any]) -> Tuple[int, List[Any]]:
+        keys = tuple(properties)
+        if keys not in shape_index:
+            shape_index[keys] = len(shapes)
+            shapes.append(list(keys))
+        return shape_index[keys], list(properties.values())
+
+    node_index: Dict[str, int] = {}
+    nodes = []
+    for node in graph["nodes"]:
+        node_index[node["id"]] = len(nodes)
+        shape, values = intern_shape(node.get("properties") or {})
+        nodes.append([node["id"], node["label"], intern_type(node["type"]), shape, values])
+
+    links = []
+    for link in graph[edge_key]:
+        shape, values = intern_shape(link.get("properties") or {})
+        links.append([node_index[link["source"]], node_index[link["target"]], intern_type(link["type"]), shape, values])
+
+    compact = {key: value for key, value in graph.items() if key not in ("nodes", edge_key)}
+    compact.update({
+        "format": COMPACT_GRAPH_FORMAT,
+        "edge_key": edge_key,
+        "types": types,
+        "shapes": shapes,
+        "nodes": nodes,
+        "links": links,
+    })
+    return compact
+
+
+def _accepted(header: str) -> Dict[str, float]:
+    """Tokens of an Accept or Accept-Encoding header with their q-values."""
+    accepted = {}
+    for part in header.lower().split(","):
+        token, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if token:
+            accepted[token] = quality
+    return accepted
+
+
+class Representation(NamedTuple):
+    compact: bool
+    encoding: Optional[str]
+
+    def etag(self, etag: str) -> str:
+        """A distinct strong ETag per representation of the same content.
+
+        ``encoding`` must be the coding actually applied by ``render``, which
+        leaves small bodies uncompressed whatever was negotiated.
+        """
+        suffix = ("-compact" if self.compact else "") + (f"-{self.encoding}" if self.encoding else "")
+        return etag[:-1] + suffix + '"' if suffix else etag
+
+    @property
+    def media_type(self) -> str:
+        return COMPACT_GRAPH_MEDIA_TYPE if self.compact else JSON_MEDIA_TYPE
+
+
+def negotiate(accept: str, accept_encoding: str, compactable: bool) -> Representation:
+    compact = compactable and _accepted(accept).get(COMPACT_GRAPH_MEDIA_TYPE, 0) > 0
+    encodings = _accepted(accept_encoding)
+    candidates = [name for name in (("br", "gzip") if brotli is not None else ("gzip",)) if encodings.get(name, 0) > 0]
+    # Prefer the client's higher q-value; ties go to brotli, which compresses JSON better
+    encoding = max(candidates, key=lambda name: encodings[name], default=None)
+    return Representation(compact, encoding)
+
+
+def render(content: Any, representation: Representation, min_size: int) -> Tuple[bytes, Optional[str]]:
+    """Body bytes for ``representation`` and the content coding actually applied."""
+    body = serialize_json(compact_graph(content) if representation.compact else content)
+    if representation.encoding is None or len(body) < min_size:
+        return body, None
+    if representation.encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY), "br"
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), "gzip"
@@ -0,0 +1,263 @@
+"""
+Local stand-ins for external dependencies, used for dry runs, tests and benchmarks.
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from services.normalize import fold_key, is_greek
+
+
+class FakeEtymologyProvider:
+    """Deterministic replacement for ``get_ai_etymology`` that never calls an LLM.
+
+    Results come from ``known`` when the word is listed there; otherwise words are
+    given a single made-up root derived from their hash, except every
+    ``no_roots_every``-th word (by hash), which gets no roots. ``latency`` adds an
+    artificial delay to each call, and ``failing`` makes every call raise after
+    that delay, which is handy for exercising provider fallback and circuit
+    breaking with ``ProviderRouter``. A grouped prompt with one word per line
+    is answered like the batch prompt, as ``{"words": [...]}``.
+    """
+
+    def __init__(
+        self,
+        known: Optional[Dict[str, List[Dict]]] = None,
+        latency: float = 0.0,
+        no_roots_every: int = 3,
+        failing: bool = False,
+    ):
+        self.known = known or {}
+        self.latency = latency
+        self.no_roots_every = no_roots_every
+        self.failing = failing
+        self.calls = 0
+
+    async def __call__(self, word: str, *_prompt_args, **_prompt_options) -> dict:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failing:
+            raise RuntimeError("fake provider failure")
+        if "\n" in word:
+            # A grouped prompt (one word per line) is answered in the batch shape
+            return {"words": [self._answer(line) for line in word.split("\n")]}
+        return self._answer(word)
+
+    def _answer(self, word: str) -> dict:
+        if word in self.known:
+            return {"name": word, "roots": self.known[word]}
+
+        digest = int(hashlib.sha1(word.encode("utf-8")).hexdigest(), 16)
+        if self.no_roots_every and digest % self.no_roots_every == 0:
+            return {"name": word, "roots": []}
+        stem = word[:4]
+        return {
+            "name": word,
+            "roots": [{
+                "name": f"fake-{stem}",
+                "transliteration": stem,
+                "meaning": f"fake root of {word}",
+                "category": "other",
+                "frequency": "low",
+                "part_of_speech": "noun",
+            }],
+        }
+
+
+class InMemoryEtymologyGraphService:
+    """Dict-backed stand-in for ``EtymologyGraphService`` with the same read/write surface.
+
+    Every call sleeps for ``latency`` seconds first, standing in for a bolt round
+    trip, so caching and batching show up in benchmarks the way they would
+    against Neo4j.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.words: Dict[str, Dict] = {}
+        self.roots: Dict[str, Dict] = {}
+        self.word_properties: Dict[str, Dict] = {}
+        self.calls: Dict[str, int] = {}
+        # root name -> words deriving from it
+        self._derived: Dict[str, Set[str]] = {}
+
+    async def _round_trip(self, operation: str) -> None:
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def seed(self, word: str, roots: List[Dict], **properties) -> None:
+        """Add a word synchronously, without latency (for building datasets)."""
+        word = word.lower()
+        for name in self.words.get(word, {}).get("roots", []):
+            self._derived[name].discard(word)
+        for root in roots:
+            self.roots[root["name"]] = {key: value for key, value in root.items() if key != "related"}
+            self._derived.setdefault(root["name"], set()).add(word)
+        self.words[word] = {
+            "name": word,
+            "roots": [root["name"] for root in roots],
+            "analyzed_at": int(time.time() * 1000),
+        }
+        if properties:
+            self.word_properties[word] = properties
+
+    def _result(self, word: str) -> Optional[Dict]:
+        stored = self.words.get(word.lower())
+        if stored is None:
+            return None
+        return {"name": stored["name"], "roots": [dict(self.roots[name]) for name in stored["roots"]],
+                "analyzed_at": stored["analyzed_at"]}
+
+    def _root_words(self, root_name: str) -> Set[str]:
+        return self._derived.get(root_name, set())
+
+    async def create_indexes(self):
+        await self._round_trip("create_indexes")
+
+    async def backfill_root_keys(self, batch_size: int = 1000) -> int:
+        return 0
+
+    async def close(self):
+        pass
+
+    async def find_word_roots(self, word: str) -> Optional[Dict]:
+        await self._round_trip("find_word_roots")
+        return self._result(word)
+
+    async def find_words_roots(self, words: List[str]) -> Dict[str, Dict]:
+        await self._round_trip("find_words_roots")
+        return {word.lower(): result for word in words if (result := self._result(word)) is not None}
+
+    async def find_word_graph(self, word: str, related_limit: int) -> Optional[Dict]:
+        await self._round_trip("find_word_graph")
+        result = self._result(word)
+        if result is None:
+            return None
+        for root in result["roots"]:
+            root["related"] = sorted(other for other in self._root_words(root["name"]) if other != result["name"])[:related_limit]
+        return result
+
+    def _neighborhood_node(self, node: Tuple[str, str], depth: int) -> Dict:
+        kind, name = node
+        if kind == "GreekRoot":
+            properties = dict(self.roots[name])
+        else:
+            properties = dict(self.word_properties.get(name, {}), name=name,
+                              analyzed_at=self.words[name]["analyzed_at"])
+        return {"id": f"{kind}:{name}", "depth": depth, "labels": [kind], "properties": properties}
+
+    def _neighbors(self, node: Tuple[str, str]) -> List[Tuple[str, str]]:
+        kind, name = node
+        if kind == "GreekRoot":
+            return [("EnglishWord", word) for word in self._root_words(name)]
+        return [("GreekRoot", root) for root in self.words[name]["roots"]]
+
+    def _sort_key(self, node: Tuple[str, str]) -> Tuple[str, str]:
+        kind, name = node
+        root = self.roots[name] if kind == "GreekRoot" else {}
+        return root.get("transliteration") or name, name
+
+    async def find_neighborhood(self, word: str, depth: int, max_nodes: int, fanout: int) -> Optional[Dict]:
+        """Same breadth-first expansion, caps and result shape as the Cypher query."""
+        await self._round_trip("find_neighborhood")
+        start = ("EnglishWord", word.lower())
+        if start[1] not in self.words:
+            return None
+        nodes, frontier, layers, truncated = [start], [start], [[start]], False
+        for _ in range(depth):
+            seen = set(nodes)
+            following = []
+            for node in frontier:
+                neighbors = sorted({m for m in self._neighbors(node) if m not in seen}, key=self._sort_key)
+                following.extend(m for m in neighbors[:fanout] if m not in following)
+            room = max_nodes - len(nodes)
+            truncated = truncated or len(following) > room
+            frontier = following[:room]
+            nodes += frontier
+            layers.append(frontier)
+
+        included = set(nodes)
+        return {
+            "nodes": [self._neighborhood_node(node, index) for index, layer in enumerate(layers) for node in layer],
+            "links": [[f"EnglishWord:{name}", f"GreekRoot:{root}"]
+                      for kind, name in nodes if kind == "EnglishWord"
+                      for root in self.words[name]["roots"] if ("GreekRoot", root) in included],
+            "truncated": truncated,
+        }
+
+    async def existing_words(self, words: List[str]) -> Set[str]:
+        await self._round_trip("existing_words")
+        return {word.lower() for word in words if word.lower() in self.words}
+
+    async def store_etymology(self, word: str, roots: List[Dict]):
+        await self._round_trip("store_etymology")
+        self.seed(word, roots)
+
+    async def store_etymologies(self, etymologies: List[Dict]):
+        await self._round_trip("store_etymologies")
+        for item in etymologies:
+            self.seed(item["name"], item.get("roots") or [])
+
+    async def iter_suggestion_entries(self) -> AsyncIterator[Dict]:
+        await self._round_trip("iter_suggestion_entries")
+        for word, stored in list(self.words.items()):
+            yield {"kind": "word", "name": word,
+                   "frequencies": [self.roots[name].get("frequency") for name in stored["roots"]]}
+        for root in list(self.roots.values()):
+            yield dict(root, kind="root")
+
+    async def iter_word_roots(self) -> AsyncIterator[Dict]:
+        await self._round_trip("iter_word_roots")
+        for word, stored in list(self.words.items()):
+            yield {"name": word, "roots": [{"name": name, "frequency": self.roots[name].get("frequency")}
+                                           for name in stored["roots"]]}
+
+    async def get_related_words_page(
+        self,
+        root_name: str,
+        limit: int,
+        sort: str = "name",
+        descending: bool = False,
+        after: Optional[List] = None,
+        field: Optional[str] = None,
+        complexity_level: Optional[str] = None,
+    ) -> Dict:
+        await self._round_trip("get_related_words_page")
+        key = fold_key(root_name)
+        key_field = "name" if is_greek(key) else "transliteration"
+        names = [name for name, root in self.roots.items() if fold_key(root.get(key_field) or "") == key]
+        rows = []
+        for word in sorted({word for name in names for word in self._root_words(name)}):
+            properties = self.word_properties.get(word, {})
+            if field is not None and properties.get("field") != field:
+                continue
+            if complexity_level is not None and properties.get("complexity_level") != complexity_level:
+                continue
+            if sort == "first_use_year":
+                year = properties.get("first_use_year")
+                sort_key = year if year is not None else (-(10 ** 6) if descending else 10 ** 6)
+            else:
+                sort_key = word
+            rows.append((sort_key, word))
+        # Same order and keyset semantics as the Cypher query: sort key in the requested
+        # direction, then name ascending
+        if sort == "first_use_year":
+            rows.sort(key=lambda row: (-row[0] if descending else row[0], row[1]))
+        else:
+            rows.sort(reverse=descending)
+        if after is not None:
+            after_row = tuple(after)
+            if sort == "first_use_year":
+                rows = [row for row in rows if (row[0] < after_row[0] if descending else row[0] > after_row[0])
+                        or (row[0] == after_row[0] and row[1] > after_row[1])]
+            else:
+                rows = [row for row in rows if (row[1] < after_row[1] if descending else row[1] > after_row[1])]
+        page = rows[:limit]
+        return {
+            "words": [word for _, word in page],
+            "next_after": list(page[-1]) if len(rows) > limit else None,
+        }
@@ -0,0 +1,79 @@
+"""
+HTTP cache validators: content-addressed ETags and conditional GET handling.
+"""
+
+import hashlib
+import json
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from fastapi import Request, Response
+
+
+def compute_etag(payload: Any) -> str:
+    """Strong ETag derived from the canonical JSON form of ``payload``.
+
+    Unlike ``hash()``, this is identical across workers and restarts.
+    """
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def http_date(timestamp_ms: int) -> str:
+    return format_datetime(datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def matching_etag(request: Request, candidates: List[str]) -> Optional[str]:
+    """The first of ``candidates`` named by the request's ``If-None-Match``, if any."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    return next((etag for etag in candidates if _etag_matches(if_none_match, etag)), None)
+
+
+def _not_modified_since(header: str, last_modified_ms: int) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return int(last_modified_ms // 1000) <= int(since.timestamp())
+
+
+def apply_cache_validators(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str,
+    last_modified_ms: Optional[int] = None,
+) -> Optional[Response]:
+    """Set validator headers on ``response``; return a 304 response if the client copy is current.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since`` (RFC 9110).
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified_ms:
+        headers["Last-Modified"] = http_date(last_modified_ms)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(if_modified_since and last_modified_ms and _not_modified_since(if_modified_since, last_modified_ms))
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return None
@@ -0,0 +1,178 @@
+"""
+Reading etymology JSON out of LLM output, incrementally as it streams in.
+
+Models sometimes wrap the object in a ```json fence or add a sentence around
+it. ``JSONObjectStream`` skips everything before the first ``{`` and completes
+as soon as the matching ``}`` arrives, so a caller reading a token stream can
+stop generation there instead of waiting for (and paying for) the rest.
+
+The prompts ask for a compact schema: roots as positional rows rather than
+objects with repeated keys, ``{"r": [[name, transliteration, meaning,
+category, frequency, part_of_speech], ...]}`` for one word and ``{"w": {word:
+rows, ...}}`` for a batch. ``normalize_etymology`` expands either form (and
+the older keyed form) into ``{"name", "roots"}`` results and validates them.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+ROOT_FIELDS = ("name", "transliteration", "meaning", "category", "frequency", "part_of_speech")
+REQUIRED_ROOT_FIELDS = ("name", "transliteration", "meaning")
+
+CATEGORIES = (
+    "emotion", "abstract_concept", "political", "academic", "nature", "psychology", "religion",
+    "human", "skill", "communication", "size", "distance", "perception", "other",
+)
+FREQUENCIES = ("very_high", "high", "medium", "low")
+PARTS_OF_SPEECH = ("noun", "adjective", "verb", "adverb", "other")
+
+# A comma right before a closing bracket, the most common near-miss in model JSON
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+class LLMOutputError(ValueError):
+    """Raised when a model response holds no usable etymology JSON."""
+
+
+class JSONObjectStream:
+    """Incrementally finds the first complete JSON object in streamed text."""
+
+    def __init__(self):
+        self.value: Any = None
+        self.length = 0
+        self._parts: List[str] = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def done(self) -> bool:
+        return self.value is not None
+
+    def feed(self, text: str) -> bool:
+        """Consume a chunk of output; returns True once the object is complete."""
+        if self.done:
+            return True
+        self.length += len(text)
+        start = 0
+        for index, char in enumerate(text):
+            if not self._started:
+                if char != "{":
+                    continue
+                self._started, start = True, index
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(text[start:index + 1])
+                    self.value = _loads("".join(self._parts))
+                    return True
+        if self._started:
+            self._parts.append(text[start:])
+        return False
+
+    def close(self) -> Any:
+        """The parsed object; raises if the output ended before it was complete."""
+        if not self.done:
+            raise LLMOutputError("Model output contains no complete JSON object")
+        return self.value
+
+
+def _loads(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(TRAILING_COMMA.sub(r"\1", raw))
+    except json.JSONDecodeError as e:
+        raise LLMOutputError(f"Model output is not valid JSON: {e}")
+
+
+def read_json_object(chunks: Iterable[str]) -> Tuple[Any, int]:
+    """Consume text chunks until the first JSON object closes; returns it and the characters read."""
+    stream = JSONObjectStream()
+    for chunk in chunks:
+        if stream.feed(chunk):
+            break
+    return stream.close(), stream.length
+
+
+def extract_json_object(text: str) -> Any:
+    """The first JSON object in ``text``, ignoring fences and prose around it."""
+    return read_json_object([text])[0]
+
+
+def _expand_root(row: Any) -> Dict[str, Any]:
+    if isinstance(row, list):
+        row = dict(zip(ROOT_FIELDS, row))
+    if not isinstance(row, dict):
+        raise LLMOutputError(f"Root is not a row or object: {row!r}")
+    root = {field: row.get(field) for field in ROOT_FIELDS}
+    for field in REQUIRED_ROOT_FIELDS:
+        if not isinstance(root[field], str) or not root[field].strip():
+            raise LLMOutputError(f"Root is missing {field}: {row!r}")
+        root[field] = root[field].strip()
+    # Unknown enum values are normalized rather than failing the whole answer
+    if root["category"] is not None and root["category"] not in CATEGORIES:
+        root["category"] = "other"
+    if root["frequency"] not in FREQUENCIES:
+        root["frequency"] = None
+    if root["part_of_speech"] is not None and root["part_of_speech"] not in PARTS_OF_SPEECH:
+        root["part_of_speech"] = "other"
+    return root
+
+
+def expand_roots(rows: Any) -> List[Dict[str, Any]]:
+    if rows is None:
+        return []
+    if not isinstance(rows, list):
+        raise LLMOutputError(f"Roots are not a list: {rows!r}")
+    return [_expand_root(row) for row in rows]
+
+
+def normalize_etymology(value: Any, word: str) -> Dict[str, Any]:
+    """Validate a parsed response and expand it to the full result shape.
+
+    Single-word answers become ``{"name", "roots"}`` and raise on any invalid
+    root. Batch answers become ``{"words": [{"name", "roots"}, ...]}``; a word
+    with invalid roots is dropped so the rest of the batch is kept.
+    """
+    if not isinstance(value, dict):
+        raise LLMOutputError("Model output is not a JSON object")
+
+    if "w" in value or "words" in value:
+        entries = value.get("w")
+        if isinstance(entries, dict):
+            entries = [{"name": name, "roots": rows} for name, rows in entries.items()]
+        elif entries is None:
+            entries = value["words"]
+        if not isinstance(entries, list):
+            raise LLMOutputError("Batch output has no word list")
+        words = []
+        for entry in entries:
+            if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+                continue
+            try:
+                words.append({"name": entry["name"], "roots": expand_roots(entry.get("roots", entry.get("r")))})
+            except LLMOutputError:
+                continue
+        return {"words": words}
+
+    if "r" in value:
+        return {"name": word, "roots": expand_roots(value["r"])}
+    if "roots" in value:
+        return {"name": word, "roots": expand_roots(value["roots"])}
+    raise LLMOutputError("Model output has no roots")
@@ -0,0 +1,246 @@
+"""
+Minimal Prometheus-style metrics.
+
+Metrics are plain in-process counters, gauges and fixed-bucket histograms
+rendered in the Prometheus text exposition format by ``/metrics``. Recording a
+value is a dict lookup plus, for histograms, a bisect, so instrumentation stays
+cheap on the hot path. Values that already live elsewhere (cache counters, pool
+occupancy) are read at scrape time through collectors instead of being
+mirrored on every request.
+"""
+
+import functools
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[Dict[str, Any], float]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value per the text exposition format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        documentation = self.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        lines = [f"# HELP {self.name} {documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class CollectedMetric(Metric):
+    """A metric whose samples are produced by a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, metric_type: str, collect: Callable[[], List[Sample]]):
+        super().__init__(name, documentation)
+        self.type = metric_type
+        self.collect = collect
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for labels, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def collector(self, name: str, documentation: str, metric_type: str, collect: Callable[[], List[Sample]]) -> None:
+        self.register(CollectedMetric(name, documentation, metric_type, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "rhiza_request_duration_seconds",
+    "HTTP request latency by route, status and word lookup source (graph, ai or none).",
+    ["route", "method", "status", "source"],
+))
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "rhiza_requests_in_flight",
+    "HTTP requests currently being handled by this worker.",
+))
+WORD_LOOKUPS = REGISTRY.register(Counter(
+    "rhiza_word_lookups_total",
+    "Word lookups by endpoint and whether the graph answered or the AI had to.",
+    ["endpoint", "source"],
+))
+GRAPH_OPERATION_LATENCY = REGISTRY.register(Histogram(
+    "rhiza_graph_operation_duration_seconds",
+    "Latency of EtymologyGraphService operations, including the Neo4j round trip.",
+    ["operation"],
+))
+NEO4J_POOL_ACQUIRE = REGISTRY.register(Histogram(
+    "rhiza_neo4j_pool_acquire_seconds",
+    "Time spent waiting for a connection from the Neo4j driver pool.",
+))
+AI_PROVIDER_LATENCY = REGISTRY.register(Histogram(
+    "rhiza_ai_provider_duration_seconds",
+    "AI provider call latency by provider and outcome.",
+    ["provider", "outcome"],
+))
+AI_PROVIDER_FALLBACKS = REGISTRY.register(Counter(
+    "rhiza_ai_provider_fallbacks_total",
+    "Times a lookup moved on to the next provider after a failure or a hedge delay.",
+    ["from_provider", "to_provider"],
+))
+
+
+def observe_async(histogram: Histogram, *labels: str) -> Callable:
+    """Decorator recording the latency of an async function into ``histogram``."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, *labels)
+
+        return wrapper
+
+    return decorator
+
+
+# Driver major versions whose private pool layout instrument_pool_acquire was checked against
+POOL_INSTRUMENTED_DRIVER_MAJORS = ("5",)
+
+
+def instrument_pool_acquire(driver: Any, driver_version: str) -> bool:
+    """Time connection acquisition on a neo4j driver's pool.
+
+    The driver has no public pool metrics, so this wraps the private
+    ``_pool.acquire`` coroutine. That is only attempted on driver versions
+    listed in ``POOL_INSTRUMENTED_DRIVER_MAJORS``; on others, or if the private
+    attribute is gone, the driver is left untouched and False is returned, and
+    the pool acquisition histogram stays empty.
+    """
+    if driver_version.split(".")[0] not in POOL_INSTRUMENTED_DRIVER_MAJORS:
+        return False
+    pool = getattr(driver, "_pool", None)
+    acquire = getattr(pool, "acquire", None)
+    if acquire is None:
+        return False
+
+    @functools.wraps(acquire)
+    async def timed_acquire(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await acquire(*args, **kwargs)
+        finally:
+            NEO4J_POOL_ACQUIRE.observe(time.perf_counter() - started)
+
+    pool.acquire = timed_acquire
+    return True
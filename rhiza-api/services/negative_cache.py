@@ -0,0 +1,48 @@
+"""
+Negative cache for words whose AI analysis recently failed.
+
+Words analyzed as having no Greek roots are persisted in the graph and expire
+there (see ``EtymologyGraphService.no_roots_ttl``). Failures are different: they
+usually mean a provider outage rather than anything about the word, so they are
+kept in process with a much shorter TTL and never written to the graph.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class FailedAnalysisCache:
+    """Bounded TTL set of words whose analysis failed."""
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._failed_at: "OrderedDict[str, float]" = OrderedDict()
+
+    def record(self, word: str) -> None:
+        if self.ttl <= 0:
+            return
+        self._failed_at[word] = time.monotonic()
+        self._failed_at.move_to_end(word)
+        while len(self._failed_at) > self.max_entries:
+            self._failed_at.popitem(last=False)
+
+    def has_failed(self, word: str) -> bool:
+        failed_at = self._failed_at.get(word)
+        if failed_at is None:
+            return False
+        if time.monotonic() - failed_at >= self.ttl:
+            del self._failed_at[word]
+            return False
+        return True
+
+    def forget(self, word: str) -> None:
+        self._failed_at.pop(word, None)
+
+    def stats(self) -> Dict[str, float]:
+        return {"entries": len(self._failed_at), "ttl": self.ttl}
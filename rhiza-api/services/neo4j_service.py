@@ -1,16 +1,68 @@
 import os
+import time
+import neo4j
 from neo4j import AsyncGraphDatabase
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Set
 import structlog
 
+from services.metrics import GRAPH_OPERATION_LATENCY, instrument_pool_acquire, observe_async
+from services.normalize import fold_key, is_greek, with_root_keys
+
 logger = structlog.get_logger(__name__)
 
+# Creates or enriches the GreekRoot for `root`, keeping its normalized lookup keys in
+# step with the stored name and transliteration (see services.normalize)
+MERGE_ROOT = """
+    MERGE (r:GreekRoot {name: root.name})
+    ON CREATE SET
+        r.name_key = root.name_key,
+        r.transliteration_key = root.transliteration_key,
+        r.transliteration = root.transliteration,
+        r.meaning = root.meaning,
+        r.category = root.category,
+        r.frequency = root.frequency,
+        r.part_of_speech = root.part_of_speech
+    ON MATCH SET
+        r.name_key = root.name_key,
+        r.transliteration_key = CASE WHEN r.transliteration IS NULL
+                                     THEN root.transliteration_key ELSE r.transliteration_key END,
+        r.transliteration = COALESCE(r.transliteration, root.transliteration),
+        r.meaning = COALESCE(r.meaning, root.meaning),
+        r.category = COALESCE(r.category, root.category),
+        r.frequency = COALESCE(r.frequency, root.frequency),
+        r.part_of_speech = COALESCE(r.part_of_speech, root.part_of_speech)
+"""
+
+# One breadth-first hop of the neighborhood expansion; repeated once per level of depth
+NEIGHBORHOOD_HOP = """
+    CALL {
+        WITH nodes, frontier
+        UNWIND frontier as n
+        CALL {
+            WITH n, nodes
+            MATCH (n)-[:DERIVES_FROM]-(m)
+            WHERE NOT m IN nodes
+            RETURN DISTINCT m
+            ORDER BY coalesce(m.transliteration, m.name)
+            LIMIT $fanout
+        }
+        RETURN collect(DISTINCT m) as next
+    }
+    WITH nodes + next[..($max_nodes - size(nodes))] as nodes,
+         next[..($max_nodes - size(nodes))] as frontier,
+         layers + [next[..($max_nodes - size(nodes))]] as layers,
+         truncated OR size(next) > $max_nodes - size(nodes) as truncated
+"""
+
 class EtymologyGraphService:
     def __init__(self):
         uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
         user = os.environ.get("NEO4J_USER", "neo4j")
         password = os.environ.get("NEO4J_PASSWORD", "password")
         
+        # Words analyzed as having no Greek roots are trusted for this long
+        self.no_roots_ttl = int(os.environ.get("NO_ROOTS_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+        
         # Configure async connection pool settings
         self.driver = AsyncGraphDatabase.driver(
             uri, 
@@ -20,6 +72,9 @@ class EtymologyGraphService:
             connection_acquisition_timeout=60  # 60 seconds
         )
         
+        if not instrument_pool_acquire(self.driver, neo4j.__version__):
+            logger.warning("Neo4j pool acquisition timing unavailable for this driver", driver_version=neo4j.__version__)
+        
         logger.info("Neo4j async driver initialized with connection pooling", 
                    uri=uri, max_pool_size=50)
     
@@ -36,6 +91,10 @@ class EtymologyGraphService:
                 # Index on GreekRoot.transliteration for fast transliteration lookups
                 await session.run("CREATE INDEX greek_root_transliteration_idx IF NOT EXISTS FOR (r:GreekRoot) ON (r.transliteration)")
                 
+                # Indexes on the accent- and case-insensitive root lookup keys
+                await session.run("CREATE INDEX greek_root_name_key_idx IF NOT EXISTS FOR (r:GreekRoot) ON (r.name_key)")
+                await session.run("CREATE INDEX greek_root_transliteration_key_idx IF NOT EXISTS FOR (r:GreekRoot) ON (r.transliteration_key)")
+                
                 logger.info("Database indexes created successfully")
             except Exception as e:
                 # Try legacy syntax for older Neo4j versions
@@ -43,38 +102,197 @@ class EtymologyGraphService:
                     await session.run("CREATE INDEX ON :EnglishWord(name)")
                     await session.run("CREATE INDEX ON :GreekRoot(name)")  
                     await session.run("CREATE INDEX ON :GreekRoot(transliteration)")
+                    await session.run("CREATE INDEX ON :GreekRoot(name_key)")
+                    await session.run("CREATE INDEX ON :GreekRoot(transliteration_key)")
                     logger.info("Database indexes created using legacy syntax")
                 except Exception as legacy_error:
                     logger.warning(f"Failed to create indexes: {e}, legacy attempt: {legacy_error}")
                     # Continue without indexes - not critical for functionality
     
+    async def backfill_root_keys(self, batch_size: int = 1000) -> int:
+        """Fill in lookup keys for roots stored before they existed; returns how many were updated"""
+        updated = 0
+        async with self.driver.session() as session:
+            while True:
+                result = await session.run("""
+                    MATCH (r:GreekRoot)
+                    WHERE r.name_key IS NULL
+                       OR (r.transliteration IS NOT NULL AND r.transliteration_key IS NULL)
+                    RETURN r.name as name, r.transliteration as transliteration
+                    LIMIT $limit
+                """, limit=batch_size)
+                roots = [with_root_keys(dict(record)) async for record in result]
+                if not roots:
+                    break
+                await session.run("""
+                    UNWIND $roots as root
+                    MATCH (r:GreekRoot {name: root.name})
+                    SET r.name_key = root.name_key,
+                        r.transliteration_key = root.transliteration_key
+                """, roots=roots)
+                updated += len(roots)
+        if updated:
+            logger.info("Backfilled root lookup keys", roots=updated)
+        return updated
+    
     async def close(self):
         await self.driver.close()
     
+    @observe_async(GRAPH_OPERATION_LATENCY, "find_word_roots")
     async def find_word_roots(self, word: str) -> Optional[Dict]:
-        """Query graph for existing word etymology with enriched properties"""
+        """Query graph for existing word etymology with enriched properties.
+        
+        Words previously analyzed as having no Greek roots are returned with an
+        empty ``roots`` list until ``no_roots_ttl`` expires, so they are not sent
+        back to the AI providers on every lookup.
+        """
         async with self.driver.session() as session:
             result = await session.run("""
-                MATCH (w:EnglishWord {name: $word})-[:DERIVES_FROM]->(r:GreekRoot)
-                RETURN w.name as word, 
-                       collect({
+                MATCH (w:EnglishWord {name: $word})
+                OPTIONAL MATCH (w)-[:DERIVES_FROM]->(r:GreekRoot)
+                WITH w, collect(r) as rs
+                RETURN w.name as word,
+                       w.analyzed_at as analyzed_at,
+                       [r IN rs | {
                            name: r.name,
                            transliteration: r.transliteration,
                            meaning: r.meaning,
                            category: r.category,
                            frequency: r.frequency,
                            part_of_speech: r.part_of_speech
-                       }) as roots
+                       }] as roots
             """, word=word.lower())
             
             record = await result.single()
-            if record and record["roots"]:
-                return {
-                    "name": record["word"],
-                    "roots": record["roots"]
-                }
-            return None
+            return self._to_word_result(record) if record else None
+    
+    @observe_async(GRAPH_OPERATION_LATENCY, "find_words_roots")
+    async def find_words_roots(self, words: List[str]) -> Dict[str, Dict]:
+        """Look up many words in one query; returns results keyed by word for the hits only"""
+        if not words:
+            return {}
+        async with self.driver.session() as session:
+            result = await session.run("""
+                UNWIND $words as word
+                MATCH (w:EnglishWord {name: word})
+                OPTIONAL MATCH (w)-[:DERIVES_FROM]->(r:GreekRoot)
+                WITH w, collect(r) as rs
+                RETURN w.name as word,
+                       w.analyzed_at as analyzed_at,
+                       [r IN rs | {
+                           name: r.name,
+                           transliteration: r.transliteration,
+                           meaning: r.meaning,
+                           category: r.category,
+                           frequency: r.frequency,
+                           part_of_speech: r.part_of_speech
+                       }] as roots
+            """, words=[word.lower() for word in words])
+            
+            found = {}
+            async for record in result:
+                word_result = self._to_word_result(record)
+                if word_result:
+                    found[record["word"]] = word_result
+            return found
+    
+    @observe_async(GRAPH_OPERATION_LATENCY, "find_word_graph")
+    async def find_word_graph(self, word: str, related_limit: int) -> Optional[Dict]:
+        """Query a word, its roots and up to ``related_limit`` other words per root in one round trip"""
+        async with self.driver.session() as session:
+            result = await session.run("""
+                MATCH (w:EnglishWord {name: $word})
+                OPTIONAL MATCH (w)-[:DERIVES_FROM]->(r:GreekRoot)
+                WITH w, r, COLLECT {
+                    MATCH (r)<-[:DERIVES_FROM]-(o:EnglishWord)
+                    WHERE o <> w
+                    RETURN o.name ORDER BY o.name LIMIT $related_limit
+                } as related
+                WITH w, collect(CASE WHEN r IS NULL THEN NULL ELSE {
+                    name: r.name,
+                    transliteration: r.transliteration,
+                    meaning: r.meaning,
+                    category: r.category,
+                    frequency: r.frequency,
+                    part_of_speech: r.part_of_speech,
+                    related: related
+                } END) as roots
+                RETURN w.name as word, w.analyzed_at as analyzed_at, roots
+            """, word=word.lower(), related_limit=related_limit)
+            
+            record = await result.single()
+            return self._to_word_result(record) if record else None
     
+    @observe_async(GRAPH_OPERATION_LATENCY, "find_neighborhood")
+    async def find_neighborhood(self, word: str, depth: int, max_nodes: int, fanout: int) -> Optional[Dict]:
+        """Expand a word's neighborhood breadth-first in one query.
+        
+        Each hop follows DERIVES_FROM in either direction (word -> root -> word ...),
+        visits at most ``fanout`` new neighbors per node and stops adding nodes
+        once ``max_nodes`` is reached. Returns the nodes tagged with their depth,
+        every DERIVES_FROM link between them and whether the node cap dropped
+        any neighbors, or None if the word is unknown.
+        """
+        query = """
+            MATCH (start:EnglishWord {name: $word})
+            WITH [start] as nodes, [start] as frontier, [[start]] as layers, false as truncated
+        """ + NEIGHBORHOOD_HOP * depth + """
+            RETURN [d IN range(0, size(layers) - 1) | [n IN layers[d] | {
+                       id: elementId(n),
+                       depth: d,
+                       labels: labels(n),
+                       properties: properties(n)
+                   }]] as layers,
+                   COLLECT {
+                       UNWIND nodes as a
+                       MATCH (a)-[:DERIVES_FROM]->(b)
+                       WHERE b IN nodes
+                       RETURN [elementId(a), elementId(b)]
+                   } as links,
+                   truncated
+        """
+        async with self.driver.session() as session:
+            result = await session.run(query, word=word.lower(), max_nodes=max_nodes, fanout=fanout)
+            record = await result.single()
+            if not record:
+                return None
+            return {
+                "nodes": [node for layer in record["layers"] for node in layer],
+                "links": record["links"],
+                "truncated": record["truncated"],
+            }
+    
+    @observe_async(GRAPH_OPERATION_LATENCY, "existing_words")
+    async def existing_words(self, words: List[str]) -> Set[str]:
+        """Return which of ``words`` already have an EnglishWord node, in one query"""
+        if not words:
+            return set()
+        async with self.driver.session() as session:
+            result = await session.run("""
+                UNWIND $words as word
+                MATCH (w:EnglishWord {name: word})
+                RETURN w.name as word
+            """, words=[word.lower() for word in words])
+            return {record["word"] async for record in result}
+    
+    def _to_word_result(self, record) -> Optional[Dict]:
+        if record["roots"]:
+            return {
+                "name": record["word"],
+                "roots": record["roots"],
+                "analyzed_at": record["analyzed_at"]
+            }
+        if self._is_fresh_no_roots(record["analyzed_at"]):
+            return {"name": record["word"], "roots": [], "analyzed_at": record["analyzed_at"]}
+        return None
+    
+    def _is_fresh_no_roots(self, analyzed_at: Optional[int]) -> bool:
+        # Bare nodes stored before analyzed_at existed are treated as expired
+        if analyzed_at is None:
+            return False
+        return time.time() * 1000 - analyzed_at < self.no_roots_ttl * 1000
+    
+    @observe_async(GRAPH_OPERATION_LATENCY, "store_etymology")
     async def store_etymology(self, word: str, roots: List[Dict]):
         """Store etymology data in graph, preserving enriched properties"""
         if not roots:
@@ -82,38 +300,128 @@ class EtymologyGraphService:
             async with self.driver.session() as session:
                 await session.run("""
                     MERGE (w:EnglishWord {name: $word})
+                    SET w.analyzed_at = timestamp()
                 """, word=word.lower())
             return
         
         async with self.driver.session() as session:
             await session.run("""
                 MERGE (w:EnglishWord {name: $word})
+                SET w.analyzed_at = timestamp()
                 WITH w
                 UNWIND $roots as root
-                MERGE (r:GreekRoot {name: root.name})
-                ON CREATE SET 
-                    r.transliteration = root.transliteration,
-                    r.meaning = root.meaning,
-                    r.category = root.category,
-                    r.frequency = root.frequency,
-                    r.part_of_speech = root.part_of_speech
-                ON MATCH SET 
-                    r.transliteration = COALESCE(r.transliteration, root.transliteration),
-                    r.meaning = COALESCE(r.meaning, root.meaning),
-                    r.category = COALESCE(r.category, root.category),
-                    r.frequency = COALESCE(r.frequency, root.frequency),
-                    r.part_of_speech = COALESCE(r.part_of_speech, root.part_of_speech)
+                """ + MERGE_ROOT + """
                 MERGE (w)-[:DERIVES_FROM]->(r)
-            """, word=word.lower(), roots=roots)
+            """, word=word.lower(), roots=[with_root_keys(root) for root in roots])
     
-    async def get_related_words(self, root_name: str) -> List[str]:
-        """Get all words that derive from a specific Greek root"""
+    @observe_async(GRAPH_OPERATION_LATENCY, "store_etymologies")
+    async def store_etymologies(self, etymologies: List[Dict]):
+        """Store many ``{"name", "roots"}`` results in a single write transaction"""
+        if not etymologies:
+            return
+        
+        items = [
+            {"name": item["name"].lower(), "roots": [with_root_keys(root) for root in item.get("roots") or []]}
+            for item in etymologies
+        ]
+        async with self.driver.session() as session:
+            await session.run("""
+                UNWIND $items as item
+                MERGE (w:EnglishWord {name: item.name})
+                SET w.analyzed_at = timestamp()
+                WITH w, item
+                UNWIND item.roots as root
+                """ + MERGE_ROOT + """
+                MERGE (w)-[:DERIVES_FROM]->(r)
+            """, items=items)
+    
+    async def iter_suggestion_entries(self) -> AsyncIterator[Dict]:
+        """Stream every word (with its roots' frequencies) and every root for the prefix index"""
         async with self.driver.session() as session:
             result = await session.run("""
-                MATCH (r:GreekRoot)-[:DERIVES_FROM]-(w:EnglishWord)
-                WHERE r.name = $root_name OR r.transliteration = $root_name
-                RETURN collect(DISTINCT w.name) as words
-            """, root_name=root_name)
+                MATCH (w:EnglishWord)
+                RETURN "word" as kind, w.name as name,
+                       COLLECT { MATCH (w)-[:DERIVES_FROM]->(r:GreekRoot) RETURN r.frequency } as frequencies
+            """)
+            async for record in result:
+                yield dict(record)
             
-            record = await result.single()
-            return record["words"] if record else []
+            result = await session.run("""
+                MATCH (r:GreekRoot)
+                RETURN "root" as kind, r.name as name, r.transliteration as transliteration,
+                       r.meaning as meaning, r.frequency as frequency
+            """)
+            async for record in result:
+                yield dict(record)
+    
+    async def iter_word_roots(self) -> AsyncIterator[Dict]:
+        """Stream every word with its roots' names and frequencies for the similarity index"""
+        async with self.driver.session() as session:
+            result = await session.run("""
+                MATCH (w:EnglishWord)
+                RETURN w.name as name,
+                       COLLECT {
+                           MATCH (w)-[:DERIVES_FROM]->(r:GreekRoot)
+                           RETURN {name: r.name, frequency: r.frequency}
+                       } as roots
+            """)
+            async for record in result:
+                yield dict(record)
+    
+    @observe_async(GRAPH_OPERATION_LATENCY, "get_related_words_page")
+    async def get_related_words_page(
+        self,
+        root_name: str,
+        limit: int,
+        sort: str = "name",
+        descending: bool = False,
+        after: Optional[List] = None,
+        field: Optional[str] = None,
+        complexity_level: Optional[str] = None,
+    ) -> Dict:
+        """Get one page of the words deriving from a Greek root, given its name or transliteration.
+        
+        Accents and case are ignored. The input's script picks which normalized key
+        to match, so the root is found with a single index seek. Pages are keyset
+        paginated on ``(sort key, name)``: ``after`` is the ``next_after`` of the
+        previous page, so later pages cost the same as the first one. Words without
+        a ``first_use_year`` sort last in either direction.
+        """
+        key = fold_key(root_name)
+        key_property = "name_key" if is_greek(key) else "transliteration_key"
+        if sort == "first_use_year":
+            missing = -(10 ** 6) if descending else 10 ** 6
+            sort_key = f"coalesce(w.first_use_year, {missing})"
+        else:
+            sort_key = "w.name"
+        comparison = "<" if descending else ">"
+        direction = "DESC" if descending else "ASC"
+        # Names are unique, so they break ties and make the keyset total
+        after_predicate = (
+            f"(sort_key {comparison} $after_key OR (sort_key = $after_key AND name > $after_name))"
+            if sort != "name" else f"name {comparison} $after_name"
+        )
+        # Several roots can share a key, and a word deriving from more than one of
+        # them must still appear once, hence DISTINCT before projecting
+        async with self.driver.session() as session:
+            result = await session.run(f"""
+                MATCH (r:GreekRoot {{{key_property}: $key}})<-[:DERIVES_FROM]-(w:EnglishWord)
+                WHERE ($field IS NULL OR w.field = $field)
+                  AND ($complexity_level IS NULL OR w.complexity_level = $complexity_level)
+                WITH DISTINCT w
+                WITH w.name as name, {sort_key} as sort_key
+                WHERE $after_name IS NULL OR {after_predicate}
+                RETURN name, sort_key
+                ORDER BY sort_key {direction}, name ASC
+                LIMIT $limit
+            """, key=key, field=field, complexity_level=complexity_level,
+                after_key=after[0] if after else None, after_name=after[1] if after else None,
+                limit=limit + 1)
+            
+            records = [record async for record in result]
+        page = records[:limit]
+        has_more = len(records) > limit
+        return {
+            "words": [record["name"] for record in page],
+            "next_after": [page[-1]["sort_key"], page[-1]["name"]] if has_more else None,
+        }
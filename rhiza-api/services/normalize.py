@@ -0,0 +1,31 @@
+"""
+Normalized lookup keys for Greek roots and their transliterations.
+
+Roots arrive with and without polytonic accents (ἀρετή, αρετη) and with
+transliterations in any case or with macrons (Aretē, arete). Folding both to
+an accent-free, case-folded key lets one indexed equality match all of them.
+"""
+
+import unicodedata
+from typing import Any, Dict
+
+
+def fold_key(text: str) -> str:
+    """Strip diacritics (after NFD decomposition) and case-fold; final sigma folds to σ."""
+    decomposed = unicodedata.normalize("NFD", text.strip())
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def is_greek(text: str) -> bool:
+    """Whether ``text`` contains Greek letters, i.e. names a root rather than a transliteration."""
+    return any("\u0370" <= char <= "\u03ff" or "\u1f00" <= char <= "\u1fff" for char in text)
+
+
+def with_root_keys(root: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a root dict with ``name_key`` and ``transliteration_key`` filled in."""
+    keyed = dict(root)
+    keyed["name_key"] = fold_key(root["name"]) if root.get("name") is not None else None
+    keyed["transliteration_key"] = (
+        fold_key(root["transliteration"]) if root.get("transliteration") is not None else None
+    )
+    return keyed
@@ -0,0 +1,180 @@
+"""
+Result cache shared by every API worker and replica.
+
+The in-process TTLCache is per worker, so each worker warms up on its own and
+a word analyzed by one worker is a Neo4j round trip for all the others. A
+shared backend sits between that cache and Neo4j. Values are JSON, so any
+store that speaks the Redis protocol (Redis, Valkey, KeyDB, Dragonfly) works.
+
+Backend errors are logged and treated as misses: the shared cache is an
+optimization and must never fail a request.
+"""
+
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class SharedCache(ABC):
+    """Base for shared backends; subclasses implement the ``_get_many``/``_set_many``/``_delete`` primitives."""
+
+    backend = "none"
+
+    def __init__(self, prefix: str = "rhiza:"):
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Values found for ``keys``; missing keys and backend errors are left out."""
+        if not keys:
+            return {}
+        try:
+            raw = await self._get_many([self.prefix + key for key in keys])
+        except Exception as e:
+            self._error("get", e)
+            self.misses += len(keys)
+            return {}
+        found = {}
+        for key, value in zip(keys, raw):
+            if value is None:
+                continue
+            try:
+                found[key] = json.loads(value)
+            except ValueError:
+                continue
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def get(self, key: str) -> Optional[Any]:
+        return (await self.get_many([key])).get(key)
+
+    async def set_many(self, items: Dict[str, Any], ttl: float) -> None:
+        if not items or ttl <= 0:
+            return
+        try:
+            await self._set_many(
+                {self.prefix + key: json.dumps(value, ensure_ascii=False) for key, value in items.items()}, ttl
+            )
+        except Exception as e:
+            self._error("set", e)
+
+    async def delete(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        try:
+            await self._delete([self.prefix + key for key in keys])
+        except Exception as e:
+            self._error("delete", e)
+
+    def _error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning("Shared cache unavailable", operation=operation, error=str(error),
+                       error_type=type(error).__name__)
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    @abstractmethod
+    async def _get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """Raw values for prefixed ``keys``, ``None`` where missing."""
+
+    @abstractmethod
+    async def _set_many(self, items: Dict[str, str], ttl: float) -> None:
+        """Store raw values under prefixed keys, expiring after ``ttl`` seconds."""
+
+    @abstractmethod
+    async def _delete(self, keys: List[str]) -> None:
+        """Remove prefixed ``keys``; missing keys are ignored."""
+
+
+class InMemorySharedCache(SharedCache):
+    """Process-local stand-in for a shared store, for tests and single-worker setups.
+
+    Several cache wrappers given the same instance behave like workers sharing
+    one Redis.
+    """
+
+    backend = "memory"
+
+    def __init__(self, prefix: str = "rhiza:"):
+        super().__init__(prefix)
+        self._entries: Dict[str, tuple] = {}
+
+    async def _get_many(self, keys: List[str]) -> List[Optional[str]]:
+        now = time.monotonic()
+        values = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            values.append(entry[1] if entry is not None else None)
+        return values
+
+    async def _set_many(self, items: Dict[str, str], ttl: float) -> None:
+        expires_at = time.monotonic() + ttl
+        for key, value in items.items():
+            self._entries[key] = (expires_at, value)
+
+    async def _delete(self, keys: List[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class RedisSharedCache(SharedCache):
+    """Shared cache on any Redis-protocol server. Needs the optional ``redis`` package."""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "rhiza:", timeout: float = 0.25):
+        super().__init__(prefix)
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("SHARED_CACHE_URL points at Redis but the 'redis' package is not installed")
+        # A slow cache is worse than none; give up quickly and fall through to Neo4j
+        self._client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+    async def _get_many(self, keys: List[str]) -> List[Optional[str]]:
+        return await self._client.mget(keys)
+
+    async def _set_many(self, items: Dict[str, str], ttl: float) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, px=int(ttl * 1000))
+            await pipe.execute()
+
+    async def _delete(self, keys: List[str]) -> None:
+        await self._client.delete(*keys)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_shared_cache(url: str, prefix: str = "rhiza:") -> Optional[SharedCache]:
+    """Backend for a ``SHARED_CACHE_URL``: empty for none, ``memory://``, or ``redis://``/``rediss://``/``unix://``."""
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return InMemorySharedCache(prefix)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSharedCache(url, prefix)
+    raise ValueError(f"Unsupported SHARED_CACHE_URL scheme: {url}")
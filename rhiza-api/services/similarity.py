@@ -0,0 +1,183 @@
+"""
+In-memory word similarity index built from shared Greek roots.
+
+Two words are similar when they derive from the same roots; each shared root
+adds a weight that is higher for rarer roots, so sharing σοφία says more than
+sharing λόγος. Every word keeps its top ``capacity`` neighbors precomputed,
+so a lookup is a slice of that list. The lists are updated incrementally as
+words are analyzed and rebuilt from Neo4j periodically.
+"""
+
+import asyncio
+import bisect
+import heapq
+import time
+from collections import defaultdict
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Rare roots are more telling than ubiquitous ones
+FREQUENCY_WEIGHTS = {"very_high": 0.5, "high": 0.75, "medium": 1.0, "low": 1.5}
+DEFAULT_WEIGHT = 1.0
+
+# (negated score, word): sorts best first, ties alphabetically
+Neighbor = Tuple[float, str]
+
+
+def root_weight(frequency: Optional[str]) -> float:
+    return FREQUENCY_WEIGHTS.get(frequency, DEFAULT_WEIGHT)
+
+
+class SimilarityIndex:
+    """Top-K similar words per word, scored by the summed weight of shared roots.
+
+    A word is paired with at most ``max_root_words`` words of each root, the
+    first ones indexed: pairing every word of a hub root with all the others
+    would make a rebuild quadratic in the size of the largest root, while a
+    capped sample still credits the shared root. Incremental updates refresh
+    only that sample's top lists; the periodic rebuild catches up the rest.
+    """
+
+    def __init__(self, capacity: int = 50, max_root_words: int = 2000):
+        self.capacity = capacity
+        self.max_root_words = max_root_words
+        # word -> {root name: weight}
+        self._roots: Dict[str, Dict[str, float]] = {}
+        # root name -> words deriving from it, in indexing order (a dict used as an ordered set)
+        self._words: Dict[str, Dict[str, None]] = defaultdict(dict)
+        # word -> best neighbors, sorted best first
+        self._top: Dict[str, List[Neighbor]] = {}
+        self.loaded_at: Optional[float] = None
+        self._updates_during_load: Optional[List[Tuple[str, List[Dict[str, Any]]]]] = None
+
+    def __len__(self) -> int:
+        return len(self._roots)
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self._roots
+
+    def _scores(self, word: str) -> Dict[str, float]:
+        scores: Dict[str, float] = defaultdict(float)
+        for root, weight in self._roots.get(word, {}).items():
+            for other in islice(self._words.get(root, ()), self.max_root_words):
+                if other != word:
+                    scores[other] += weight
+        return scores
+
+    def _rank(self, word: str, scores: Optional[Dict[str, float]] = None) -> None:
+        if scores is None:
+            scores = self._scores(word)
+        self._top[word] = heapq.nsmallest(self.capacity, ((-score, other) for other, score in scores.items()))
+
+    def _offer(self, word: str, neighbor: Neighbor) -> None:
+        top = self._top.setdefault(word, [])
+        if len(top) >= self.capacity and neighbor >= top[-1]:
+            return
+        bisect.insort(top, neighbor)
+        if len(top) > self.capacity:
+            top.pop()
+
+    def _remove(self, word: str) -> None:
+        roots = self._roots.pop(word, None)
+        if roots is None:
+            return
+        self._top.pop(word, None)
+        affected = set()
+        for root in roots:
+            others = self._words[root]
+            affected.update(islice(others, self.max_root_words))
+            others.pop(word, None)
+            if not others:
+                del self._words[root]
+        affected.discard(word)
+        # A neighbor that listed this word may now have room for one it had cut off
+        for other in affected:
+            if any(name == word for _, name in self._top.get(other, ())):
+                self._rank(other)
+
+    def add_word(self, word: str, roots: List[Dict[str, Any]]) -> None:
+        """Index a word's roots and update its neighbors' top lists."""
+        word = word.strip().lower()
+        if not word:
+            return
+        if self._updates_during_load is not None:
+            self._updates_during_load.append((word, roots))
+        weights = {root["name"]: root_weight(root.get("frequency")) for root in roots if root.get("name")}
+        if self._roots.get(word) == weights:
+            return
+        self._remove(word)
+        self._roots[word] = weights
+        for root in weights:
+            self._words[root][word] = None
+        scores = self._scores(word)
+        self._rank(word, scores)
+        for other, score in scores.items():
+            self._offer(other, (-score, word))
+
+    def similar(self, word: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """The ``limit`` most similar words with their scores and shared roots."""
+        word = word.lower()
+        roots = self._roots.get(word, {})
+        return [
+            {
+                "word": other,
+                "score": round(-score, 4),
+                "shared_roots": sorted(root for root in self._roots.get(other, {}) if root in roots),
+            }
+            for score, other in self._top.get(word, [])[:limit]
+        ]
+
+    def related_by_root(self, word: str, per_root: int) -> Dict[str, List[str]]:
+        """The most similar words grouped under each shared root, at most ``per_root`` per root."""
+        word = word.lower()
+        roots = self._roots.get(word, {})
+        related: Dict[str, List[str]] = {root: [] for root in roots}
+        for _, other in self._top.get(word, []):
+            for root in self._roots.get(other, {}):
+                if root in related and len(related[root]) < per_root:
+                    related[root].append(other)
+        return related
+
+    def _build(self, entries: List[Tuple[str, List[Dict[str, Any]]]]) -> None:
+        for word, roots in entries:
+            word = word.strip().lower()
+            weights = {root["name"]: root_weight(root.get("frequency")) for root in roots if root.get("name")}
+            self._roots[word] = weights
+            for root in weights:
+                self._words[root][word] = None
+        for word in self._roots:
+            self._rank(word)
+
+    async def load(self, entries: AsyncIterator[Dict[str, Any]]) -> None:
+        """Rebuild the index from ``iter_word_roots`` and swap it in at once.
+
+        Scoring runs in a worker thread so a large graph does not stall requests.
+        """
+        started = time.monotonic()
+        self._updates_during_load = []
+        try:
+            rows = [(entry["name"], entry.get("roots") or []) async for entry in entries]
+            fresh = SimilarityIndex(self.capacity, self.max_root_words)
+            await asyncio.to_thread(fresh._build, rows)
+        except BaseException:
+            self._updates_during_load = None
+            raise
+        self._roots, self._words, self._top = fresh._roots, fresh._words, fresh._top
+        updates, self._updates_during_load = self._updates_during_load, None
+        for word, roots in updates:
+            self.add_word(word, roots)
+        self.loaded_at = time.time()
+        logger.info("Similarity index loaded", words=len(self._roots), roots=len(self._words),
+                   seconds=round(time.monotonic() - started, 2))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "words": len(self._roots),
+            "roots": len(self._words),
+            "capacity": self.capacity,
+            "loaded_at": self.loaded_at,
+        }
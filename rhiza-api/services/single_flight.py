@@ -0,0 +1,104 @@
+"""
+Single-flight coalescing for expensive per-key work.
+
+When many requests miss on the same word at once, only one of them should pay
+for the AI analysis and the graph write; the rest await the same result.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class FileLockBackend:
+    """Cross-worker lock built on ``flock``, a local stand-in for a shared lock service.
+
+    Keys are hashed onto a fixed set of lock files (``stripes``, 256 by default)
+    so the directory never grows. Every uvicorn worker on the same host shares
+    these files, which is enough to coalesce misses across workers without extra
+    infrastructure. Unrelated words that hash to the same stripe serialize on
+    each other's full analysis, even within one process, so raise ``stripes``
+    if many distinct misses arrive at once.
+    """
+
+    def __init__(self, directory: str, stripes: int = 256, poll_interval: float = 0.05):
+        self.directory = directory
+        self.stripes = stripes
+        self.poll_interval = poll_interval
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"rhiza-sf-{int(digest, 16) % self.stripes}.lock")
+
+    @asynccontextmanager
+    async def hold(self, key: str, timeout: float) -> AsyncIterator[bool]:
+        """Hold the lock for ``key``; yields False if it could not be taken in time."""
+        fd = os.open(self._path(key), os.O_RDWR | os.O_CREAT, 0o600)
+        acquired = False
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        logger.warning("Timed out waiting for cross-worker lock", key=key, timeout=timeout)
+                        break
+                    await asyncio.sleep(self.poll_interval)
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+class SingleFlight:
+    """Ensures at most one in-flight call per key within this process.
+
+    Callers that arrive while a call for the same key is running await that call
+    and receive its result (or its exception). When a lock backend is configured
+    the call is additionally serialized across workers.
+    """
+
+    def __init__(self, lock_backend: Optional[FileLockBackend] = None, lock_timeout: float = 60.0):
+        self.lock_backend = lock_backend
+        self.lock_timeout = lock_timeout
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, func, *args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            logger.info("Joining in-flight analysis", key=key)
+        # Shield the shared task so one disconnected client cannot cancel it for everyone
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        if self.lock_backend is None:
+            return await func(*args)
+        async with self.lock_backend.hold(key, self.lock_timeout):
+            return await func(*args)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
@@ -0,0 +1,73 @@
+"""
+Startup work that runs after the app starts accepting traffic.
+
+Creating Neo4j indexes used to block startup for up to 20 seconds while the
+database came up. ``BackgroundInit`` runs such a step as a task instead,
+retrying with exponential backoff until it succeeds, and reports its state
+for ``/ready``. Requests are served meanwhile; until the indexes exist,
+queries are just slower.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class BackgroundInit:
+    """Runs ``init`` in the background until it succeeds, with capped exponential backoff."""
+
+    def __init__(self, name: str, init: Callable[[], Awaitable[Any]], retry_delay: float = 2.0,
+                 max_delay: float = 30.0):
+        self.name = name
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        self._init = init
+        self._task: Optional[asyncio.Task] = None
+        self.state = "pending"
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        started = time.monotonic()
+        delay = self.retry_delay
+        self.state = "running"
+        while True:
+            self.attempts += 1
+            try:
+                await self._init()
+            except Exception as e:
+                self.state, self.error = "retrying", str(e)
+                logger.warning("Startup step failed, retrying", step=self.name, attempt=self.attempts,
+                               retry_in=delay, error=str(e))
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_delay)
+                continue
+            self.state, self.error = "ready", None
+            self.seconds = round(time.monotonic() - started, 3)
+            logger.info("Startup step completed", step=self.name, attempts=self.attempts, seconds=self.seconds)
+            return
+
+    async def wait(self) -> None:
+        """Wait for the step to finish, e.g. in scripts that need the indexes."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "attempts": self.attempts, "error": self.error, "seconds": self.seconds}
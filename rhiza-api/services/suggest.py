@@ -0,0 +1,170 @@
+"""
+In-memory prefix index for search-as-you-type suggestions.
+
+Entries live in one sorted array per frequency level, so a lookup is a bisect
+into each level followed by a short scan of the matching run, most frequent
+level first. That returns the top ``limit`` suggestions without touching
+Neo4j or scoring every match.
+"""
+
+import bisect
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import structlog
+
+from services.normalize import fold_key
+
+logger = structlog.get_logger(__name__)
+
+FREQUENCY_LEVELS = ("very_high", "high", "medium", "low")
+UNKNOWN_LEVEL = len(FREQUENCY_LEVELS)
+NO_ROOTS_LEVEL = UNKNOWN_LEVEL + 1
+
+# (search key, entry kind, entry id)
+IndexKey = Tuple[str, str, str]
+
+
+# Accent- and case-insensitive, so "λογ" finds "λόγος" and "Logo" finds "logos"
+search_key = fold_key
+
+
+def frequency_level(frequency: Optional[str]) -> int:
+    try:
+        return FREQUENCY_LEVELS.index(frequency)
+    except ValueError:
+        return UNKNOWN_LEVEL
+
+
+class SuggestionIndex:
+    """Prefix index over English words, root transliterations and Greek root names.
+
+    Words are ranked by the most common root they derive from, roots by their
+    own frequency; ties are broken alphabetically.
+    """
+
+    def __init__(self):
+        self._levels: List[List[IndexKey]] = [[] for _ in range(NO_ROOTS_LEVEL + 1)]
+        # (kind, id) -> (level, keys it is indexed under, suggestion payload)
+        self._entries: Dict[Tuple[str, str], Tuple[int, Tuple[str, ...], Dict[str, Any]]] = {}
+        self.loaded_at: Optional[float] = None
+        # While bulk loading, only _entries is filled; the sorted levels are built once at the end
+        self._bulk = False
+        # Words indexed while a reload is running, re-applied once it is swapped in
+        self._updates_during_load: Optional[List[Tuple[str, List[Dict[str, Any]]]]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, kind: str, entry_id: str) -> None:
+        existing = self._entries.pop((kind, entry_id), None)
+        if existing is None:
+            return
+        level, keys, _ = existing
+        entries = self._levels[level]
+        for key in keys:
+            position = bisect.bisect_left(entries, (key, kind, entry_id))
+            if position < len(entries) and entries[position] == (key, kind, entry_id):
+                del entries[position]
+
+    def _put(self, kind: str, entry_id: str, level: int, keys: Tuple[str, ...], payload: Dict[str, Any]) -> None:
+        if self._bulk:
+            self._entries[(kind, entry_id)] = (level, keys, payload)
+            return
+        existing = self._entries.get((kind, entry_id))
+        if existing is not None and existing[0] == level and existing[1] == keys:
+            self._entries[(kind, entry_id)] = (level, keys, payload)
+            return
+        self._remove(kind, entry_id)
+        for key in keys:
+            bisect.insort(self._levels[level], (key, kind, entry_id))
+        self._entries[(kind, entry_id)] = (level, keys, payload)
+
+    def add_word(self, word: str, root_frequencies: List[Optional[str]]) -> None:
+        word = word.strip().lower()
+        if not word:
+            return
+        if root_frequencies:
+            level = min(frequency_level(frequency) for frequency in root_frequencies)
+        else:
+            level = NO_ROOTS_LEVEL
+        frequency = FREQUENCY_LEVELS[level] if level < UNKNOWN_LEVEL else None
+        self._put("word", word, level, (search_key(word),), {"text": word, "type": "word", "frequency": frequency})
+
+    def add_root(self, root: Dict[str, Any]) -> None:
+        name = root.get("name")
+        if not name:
+            return
+        keys = tuple(sorted({search_key(value) for value in (name, root.get("transliteration")) if value}))
+        self._put("root", name, frequency_level(root.get("frequency")), keys, {
+            "text": root.get("transliteration") or name,
+            "type": "root",
+            "name": name,
+            "meaning": root.get("meaning"),
+            "frequency": root.get("frequency"),
+        })
+
+    def add_etymology(self, word: str, roots: List[Dict[str, Any]]) -> None:
+        """Index a newly analyzed word and any roots it introduced."""
+        if self._updates_during_load is not None:
+            self._updates_during_load.append((word, roots))
+        for root in roots:
+            self.add_root(root)
+        self.add_word(word, [root.get("frequency") for root in roots])
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        prefix = search_key(query)
+        if not prefix:
+            return []
+        results = []
+        seen = set()
+        for entries in self._levels:
+            position = bisect.bisect_left(entries, (prefix,))
+            while position < len(entries) and len(results) < limit:
+                key, kind, entry_id = entries[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                # A root indexed under both scripts can match twice
+                if (kind, entry_id) in seen:
+                    continue
+                seen.add((kind, entry_id))
+                results.append(self._entries[(kind, entry_id)][2])
+            if len(results) >= limit:
+                break
+        return results
+
+    async def load(self, entries: AsyncIterator[Dict[str, Any]]) -> None:
+        """Rebuild the index from ``iter_suggestion_entries`` and swap it in at once."""
+        started = time.monotonic()
+        fresh = SuggestionIndex()
+        fresh._bulk = True
+        self._updates_during_load = []
+        try:
+            async for entry in entries:
+                if entry["kind"] == "word":
+                    fresh.add_word(entry["name"], entry.get("frequencies") or [])
+                else:
+                    fresh.add_root(entry)
+        except BaseException:
+            self._updates_during_load = None
+            raise
+        # Sorting once is far cheaper than an insort per entry
+        for (kind, entry_id), (level, keys, _) in fresh._entries.items():
+            fresh._levels[level].extend((key, kind, entry_id) for key in keys)
+        for entries_at_level in fresh._levels:
+            entries_at_level.sort()
+        self._levels, self._entries = fresh._levels, fresh._entries
+        updates, self._updates_during_load = self._updates_during_load, None
+        for word, roots in updates:
+            self.add_etymology(word, roots)
+        self.loaded_at = time.time()
+        logger.info("Suggestion index loaded", entries=len(self._entries),
+                   seconds=round(time.monotonic() - started, 2))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "keys": sum(len(entries) for entries in self._levels),
+            "loaded_at": self.loaded_at,
+        }
@@ -0,0 +1,107 @@
+"""
+Input validation for words coming from URLs and request bodies.
+
+Every pattern is compiled once at import. A valid word costs two linear regex
+scans: one for the allowed character set and length, and one for all rejection
+rules (blocked terms, unlikely spellings, long runs of one character) folded
+into a single alternation. Only an invalid word is examined again, to work out
+which rule it broke so the caller can explain it.
+"""
+
+import re
+from typing import Optional
+
+MAX_WORD_LENGTH = 50
+MAX_SANITIZED_LENGTH = 100
+
+# Reason codes returned by validate_word
+EMPTY = "empty"
+TOO_LONG = "too_long"
+INVALID_CHARACTERS = "invalid_characters"
+BLOCKED_TERM = "blocked_term"
+UNLIKELY_SPELLING = "unlikely_spelling"
+REPEATED_CHARACTERS = "repeated_characters"
+RESERVED_WORD = "reserved_word"
+
+REASON_MESSAGES = {
+    EMPTY: "Please enter a word to search",
+    TOO_LONG: f"Word is too long (maximum {MAX_WORD_LENGTH} characters)",
+    INVALID_CHARACTERS: "Please use only letters, spaces, hyphens, and apostrophes",
+}
+DEFAULT_MESSAGE = "Invalid input detected. Please enter a valid English word"
+
+_ALLOWED = r"[a-zA-Z\s'-]"
+# Injection keywords; markup and comment tokens other than "--" can never get
+# past the allowed character set, and longer keywords (execute, javascript,
+# vbscript) contain one of these
+_BLOCKED_TERMS = r"union|select|insert|update|delete|drop|create|alter|exec|script|onload|onerror|--"
+_UNLIKELY_SPELLING = r"[qxz]{3}|[bcdfghjklmnpqrstvwxyz]{6}"
+_REPEATED = r"([^\n])\1{10}"
+
+_ALLOWED_WORD = re.compile(f"{_ALLOWED}+")
+_BLOCKED_TERM = re.compile(_BLOCKED_TERMS)
+_UNLIKELY = re.compile(_UNLIKELY_SPELLING)
+_REPEATED_RUN = re.compile(_REPEATED)
+# The hot path: allowed characters within the length limit, then any rejection rule
+_VALID_SHAPE = re.compile(f"{_ALLOWED}{{1,{MAX_WORD_LENGTH}}}")
+_ANY_REJECTION = re.compile(f"{_BLOCKED_TERMS}|{_UNLIKELY_SPELLING}|{_REPEATED}")
+
+RESERVED_WORDS = frozenset({"null", "undefined", "eval", "function", "constructor"})
+
+_SANITIZE_TABLE = str.maketrans({
+    **{code: None for code in (*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F)},
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+_NEEDS_SANITIZING = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f&<>\"']")
+
+
+def validate_word(word: str) -> Optional[str]:
+    """Return None for an acceptable word, otherwise the reason code it was rejected for.
+
+    The word is checked stripped and lowercased, so surrounding whitespace and
+    case never cause a rejection on their own.
+    """
+    if not word or not isinstance(word, str):
+        return EMPTY
+    normalized = word.strip().lower()
+    if (
+        _VALID_SHAPE.fullmatch(normalized) is not None
+        and _ANY_REJECTION.search(normalized) is None
+        and normalized not in RESERVED_WORDS
+    ):
+        return None
+    return _rejection_reason(word, normalized)
+
+
+def _rejection_reason(word: str, normalized: str) -> str:
+    # Length and character problems are reported against the input as given
+    if not normalized:
+        return EMPTY
+    if len(word) > MAX_WORD_LENGTH:
+        return TOO_LONG
+    if _ALLOWED_WORD.fullmatch(word) is None:
+        return INVALID_CHARACTERS
+    if _BLOCKED_TERM.search(normalized):
+        return BLOCKED_TERM
+    if _UNLIKELY.search(normalized):
+        return UNLIKELY_SPELLING
+    if _REPEATED_RUN.search(normalized):
+        return REPEATED_CHARACTERS
+    return RESERVED_WORD
+
+
+def reason_message(reason: str) -> str:
+    return REASON_MESSAGES.get(reason, DEFAULT_MESSAGE)
+
+
+def sanitize_input(text: str) -> str:
+    """Drop control characters, HTML-escape markup characters and cap the length."""
+    if not text or not isinstance(text, str):
+        return ""
+    if _NEEDS_SANITIZING.search(text) is not None:
+        text = text.translate(_SANITIZE_TABLE)
+    return text[:MAX_SANITIZED_LENGTH].strip()
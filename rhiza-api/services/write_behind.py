@@ -0,0 +1,354 @@
+"""
+Write-behind queue for etymology results.
+
+Analyzed words are acknowledged as soon as they are queued and written to Neo4j
+in the background, coalesced into batched ``store_etymologies`` transactions.
+A write failure is retried with backoff instead of failing the request that
+produced the result. Every queued write is also appended to a per-worker
+journal file, so writes still pending when a worker stops are replayed by the
+next worker that starts.
+
+A batch that keeps failing for a reason the driver does not consider
+retryable (a bad record rather than an unreachable database) is split in half
+after ``max_attempts`` failures, down to single records; a single record that
+still fails is moved to ``rhiza-dead-letter.jsonl`` in the journal
+directory so it cannot block the rest of the queue.
+
+If the journal cannot be written (disk full, permissions), the write stays
+queued in memory only and is counted in ``journal_errors``; it still reaches
+Neo4j unless the worker stops first.
+"""
+
+import asyncio
+import fcntl
+import glob
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEAD_LETTER_FILE = "rhiza-dead-letter.jsonl"
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed write may succeed unchanged later (e.g. Neo4j unreachable or a deadlock)."""
+    is_retryable = getattr(error, "is_retryable", None)
+    if callable(is_retryable):
+        return bool(is_retryable())
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+class WriteBehindQueue:
+    """Coalescing, journaled write-behind buffer in front of the graph service.
+
+    Pending writes are keyed by word, so re-analyzing a word before it has been
+    flushed only writes the latest result. When ``max_pending`` words are
+    waiting, ``enqueue`` waits up to ``enqueue_timeout`` seconds for the flusher
+    to make room and then drops the write (the word will simply be analyzed
+    again later) rather than holding the request indefinitely.
+    """
+
+    def __init__(
+        self,
+        graph_service: Any,
+        journal_dir: Optional[str] = None,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        max_pending: int = 10000,
+        enqueue_timeout: float = 2.0,
+        retry_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        fsync: bool = False,
+        max_attempts: int = 5,
+    ):
+        self.graph_service = graph_service
+        self.journal_dir = journal_dir
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+        self.enqueue_timeout = enqueue_timeout
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.fsync = fsync
+        self.max_attempts = max(1, max_attempts)
+
+        self._pending: Dict[str, Dict] = {}
+        self._changed = asyncio.Condition()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._journal = None
+        self._journal_lock_fd: Optional[int] = None
+        self._journal_path: Optional[str] = None
+        self._journal_lines = 0
+        # Shrinks while isolating a record that keeps failing, reset once the queue drains
+        self._batch_limit = self.batch_size
+        self._attempts = 0
+
+        self.flushed = 0
+        self.failed_flushes = 0
+        self.dropped = 0
+        self.replayed = 0
+        self.dead_lettered = 0
+        self.journal_errors = 0
+
+    # --- Journal ---
+
+    def _open_journal(self) -> None:
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self._journal_path = os.path.join(self.journal_dir, f"rhiza-wb-{os.getpid()}.jsonl")
+        self._journal_lock_fd = os.open(self._journal_path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._journal_lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self._journal_lock_fd)
+            self._journal_lock_fd = None
+            raise RuntimeError(f"Write-behind journal {self._journal_path} is in use by another queue")
+        self._replay(self._journal_path)
+        self._rewrite_journal()
+
+    def _replay_orphans(self) -> None:
+        """Adopt journals left behind by workers that are no longer running."""
+        for path in glob.glob(os.path.join(self.journal_dir, "rhiza-wb-*.jsonl")):
+            if path == self._journal_path:
+                continue
+            lock_fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                try:
+                    fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # Owned by a live worker
+                self._replay(path)
+                # Persist the adopted writes in our own journal before removing theirs
+                self._rewrite_journal()
+                for leftover in (path, path + ".lock"):
+                    try:
+                        os.unlink(leftover)
+                    except FileNotFoundError:
+                        pass
+            finally:
+                os.close(lock_fd)
+
+    def _replay(self, path: str) -> None:
+        try:
+            with open(path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        item = json.loads(line)
+                        self._pending[item["name"]] = item
+                        self.replayed += 1
+                    except (ValueError, KeyError, TypeError):
+                        # A torn final line from a crash mid-append
+                        continue
+        except FileNotFoundError:
+            return
+        logger.info("Replayed write-behind journal", path=path, pending=len(self._pending))
+
+    def _append(self, item: Dict) -> None:
+        if self._journal is None:
+            return
+        try:
+            self._journal.write(json.dumps(item, ensure_ascii=False) + "\n")
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+        except OSError as e:
+            # The caller already has its answer; keep the write in memory rather than fail the request
+            self.journal_errors += 1
+            logger.error("Write-behind journal append failed, write is not durable", word=item["name"],
+                         error=str(e), journal=self._journal_path)
+            return
+        self._journal_lines += 1
+
+    def _rewrite_journal(self) -> None:
+        """Atomically replace the journal with just the writes still pending."""
+        temp_path = self._journal_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as journal:
+            for item in self._pending.values():
+                journal.write(json.dumps(item, ensure_ascii=False) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temp_path, self._journal_path)
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self._journal_path, "a", encoding="utf-8")
+        self._journal_lines = len(self._pending)
+
+    def _compact_journal(self) -> None:
+        if self._journal is None:
+            return
+        # Appends only ever grow the journal; rewrite it once it is mostly flushed entries
+        if not self._pending or self._journal_lines > 2 * len(self._pending) + 1000:
+            self._rewrite_journal()
+
+    def _dead_letter(self, item: Dict, error: Exception) -> None:
+        logger.error("Moving write-behind record to dead letter", word=item["name"], error=str(error))
+        self.dead_lettered += 1
+        if not self.journal_dir:
+            return
+        entry = dict(item, error=str(error), failed_at=int(time.time() * 1000))
+        with open(os.path.join(self.journal_dir, DEAD_LETTER_FILE), "a", encoding="utf-8") as dead_letter:
+            dead_letter.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    # --- Queue ---
+
+    async def start(self) -> None:
+        if self.journal_dir:
+            self._open_journal()
+            self._replay_orphans()
+        self._task = asyncio.create_task(self._flush_loop())
+        if self._pending:
+            self._wake.set()
+
+    async def enqueue(self, word: str, roots: List[Dict]) -> bool:
+        """Queue a result for writing; returns False if it was dropped under backpressure."""
+        word = word.lower()
+        if word not in self._pending and len(self._pending) >= self.max_pending:
+            self._wake.set()
+            try:
+                async with self._changed:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: len(self._pending) < self.max_pending),
+                        self.enqueue_timeout,
+                    )
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                logger.warning("Write-behind queue full, dropping write", word=word, pending=len(self._pending))
+                return False
+
+        item = {"name": word, "roots": roots}
+        self._pending[word] = item
+        self._append(item)
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def pending(self, word: str) -> Optional[Dict]:
+        """The queued, not yet flushed result for ``word``, if any."""
+        return self._pending.get(word.lower())
+
+    async def wait_flushed(self, word: str, timeout: float) -> bool:
+        """Flush now and wait until ``word`` is in the graph; False on timeout."""
+        word = word.lower()
+        if word not in self._pending:
+            return True
+        self._wake.set()
+        try:
+            async with self._changed:
+                await asyncio.wait_for(self._changed.wait_for(lambda: word not in self._pending), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _flush_loop(self) -> None:
+        failures = 0
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            while self._pending:
+                try:
+                    flushed = await self.flush_once()
+                except Exception as e:
+                    # e.g. the journal rewrite failing; keep the flusher alive and retry
+                    logger.exception("Write-behind flush loop error", error=str(e))
+                    flushed = False
+                if not flushed:
+                    failures += 1
+                    delay = min(self.max_backoff, self.retry_backoff * 2 ** (failures - 1))
+                    logger.warning("Write-behind flush failed, backing off", delay=delay,
+                                   pending=len(self._pending), attempt=failures)
+                    await asyncio.sleep(delay)
+                    break
+                failures = 0
+            if not self._pending:
+                self._batch_limit = self.batch_size
+
+    async def flush_once(self) -> bool:
+        """Write up to ``batch_size`` pending results (fewer while isolating a bad record) in one transaction."""
+        batch = [item for _, item in zip(range(self._batch_limit), self._pending.values())]
+        if not batch:
+            return True
+        started = time.monotonic()
+        try:
+            await self.graph_service.store_etymologies(batch)
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.error("Write-behind flush error", error=str(e), batch=len(batch))
+            if _is_retryable(e):
+                return False
+            self._attempts += 1
+            if self._attempts < self.max_attempts:
+                return False
+            self._attempts = 0
+            if len(batch) > 1:
+                self._batch_limit = len(batch) // 2
+                logger.warning("Splitting write-behind batch that keeps failing", batch=self._batch_limit)
+                return False
+            self._dead_letter(batch[0], e)
+            self._batch_limit = self.batch_size
+            await self._remove(batch)
+            return True
+
+        self._attempts = 0
+        self.flushed += len(batch)
+        await self._remove(batch)
+        logger.info("Flushed write-behind batch", words=len(batch),
+                   pending=len(self._pending), seconds=round(time.monotonic() - started, 3))
+        return True
+
+    async def _remove(self, batch: List[Dict]) -> None:
+        for item in batch:
+            # A newer result queued during the write stays pending
+            if self._pending.get(item["name"]) is item:
+                del self._pending[item["name"]]
+        async with self._changed:
+            self._changed.notify_all()
+        self._compact_journal()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Stop the flusher after a final best-effort drain; leftovers stay journaled."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        deadline = time.monotonic() + timeout
+        while self._pending and time.monotonic() < deadline:
+            if not await self.flush_once():
+                break
+        if self._pending:
+            logger.warning("Write-behind queue closed with pending writes", pending=len(self._pending),
+                           journal=self._journal_path)
+        if self._journal is not None:
+            self._compact_journal()
+            self._journal.close()
+            self._journal = None
+        if self._journal_lock_fd is not None:
+            if not self._pending:
+                for leftover in (self._journal_path, self._journal_path + ".lock"):
+                    try:
+                        os.unlink(leftover)
+                    except FileNotFoundError:
+                        pass
+            os.close(self._journal_lock_fd)
+            self._journal_lock_fd = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "max_pending": self.max_pending,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+            "dropped": self.dropped,
+            "replayed": self.replayed,
+            "dead_lettered": self.dead_lettered,
+            "journal_errors": self.journal_errors,
+        }
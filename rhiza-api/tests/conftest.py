@@ -0,0 +1,36 @@
+import asyncio
+
+import httpx
+import pytest
+
+import main
+from services.fakes import InMemoryEtymologyGraphService
+from services.negative_cache import FailedAnalysisCache
+
+
+class Api:
+    """Drives the app in-process against an in-memory graph."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def get(self, path, **headers):
+        return asyncio.run(self.request("GET", path, headers))
+
+    def post(self, path, json, **headers):
+        return asyncio.run(self.request("POST", path, headers, json=json))
+
+    async def request(self, method, path, headers, **kwargs):
+        headers = {name.replace("_", "-"): value for name, value in headers.items()}
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, path, headers=headers, **kwargs)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    graph = InMemoryEtymologyGraphService()
+    monkeypatch.setattr(main, "graph_service", main.CachedEtymologyGraphService(graph))
+    monkeypatch.setattr(main, "failed_analyses", FailedAnalysisCache(ttl=60))
+    main.limiter.reset()
+    return Api(graph)
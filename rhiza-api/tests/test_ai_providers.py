@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from services.ai_providers import AllProvidersFailedError, CircuitBreaker, ProviderRouter
+from services.fakes import FakeEtymologyProvider
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def open_breaker(router, name, clock, opened_at=None):
+    """Install a breaker on an injected clock and trip it."""
+    breaker = CircuitBreaker(name, failure_threshold=1, reset_timeout=30.0, clock=clock)
+    router.breakers[name] = breaker
+    if opened_at is not None:
+        clock.now = opened_at
+    breaker.record_failure()
+    return breaker
+
+
+def test_circuit_breaker_opens_half_opens_and_closes():
+    clock = Clock()
+    breaker = CircuitBreaker("bedrock", failure_threshold=3, reset_timeout=30.0, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now += 29.9
+    assert not breaker.available()
+    clock.now += 0.1
+    assert breaker.available()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    # Only one probe goes through while half-open
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success(0.2)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_failed_probe_reopens_circuit():
+    clock = Clock()
+    breaker = CircuitBreaker("gemini", failure_threshold=2, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 10.0
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened_at == clock.now
+    clock.now += 9.0
+    assert not breaker.available()
+
+
+def test_order_puts_available_providers_first_and_open_ones_by_age():
+    clock = Clock()
+    router = ProviderRouter()
+    open_breaker(router, "bedrock", clock, opened_at=1005.0)
+    open_breaker(router, "gemini", clock, opened_at=1001.0)
+    providers = [("bedrock", None), ("gemini", None), ("fake", None)]
+
+    assert [name for name, _ in router.order(providers)] == ["fake", "gemini", "bedrock"]
+
+    # A half-open provider keeps its configured position so its probe is sent
+    clock.now = 1032.0
+    assert [name for name, _ in router.order(providers)] == ["gemini", "fake", "bedrock"]
+
+
+def test_falls_back_to_next_provider_on_failure():
+    fallbacks = []
+    router = ProviderRouter(on_fallback=lambda previous, name: fallbacks.append((previous, name)))
+    failing = FakeEtymologyProvider(failing=True)
+    working = FakeEtymologyProvider()
+
+    name, result = asyncio.run(router.call([("bedrock", failing), ("gemini", working)], "philosophy"))
+
+    assert name == "gemini"
+    assert result["name"] == "philosophy"
+    assert fallbacks == [("bedrock", "gemini")]
+    assert router.breaker("bedrock").consecutive_failures == 1
+
+
+def test_all_circuits_open_forces_the_oldest():
+    clock = Clock()
+    router = ProviderRouter()
+    open_breaker(router, "bedrock", clock, opened_at=1005.0)
+    open_breaker(router, "gemini", clock, opened_at=1001.0)
+    bedrock, gemini = FakeEtymologyProvider(), FakeEtymologyProvider()
+
+    name, _ = asyncio.run(router.call([("bedrock", bedrock), ("gemini", gemini)], "logos"))
+
+    assert name == "gemini"
+    assert (bedrock.calls, gemini.calls) == (0, 1)
+    assert router.breaker("gemini").state == CircuitBreaker.CLOSED
+
+
+def test_all_providers_failing_raises():
+    router = ProviderRouter()
+    providers = [("bedrock", FakeEtymologyProvider(failing=True)), ("gemini", FakeEtymologyProvider(failing=True))]
+
+    with pytest.raises(AllProvidersFailedError):
+        asyncio.run(router.call(providers, "logos"))
+
+
+def test_hedge_winner_returns_and_loser_releases_probe():
+    clock = Clock()
+    router = ProviderRouter(hedge_delay=0.01)
+    slow_breaker = open_breaker(router, "bedrock", clock)
+    clock.now += 30.0
+    cancelled = []
+
+    async def slow(word):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(word)
+            raise
+
+    async def run():
+        name, result = await router.call([("bedrock", slow), ("gemini", FakeEtymologyProvider())], "logos")
+        # Checked before yielding to the loop again: the loser is already cancelled and released
+        assert cancelled == ["logos"]
+        assert slow_breaker.state == CircuitBreaker.HALF_OPEN
+        assert slow_breaker.allow()
+        return name, result
+
+    name, result = asyncio.run(run())
+
+    assert name == "gemini"
+    assert result["name"] == "logos"
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from services.backfill import BackfillCheckpoint, BackfillWorker
+from services.fakes import FakeEtymologyProvider, InMemoryEtymologyGraphService
+
+WORDS = ["philosophy", "democracy", "biology", "telephone", "psychology", "geography"]
+
+
+def make_worker(graph, analyze, checkpoint_path, batch_size=2):
+    return BackfillWorker(
+        graph_service=graph,
+        analyze=analyze,
+        is_valid=lambda word: word.isalpha(),
+        checkpoint=BackfillCheckpoint(str(checkpoint_path)),
+        batch_size=batch_size,
+        concurrency=2,
+        rate=0,
+    )
+
+
+def test_skips_words_already_in_graph(tmp_path):
+    graph = InMemoryEtymologyGraphService()
+    graph.seed("democracy", [])
+    graph.seed("telephone", [])
+    provider = FakeEtymologyProvider()
+
+    state = asyncio.run(make_worker(graph, provider, tmp_path / "checkpoint.json").run(WORDS))
+
+    assert provider.calls == 4
+    assert state["skipped"] == 2
+    assert state["analyzed"] == 4
+    assert set(WORDS) <= set(graph.words)
+
+
+def test_resumes_from_checkpoint(tmp_path):
+    graph = InMemoryEtymologyGraphService()
+    checkpoint_path = tmp_path / "checkpoint.json"
+    asyncio.run(make_worker(graph, FakeEtymologyProvider(), checkpoint_path).run(WORDS, limit=4))
+    assert json.loads(checkpoint_path.read_text())["position"] == 4
+
+    # A fresh worker (as after a crash) only analyzes the rest of the list
+    provider = FakeEtymologyProvider()
+    state = asyncio.run(make_worker(graph, provider, checkpoint_path).run(WORDS))
+
+    assert provider.calls == 2
+    assert state["position"] == 6
+    assert state["analyzed"] == 6
+
+
+def test_failed_words_are_kept_and_retried(tmp_path):
+    graph = InMemoryEtymologyGraphService()
+    checkpoint_path = tmp_path / "checkpoint.json"
+    fake = FakeEtymologyProvider()
+
+    async def flaky(word):
+        if word in ("biology", "geography"):
+            raise RuntimeError("provider unavailable")
+        return await fake(word)
+
+    state = asyncio.run(make_worker(graph, flaky, checkpoint_path).run(WORDS))
+
+    assert state["position"] == 6
+    assert state["failed"] == 2
+    assert state["failed_words"] == ["biology", "geography"]
+    assert "biology" not in graph.words
+    assert json.loads(checkpoint_path.read_text())["failed_words"] == ["biology", "geography"]
+
+    provider = FakeEtymologyProvider()
+    state = asyncio.run(make_worker(graph, provider, checkpoint_path).run(WORDS))
+
+    assert provider.calls == 2
+    assert state["failed"] == 0
+    assert state["failed_words"] == []
+    assert {"biology", "geography"} <= set(graph.words)
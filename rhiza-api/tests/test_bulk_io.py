@@ -0,0 +1,20 @@
+import io
+import json
+
+from bulk_io import read_jsonl
+
+
+def test_read_jsonl_skips_nameless_roots():
+    lines = [
+        {"root": {"name": "λόγος", "transliteration": "logos"}},
+        {"root": {"transliteration": "bios"}},
+        {"name": " Logic ", "roots": [{"name": "λόγος"}, {"meaning": "nameless"}]},
+    ]
+    stream = io.StringIO("\n".join(json.dumps(line, ensure_ascii=False) for line in lines))
+
+    records = list(read_jsonl(stream))
+
+    assert records == [
+        {"root": {"name": "λόγος", "transliteration": "logos"}},
+        {"name": "logic", "roots": [{"name": "λόγος"}]},
+    ]
@@ -0,0 +1,88 @@
+import asyncio
+
+from services.cache import TaggedTTLCache
+from services.cached_graph_service import CachedEtymologyGraphService
+from services.fakes import InMemoryEtymologyGraphService
+
+LOGOS = {"name": "λόγος", "transliteration": "logos", "meaning": "word"}
+BIOS = {"name": "βίος", "transliteration": "bios", "meaning": "life"}
+
+
+def warm(cached, word, roots):
+    """Fill every cache a read of ``word`` and its graph would fill."""
+    async def run():
+        await cached.find_word_roots(word)
+        for root in roots:
+            await cached.get_related_words_page(root["transliteration"], 10)
+            await cached.get_related_words_page(root["name"], 20)
+    asyncio.run(run())
+    cached.graph_payloads.set((word, True), "graph", tags=cached.payload_tags(word, roots))
+
+
+def test_store_invalidates_word_related_pages_and_graph_payloads():
+    graph = InMemoryEtymologyGraphService()
+    graph.seed("logic", [LOGOS])
+    graph.seed("biology", [BIOS, LOGOS])
+    cached = CachedEtymologyGraphService(graph)
+    warm(cached, "logic", [LOGOS])
+    warm(cached, "biology", [BIOS, LOGOS])
+    cached.graph_payloads.set(("unrelated", False), "graph", tags=cached.payload_tags("unrelated", []))
+
+    asyncio.run(cached.store_etymology("Logic", [LOGOS]))
+
+    assert cached.word_cache.get("logic") is None
+    assert cached.word_cache.get("biology") is not None
+    assert cached.related_cache.get("logos") is None
+    assert cached.related_cache.get("bios") is not None
+    # Both payloads hang off λόγος; the unrelated one survives
+    assert cached.graph_payloads.get(("logic", True)) is None
+    assert cached.graph_payloads.get(("biology", True)) is None
+    assert cached.graph_payloads.get(("unrelated", False)) == "graph"
+
+
+def test_related_pages_are_shared_by_spelling_variants():
+    graph = InMemoryEtymologyGraphService()
+    graph.seed("logic", [LOGOS])
+    cached = CachedEtymologyGraphService(graph)
+
+    async def pages():
+        await cached.get_related_words_page("logos", 10)
+        await cached.get_related_words_page("Lógos", 20)
+        await cached.get_related_words_page("ΛΟΓΟΣ", 10)
+    asyncio.run(pages())
+
+    assert len(cached.related_cache.get("logos")) == 2
+    assert len(cached.related_cache.get("λογοσ")) == 1
+
+    cached.invalidate("logic", [LOGOS])
+    assert cached.related_cache.get("logos") is None
+    assert cached.related_cache.get("λογοσ") is None
+
+
+def test_prime_serves_the_queued_result_and_drops_stale_payloads():
+    graph = InMemoryEtymologyGraphService()
+    graph.seed("logic", [])
+    cached = CachedEtymologyGraphService(graph)
+    warm(cached, "logic", [])
+
+    asyncio.run(cached.prime({"name": "Logic", "roots": [LOGOS]}))
+
+    assert asyncio.run(cached.find_word_roots("logic"))["roots"] == [LOGOS]
+    assert cached.graph_payloads.get(("logic", True)) is None
+
+
+def test_set_computed_before_an_invalidation_is_dropped():
+    cache = TaggedTTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+
+    # A write lands while the payload is being built
+    cache.invalidate_tags(["word:logic"])
+    cache.set("logic", "stale", tags=["word:logic"], generation=generation)
+    assert cache.get("logic") is None
+
+    cache.set("logic", "fresh", tags=["word:logic"], generation=cache.generation)
+    assert cache.get("logic") == "fresh"
+    cache.invalidate_tags(["root:logos"])
+    assert cache.get("logic") == "fresh"
+    cache.invalidate_tags(["word:logic"])
+    assert cache.get("logic") is None
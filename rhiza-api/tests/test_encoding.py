@@ -0,0 +1,76 @@
+import gzip
+import json
+
+from starlette.requests import Request
+
+import main
+from services.encoding import COMPACT_GRAPH_MEDIA_TYPE, Representation, compact_graph, negotiate
+
+GRAPH = {
+    "nodes": [
+        {"id": "word_logic", "label": "logic", "type": "EnglishWord", "properties": {"depth": 0}},
+        {"id": "root_logos", "label": "λόγος", "type": "GreekRoot", "properties": {"depth": 1}},
+    ],
+    "edges": [{"source": "word_logic", "target": "root_logos", "type": "DERIVES_FROM", "properties": {}}],
+    "truncated": False,
+}
+
+
+def respond(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": raw, "query_string": b""})
+    return main.negotiated_response(request, GRAPH, main.GRAPH_CACHE_CONTROL, '"abc"', compactable=True)
+
+
+def test_compact_graph_indexes_nodes_and_interns_shapes():
+    compact = compact_graph(GRAPH)
+
+    assert compact["edge_key"] == "edges"
+    assert compact["types"] == ["EnglishWord", "GreekRoot", "DERIVES_FROM"]
+    assert compact["shapes"] == [["depth"], []]
+    assert compact["links"] == [[0, 1, 2, 1, []]]
+    assert compact["truncated"] is False
+
+
+def test_negotiate_respects_quality_values():
+    assert negotiate("application/json", "gzip;q=0, identity", False) == Representation(False, None)
+    assert negotiate(COMPACT_GRAPH_MEDIA_TYPE, "gzip", True) == Representation(True, "gzip")
+    assert negotiate(COMPACT_GRAPH_MEDIA_TYPE, "", False).compact is False
+
+
+def test_etag_names_the_encoding_actually_applied(monkeypatch):
+    monkeypatch.setattr(main, "RESPONSE_COMPRESSION_MIN_BYTES", 10 ** 6)
+    small = respond(accept_encoding="gzip")
+
+    assert "content-encoding" not in small.headers
+    assert small.headers["etag"] == '"abc"'
+
+    monkeypatch.setattr(main, "RESPONSE_COMPRESSION_MIN_BYTES", 1)
+    large = respond(accept_encoding="gzip")
+
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.headers["etag"] == '"abc-gzip"'
+    assert json.loads(gzip.decompress(large.body)) == GRAPH
+
+    assert respond(accept_encoding="gzip", if_none_match='"abc-gzip"').status_code == 304
+
+
+def test_conditional_get_is_answered_before_rendering(monkeypatch):
+    def fail(*args):
+        raise AssertionError("rendered a 304")
+
+    monkeypatch.setattr(main, "render", fail)
+    built = []
+
+    def content():
+        built.append(True)
+        return GRAPH
+
+    request = Request({"type": "http", "method": "GET", "path": "/", "query_string": b"",
+                       "headers": [(b"accept-encoding", b"gzip"), (b"if-none-match", b'"abc"')]})
+    # A small body was sent uncompressed earlier, so the identity tag still validates
+    response = main.negotiated_response(request, content, main.GRAPH_CACHE_CONTROL, '"abc"', compactable=True)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"abc"'
+    assert built == []
@@ -0,0 +1,44 @@
+import asyncio
+
+import main
+from services.fakes import InMemoryEtymologyGraphService
+
+LOGOS = {"name": "λόγος", "transliteration": "logos", "meaning": "word"}
+BIOS = {"name": "βίος", "transliteration": "bios", "meaning": "life"}
+OIKOS = {"name": "οἶκος", "transliteration": "oikos", "meaning": "house"}
+
+
+def make_graph():
+    graph = InMemoryEtymologyGraphService()
+    for word, roots in {"biology": [BIOS, LOGOS], "logic": [LOGOS], "biotic": [BIOS],
+                        "ecology": [LOGOS, OIKOS], "economy": [OIKOS]}.items():
+        graph.seed(word, roots)
+    return graph
+
+
+def test_neighborhood_expands_by_depth():
+    neighborhood = asyncio.run(make_graph().find_neighborhood("biology", depth=3, max_nodes=7, fanout=10))
+
+    depths = {entry["properties"].get("transliteration") or entry["properties"]["name"]: entry["depth"]
+              for entry in neighborhood["nodes"]}
+    assert depths == {"biology": 0, "bios": 1, "logos": 1, "biotic": 2, "ecology": 2, "logic": 2, "oikos": 3}
+    assert ["EnglishWord:ecology", "GreekRoot:οἶκος"] in neighborhood["links"]
+    assert neighborhood["truncated"] is False
+
+    graph = main.build_neighborhood_graph(neighborhood)
+    assert graph.nodes[0].id == "word_biology"
+    assert len(graph.edges) == 6
+
+
+def test_neighborhood_reports_truncation_only_when_nodes_are_dropped():
+    graph = make_graph()
+
+    capped = asyncio.run(graph.find_neighborhood("biology", depth=3, max_nodes=6, fanout=10))
+    assert len(capped["nodes"]) == 6
+    assert capped["truncated"] is True
+
+    narrow = asyncio.run(graph.find_neighborhood("biology", depth=1, max_nodes=100, fanout=1))
+    assert [entry["properties"].get("transliteration") for entry in narrow["nodes"][1:]] == ["bios"]
+    assert narrow["truncated"] is False
+
+    assert asyncio.run(graph.find_neighborhood("unknown", depth=2, max_nodes=10, fanout=10)) is None
@@ -0,0 +1,64 @@
+import pytest
+
+import main
+from services.encoding import COMPACT_GRAPH_MEDIA_TYPE, brotli
+from services.http_cache import http_date
+
+LOGOS = {"name": "λόγος", "transliteration": "logos", "meaning": "word", "category": "abstract_concept",
+         "frequency": "high", "part_of_speech": "noun"}
+
+
+@pytest.fixture
+def logic(api):
+    api.graph.seed("logic", [LOGOS])
+    return api
+
+
+def test_matching_if_none_match_gets_304(logic):
+    first = logic.get("/word/logic")
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert first.headers["last-modified"]
+    for header in (etag, "W/" + etag, f'"other", {etag}'):
+        response = logic.get("/word/logic", if_none_match=header)
+        assert response.status_code == 304, header
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+    assert logic.get("/word/logic", if_none_match="*").status_code == 304
+    assert logic.get("/word/logic", if_none_match='"other"').status_code == 200
+
+
+def test_if_modified_since(logic):
+    analyzed_at = logic.graph.words["logic"]["analyzed_at"]
+
+    assert logic.get("/word/logic", if_modified_since=http_date(analyzed_at)).status_code == 304
+    assert logic.get("/word/logic", if_modified_since=http_date(analyzed_at - 5000)).status_code == 200
+    # If-None-Match wins over If-Modified-Since
+    response = logic.get("/word/logic", if_none_match='"other"', if_modified_since=http_date(analyzed_at))
+    assert response.status_code == 200
+
+
+def test_each_representation_has_its_own_etag(logic, monkeypatch):
+    monkeypatch.setattr(main, "RESPONSE_COMPRESSION_MIN_BYTES", 1)
+    variants = {
+        "": {"accept_encoding": "identity"},
+        "-compact": {"accept": COMPACT_GRAPH_MEDIA_TYPE, "accept_encoding": "identity"},
+        "-gzip": {"accept_encoding": "gzip"},
+        "-compact-gzip": {"accept": COMPACT_GRAPH_MEDIA_TYPE, "accept_encoding": "gzip"},
+    }
+    if brotli is not None:
+        variants["-br"] = {"accept_encoding": "br, gzip"}
+
+    etags = {}
+    for suffix, headers in variants.items():
+        response = logic.get("/word/logic/graph", **headers)
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == (suffix.rsplit("-", 1)[-1] if suffix.endswith(("gzip", "br")) else None)
+        etags[suffix] = response.headers["etag"]
+        assert logic.get("/word/logic/graph", if_none_match=etags[suffix], **headers).status_code == 304
+
+    base = etags[""]
+    assert etags == {suffix: base[:-1] + suffix + '"' for suffix in variants}
+    # Another representation's tag does not validate
+    assert logic.get("/word/logic/graph", if_none_match=etags["-compact"], **variants["-gzip"]).status_code == 200
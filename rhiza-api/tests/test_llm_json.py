@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from services.ai_providers import LazyClient
+from services.llm_json import LLMOutputError, normalize_etymology, read_json_object
+
+
+def test_reads_first_object_across_chunks_and_stops():
+    consumed = []
+
+    def chunks():
+        for text in ['Here you go:\n```json\n{"r": [["λόγος", "log', 'os", "word"]]}', "\n```", " trailing prose"]:
+            consumed.append(text)
+            yield text
+
+    value, length = read_json_object(chunks())
+
+    assert value == {"r": [["λόγος", "logos", "word"]]}
+    assert len(consumed) == 2
+    assert length == sum(len(text) for text in consumed)
+
+
+def test_tolerates_trailing_commas_and_rejects_incomplete_output():
+    assert read_json_object(['{"r": [["a", "b", "c"],],}'])[0] == {"r": [["a", "b", "c"]]}
+    with pytest.raises(LLMOutputError):
+        read_json_object(['{"r": [["a", "b"'])
+
+
+def test_normalize_expands_compact_rows_and_drops_bad_batch_entries():
+    single = normalize_etymology({"r": [["λόγος", "logos", "word", "bogus", "high"]]}, "logic")
+    assert single["roots"][0]["category"] == "other"
+    assert single["roots"][0]["part_of_speech"] is None
+
+    batch = normalize_etymology({"w": {"logic": [["λόγος", "logos", "word"]], "broken": [["λόγος"]]}}, "")
+    assert [entry["name"] for entry in batch["words"]] == ["logic"]
+
+
+class FakeGeminiStream:
+    """Stands in for the gRPC stream behind a streamed Gemini response."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.consumed = 0
+        self.cancelled = False
+
+    def __iter__(self):
+        for text in self.texts:
+            self.consumed += 1
+            yield text
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeGeminiResponse:
+    def __init__(self, texts):
+        self._iterator = FakeGeminiStream(texts)
+
+    def __iter__(self):
+        for text in self._iterator:
+            yield SimpleNamespace(text=text)
+
+
+def test_gemini_stream_is_cancelled_once_the_answer_is_complete(monkeypatch):
+    response = FakeGeminiResponse(['{"r": [["λόγος", "logos", "word"]]}', "more", "tokens"])
+    model = SimpleNamespace(generate_content=lambda *args, **kwargs: response)
+    monkeypatch.setattr(main, "gemini", LazyClient("gemini", lambda: SimpleNamespace(GenerativeModel=lambda name: model)))
+
+    answer, _ = main._invoke_gemini("prompt", 100)
+
+    assert answer == {"r": [["λόγος", "logos", "word"]]}
+    assert response._iterator.consumed == 1
+    assert response._iterator.cancelled
+
+
+def test_gemini_stream_without_cancel_is_reported(monkeypatch):
+    chunks = [SimpleNamespace(text='{"r": []}'), SimpleNamespace(text="more")]
+    model = SimpleNamespace(generate_content=lambda *args, **kwargs: iter(chunks))
+    warnings = []
+    monkeypatch.setattr(main, "gemini", LazyClient("gemini", lambda: SimpleNamespace(GenerativeModel=lambda name: model)))
+    monkeypatch.setattr(main.logger, "warning", lambda event, **fields: warnings.append(event))
+
+    answer, _ = main._invoke_gemini("prompt", 100)
+
+    assert answer == {"r": []}
+    assert warnings == ["Cannot cancel Gemini stream; it will generate until max_output_tokens"]
@@ -0,0 +1,32 @@
+import argparse
+import importlib.util
+import os
+import random
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "load_bench.py")
+
+
+def load_benchmark():
+    spec = importlib.util.spec_from_file_location("load_benchmark", BENCHMARK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_repeated_runs_miss_on_fresh_words():
+    bench = load_benchmark()
+    args = argparse.Namespace(mix={"word": 0.7, "root": 0.3}, miss_ratio=0.3, warmup=0, requests=500)
+
+    def plan(run_index):
+        rng = random.Random(1)
+        dataset, roots = bench.build_dataset(rng, 200, 20)
+        return dataset, bench.build_plan(rng, args, list(dataset), roots, run_index)
+
+    dataset, first = plan(0)
+    _, second = plan(1)
+    known = {f"/word/{word}" for word in dataset}
+    changed = [(a, b) for a, b in zip(first, second) if a != b]
+
+    assert changed
+    assert all(a[0] == b[0] == "word" and a[1] not in known and b[1] not in known for a, b in changed)
+    assert not {path for _, path in first} & {b[1] for _, b in changed}
@@ -0,0 +1,35 @@
+import asyncio
+from types import SimpleNamespace
+
+from services import metrics
+from services.metrics import Counter, instrument_pool_acquire
+
+
+def test_label_values_are_escaped():
+    counter = Counter("rhiza_test_total", "Help with a \\ and\na newline.", ["provider"])
+    counter.inc('odd "name"\\path\nnext')
+
+    lines = counter.render()
+
+    assert lines[0] == "# HELP rhiza_test_total Help with a \\\\ and\\na newline."
+    assert lines[2] == 'rhiza_test_total{provider="odd \\"name\\"\\\\path\\nnext"} 1'
+
+
+def test_pool_acquire_is_only_patched_on_known_driver_versions():
+    async def acquire():
+        return "connection"
+
+    checked = SimpleNamespace(_pool=SimpleNamespace(acquire=acquire))
+    unknown = SimpleNamespace(_pool=SimpleNamespace(acquire=acquire))
+    def observed():
+        return sum(sum(series[:-1]) for series in metrics.NEO4J_POOL_ACQUIRE._series.values())
+
+    before = observed()
+
+    assert instrument_pool_acquire(checked, "5.28.1")
+    assert not instrument_pool_acquire(unknown, "6.0.0")
+    assert not instrument_pool_acquire(SimpleNamespace(), "5.28.1")
+    assert unknown._pool.acquire is acquire
+
+    assert asyncio.run(checked._pool.acquire()) == "connection"
+    assert observed() == before + 1
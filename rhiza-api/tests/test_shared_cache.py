@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from services import shared_cache
+from services.shared_cache import InMemorySharedCache, SharedCache
+
+
+def test_shared_cache_requires_backend_primitives():
+    with pytest.raises(TypeError):
+        SharedCache()
+
+
+def test_in_memory_get_set_delete_and_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(shared_cache.time, "monotonic", lambda: now[0])
+    cache = InMemorySharedCache()
+
+    async def run():
+        await cache.set_many({"word:logic": {"name": "logic", "roots": []}, "word:table": {"name": "table"}}, ttl=10)
+        assert await cache.get("word:logic") == {"name": "logic", "roots": []}
+        assert await cache.get_many(["word:logic", "word:missing"]) == {"word:logic": {"name": "logic", "roots": []}}
+
+        await cache.delete(["word:logic"])
+        assert await cache.get("word:logic") is None
+
+        now[0] += 10
+        assert await cache.get("word:table") is None
+
+        # A zero TTL stores nothing
+        await cache.set_many({"word:ecology": {}}, ttl=0)
+        assert await cache.get("word:ecology") is None
+
+    asyncio.run(run())
+
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 4
+
+
+def test_backend_errors_are_misses():
+    class BrokenCache(InMemorySharedCache):
+        async def _get_many(self, keys):
+            raise ConnectionError("down")
+
+    cache = BrokenCache()
+
+    assert asyncio.run(cache.get("word:logic")) is None
+    assert cache.stats()["errors"] == 1
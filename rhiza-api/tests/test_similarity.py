@@ -0,0 +1,37 @@
+import asyncio
+
+from services.similarity import SimilarityIndex
+
+LOGOS = {"name": "λόγος", "frequency": "very_high"}
+SOPHIA = {"name": "σοφία", "frequency": "low"}
+
+
+def test_rare_shared_root_ranks_first():
+    index = SimilarityIndex(capacity=10)
+    index.add_word("philosophy", [LOGOS, SOPHIA])
+    index.add_word("sophist", [SOPHIA])
+    index.add_word("logic", [LOGOS])
+
+    similar = index.similar("philosophy")
+
+    assert [entry["word"] for entry in similar] == ["sophist", "logic"]
+    assert similar[0]["score"] == 1.5
+    assert similar[0]["shared_roots"] == ["σοφία"]
+
+
+def test_hub_root_is_capped_instead_of_dropped():
+    words = [f"word{number:02d}" for number in range(10)]
+
+    async def entries():
+        for word in words:
+            yield {"name": word, "roots": [LOGOS]}
+
+    index = SimilarityIndex(capacity=50, max_root_words=3)
+    asyncio.run(index.load(entries()))
+    index.add_word("late", [LOGOS])
+
+    # Every word still shares the hub root, scored against its first max_root_words words
+    assert all(index.similar(word) for word in words)
+    assert [entry["word"] for entry in index.similar("late")] == ["word00", "word01", "word02"]
+    assert [entry["word"] for entry in index.similar("word09")] == ["word00", "word01", "word02"]
+    assert "late" in [entry["word"] for entry in index.similar("word00")]
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from services.fakes import FakeEtymologyProvider, InMemoryEtymologyGraphService
+from services.single_flight import FileLockBackend, SingleFlight
+
+
+def analyzer(graph, provider):
+    """The shape of main.analyze_and_store: re-check the graph, then ask the provider and store."""
+    async def analyze(word):
+        found = await graph.find_word_roots(word)
+        if found:
+            return found
+        result = await provider(word)
+        await graph.store_etymology(word, result["roots"])
+        return result
+    return analyze
+
+
+def test_concurrent_misses_make_one_provider_call():
+    graph = InMemoryEtymologyGraphService()
+    provider = FakeEtymologyProvider(latency=0.05, no_roots_every=0)
+    flight = SingleFlight()
+
+    async def run():
+        analyze = analyzer(graph, provider)
+        results = await asyncio.gather(*(flight.do("logic", analyze, "logic") for _ in range(20)))
+        assert flight.in_flight() == 0
+        return results
+
+    results = asyncio.run(run())
+
+    assert provider.calls == 1
+    assert all(result == results[0] for result in results)
+    assert results[0]["roots"]
+
+
+def test_followers_receive_the_leaders_error():
+    provider = FakeEtymologyProvider(latency=0.05, failing=True)
+    flight = SingleFlight()
+
+    async def run():
+        return await asyncio.gather(*(flight.do("logic", provider, "logic") for _ in range(5)),
+                                    return_exceptions=True)
+
+    errors = asyncio.run(run())
+
+    assert provider.calls == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    # The failure is not cached: the next miss tries again
+    with pytest.raises(RuntimeError):
+        asyncio.run(flight.do("logic", provider, "logic"))
+    assert provider.calls == 2
+
+
+def test_file_lock_coalesces_misses_across_workers(tmp_path):
+    graph = InMemoryEtymologyGraphService()
+    provider = FakeEtymologyProvider(latency=0.05, no_roots_every=0)
+    # Two SingleFlight instances stand in for two uvicorn workers sharing the lock directory
+    workers = [SingleFlight(FileLockBackend(str(tmp_path), poll_interval=0.01), lock_timeout=5.0) for _ in range(2)]
+
+    async def run():
+        analyze = analyzer(graph, provider)
+        return await asyncio.gather(*(workers[index % 2].do("logic", analyze, "logic") for index in range(10)))
+
+    results = asyncio.run(run())
+
+    assert provider.calls == 1
+    assert all(result["roots"] == results[0]["roots"] for result in results)
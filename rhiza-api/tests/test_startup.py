@@ -0,0 +1,82 @@
+import asyncio
+import importlib.util
+import os
+import statistics
+
+import httpx
+
+import main
+from services.fakes import InMemoryEtymologyGraphService
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "startup.py")
+
+
+def load_benchmark():
+    spec = importlib.util.spec_from_file_location("startup_benchmark", BENCHMARK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_import_and_startup_within_budget():
+    benchmark = load_benchmark()
+    env = benchmark.benchmark_env()
+    samples = [benchmark.sample(env) for _ in range(3)]
+
+    assert statistics.median(entry["import_ms"] for entry in samples) <= benchmark.IMPORT_BUDGET_MS
+    assert statistics.median(entry["startup_ms"] for entry in samples) <= benchmark.STARTUP_BUDGET_MS
+
+
+class FakeSession:
+    def __init__(self, reachable):
+        self.reachable = reachable
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def run(self, query):
+        if not self.reachable:
+            raise ConnectionError("Neo4j is down")
+
+
+class FakeDriver:
+    def __init__(self, reachable):
+        self.reachable = reachable
+
+    def session(self):
+        return FakeSession(self.reachable)
+
+
+def get_ready(monkeypatch, reachable):
+    graph = InMemoryEtymologyGraphService()
+    graph.driver = FakeDriver(reachable)
+    monkeypatch.setattr(main, "graph_service", main.CachedEtymologyGraphService(graph))
+
+    async def request():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/ready")
+
+    return asyncio.run(request())
+
+
+def test_ready_reports_neo4j_state_as_string(monkeypatch):
+    # scripts/test.sh checks `.dependencies.neo4j == "healthy"`
+    response = get_ready(monkeypatch, reachable=True)
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["dependencies"]["neo4j"] == "healthy"
+    assert body["dependencies"]["neo4j_indexes"]["state"] == "pending"
+    assert body["status"] == "degraded"
+
+
+def test_ready_is_unavailable_when_neo4j_is_down(monkeypatch):
+    response = get_ready(monkeypatch, reachable=False)
+
+    assert response.status_code == 503
+    assert response.json()["dependencies"]["neo4j"] == "unavailable"
+    assert response.json()["status"] == "not_ready"
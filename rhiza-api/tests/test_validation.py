@@ -0,0 +1,42 @@
+import importlib.util
+import os
+
+import pytest
+
+from services import validation
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "validation_bench.py")
+
+CORPUS = [
+    "", " ", "\t\n", "philosophy", "  Philosophy  ", "PHILOSOPHY", "well-known", "-", "--", "a-", "don't", "'",
+    "rock 'n' roll", "ice cream", "a" * 50, "a" * 51, " " + "a" * 50 + " ", "b" * 100 + "c",
+    "aaaaaaaaaaa", "aaaaaaaaaaaa", "rhythms", "strengths", "zzz", "xxx", "qxz", "unionize", "selected",
+    "SELECT", "drop table", "javascript", "onload", "null", " Null ", "eval", "constructor", "undefined",
+    "<script>", "&lt;b&gt;", "%3c", "a#b", "a/*b", "café", "λόγος", "naïve", "Kelvin", "Kelvin",
+    "ſtraße", "İstanbul", "ab\x00cd", "ab\x7fcd", "tab\tword", "line\nbreak", "a b", "1984", "mid-1990s",
+    'say "hi"', "fish & chips",
+]
+
+
+def load_benchmark():
+    spec = importlib.util.spec_from_file_location("validation_benchmark", BENCHMARK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+legacy = load_benchmark()
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_matches_legacy_validation(text):
+    for word in (text, legacy.legacy_sanitize_input(text)):
+        reason = validation.validate_word(word)
+        assert (reason is None) == legacy.legacy_is_valid_english_word(word)
+        if reason is not None:
+            assert validation.reason_message(reason) == legacy.legacy_invalid_word_message(word)
+        assert validation.sanitize_input(word) == legacy.legacy_sanitize_input(word)
+
+
+def test_matches_legacy_on_generated_inputs():
+    assert legacy.check_equivalence(cases=20000, seed=3) == 0
@@ -0,0 +1,50 @@
+import main
+from services.fakes import FakeEtymologyProvider
+
+LOGOS = {"name": "λόγος", "transliteration": "logos", "meaning": "word", "category": "abstract_concept",
+         "frequency": "high", "part_of_speech": "noun"}
+
+
+def test_graph_reports_recent_ai_failure_as_unavailable(api):
+    main.failed_analyses.record("logic")
+
+    response = api.get("/word/logic/graph")
+
+    assert response.status_code == 503
+    assert response.json()["detail"] == "AI services unavailable"
+
+
+def test_batch_without_providers_returns_empty_roots_like_single_lookups(api):
+    api.graph.seed("logic", [LOGOS])
+
+    response = api.post("/words", {"words": ["Logic", "table", "x<y>", "table"]})
+    results = response.json()["results"]
+
+    assert [entry["status"] for entry in results] == ["found", "analyzed", "invalid", "analyzed"]
+    assert results[0]["result"]["roots"][0]["name"] == "λόγος"
+    assert results[1]["result"]["roots"] == []
+    assert api.get("/word/table").json()["roots"] == []
+
+
+def test_batch_groups_misses_into_one_provider_call(api, monkeypatch):
+    provider = FakeEtymologyProvider(known={"logic": [LOGOS], "table": []})
+    monkeypatch.setattr(main, "get_ai_etymology", provider)
+    monkeypatch.setattr(main.bedrock, "enabled", True)
+    queued = []
+
+    async def queue_etymology(word, roots):
+        queued.append(word)
+        return True
+
+    monkeypatch.setattr(main, "queue_etymology", queue_etymology)
+    monkeypatch.setattr(main, "BATCH_PROMPT_GROUP_SIZE", 10)
+
+    response = api.post("/words", {"words": ["logic", "table", "biology"]})
+    results = {entry["word"]: entry for entry in response.json()["results"]}
+
+    assert provider.calls == 1
+    assert results["logic"]["status"] == "analyzed"
+    assert results["logic"]["result"]["roots"][0]["transliteration"] == "logos"
+    assert results["table"]["result"]["roots"] == []
+    assert results["biology"]["result"]["name"] == "biology"
+    assert queued == ["logic", "table", "biology"]
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from services.write_behind import DEAD_LETTER_FILE, WriteBehindQueue
+
+
+class RejectingGraph:
+    """Fails every batch that contains one of ``rejected``, like a constraint violation."""
+
+    def __init__(self, rejected):
+        self.rejected = set(rejected)
+        self.stored = []
+
+    async def store_etymologies(self, batch):
+        if any(item["name"] in self.rejected for item in batch):
+            raise ValueError("constraint violated")
+        self.stored.extend(item["name"] for item in batch)
+
+
+async def drain(queue, timeout=5.0):
+    async def pending():
+        while queue.stats()["pending"]:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(pending(), timeout)
+
+
+def test_bad_record_is_isolated_and_dead_lettered(tmp_path):
+    graph = RejectingGraph({"w5"})
+    words = [f"w{index}" for index in range(20)]
+
+    async def run():
+        queue = WriteBehindQueue(graph, journal_dir=str(tmp_path), batch_size=8, flush_interval=0.01,
+                                 retry_backoff=0.001, max_attempts=2)
+        await queue.start()
+        for word in words:
+            await queue.enqueue(word, [])
+        await drain(queue)
+        await queue.close()
+        return queue.stats()
+
+    stats = asyncio.run(run())
+
+    assert sorted(graph.stored) == sorted(word for word in words if word != "w5")
+    assert stats["dead_lettered"] == 1
+    dead = [json.loads(line) for line in (tmp_path / DEAD_LETTER_FILE).read_text().splitlines()]
+    assert [entry["name"] for entry in dead] == ["w5"]
+
+
+class FullDisk:
+    def write(self, text):
+        raise OSError(28, "No space left on device")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_journal_failure_keeps_the_write_in_memory(tmp_path):
+    graph = RejectingGraph(())
+
+    async def run():
+        queue = WriteBehindQueue(graph, journal_dir=str(tmp_path), flush_interval=0.01)
+        await queue.start()
+        queue._journal = FullDisk()
+        assert await queue.enqueue("logic", [])
+        await drain(queue)
+        stats = queue.stats()
+        queue._journal = None
+        await queue.close()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert graph.stored == ["logic"]
+    assert stats["journal_errors"] == 1
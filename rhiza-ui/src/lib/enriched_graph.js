@@ -1,7 +1,32 @@
 // Enhanced D3.js Graph Visualization for Rhiza
 // Uses enriched data properties for better visual representation
 
+// Expand a compact graph payload (Accept: application/vnd.rhiza.compact-graph+json)
+// back into { nodes, edges } or { nodes, links }. Nodes are
+// [id, label, type, shape, values] rows and links are
+// [source, target, type, shape, values] with source/target indexing nodes;
+// type and shape index the types and shapes tables. Plain payloads pass through.
+function decodeCompactGraph(payload) {
+  if (payload.format !== 'rhiza-compact-graph/1') {
+    return payload;
+  }
+  const { format, edge_key, types, shapes, nodes, links, ...rest } = payload;
+  const properties = (shape, values) =>
+    Object.fromEntries(shapes[shape].map((key, index) => [key, values[index]]));
+  const decodedNodes = nodes.map(([id, label, type, shape, values]) => ({
+    id, label, type: types[type], properties: properties(shape, values)
+  }));
+  const decodedLinks = links.map(([source, target, type, shape, values]) => ({
+    source: decodedNodes[source].id,
+    target: decodedNodes[target].id,
+    type: types[type],
+    properties: properties(shape, values)
+  }));
+  return { ...rest, nodes: decodedNodes, [edge_key]: decodedLinks };
+}
+
 function createEnrichedGraph(data) {
+  data = decodeCompactGraph(data);
   const width = 800;
   const height = 600;
   
@@ -296,5 +321,5 @@ function createEnrichedGraph(data) {
 
 // Export for use in Svelte component
 if (typeof module !== 'undefined' && module.exports) {
-  module.exports = { createEnrichedGraph };
+  module.exports = { createEnrichedGraph, decodeCompactGraph };
 }
@@ -16,6 +16,14 @@ export async function fetchGraphData(word, apiBaseUrl) {
   return await response.json();
 }
 
+export async function fetchSuggestions(prefix, apiBaseUrl, { limit = 8, signal } = {}) {
+  const params = new URLSearchParams({ q: prefix.trim(), limit: String(limit) });
+  const response = await fetch(`${apiBaseUrl}/suggest?${params}`, { signal });
+  if (!response.ok) return [];
+  const data = await response.json();
+  return data.suggestions;
+}
+
 // Filter utilities
 export function toggleSetItem(set, item) {
   if (set.has(item)) {